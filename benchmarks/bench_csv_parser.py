@@ -0,0 +1,112 @@
+"""
+Time PandasObservationParser on a large CSV observations payload and report
+the peak memory of each approach, measured in a fresh process (Linux only).
+
+    $ python benchmarks/bench_csv_parser.py --rows 2000000 --columns 4
+
+'legacy' is the original splitlines/join/StringIO implementation, 'c' and
+'pyarrow' are the parser's CSV engines.
+"""
+from __future__ import print_function
+
+import argparse
+import re
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy
+import pandas
+
+from senaps_sensor.parsers import PandasObservationParser
+from senaps_sensor.timestamps import format_datetime64
+
+APPROACHES = ('legacy', 'c', 'pyarrow')
+
+
+class FakeMethod(object):
+
+    def __init__(self, stream_ids):
+        self.query_params = {'media': 'csv', 'streamid': ','.join(stream_ids)}
+
+
+def make_payload(rows, columns):
+    stream_ids = ['stream.%d' % i for i in range(columns)]
+    t = format_datetime64(numpy.datetime64('2016-01-01', 'us') + numpy.arange(rows) * numpy.timedelta64(1, 's'))
+    values = numpy.round(numpy.random.default_rng(0).normal(size=(rows, columns)), 6)
+    frame = pandas.DataFrame(values, columns=stream_ids)
+    frame.insert(0, 'timestamp', t)
+    body = frame.to_csv(index=False)
+    return stream_ids, ('# Senaps observations\n# exported for benchmarking\n' + body).encode('utf-8')
+
+
+def legacy_parse(payload):
+    # The original implementation, fed the decoded text as before.
+    payload = payload.decode('utf-8')
+    lines = payload.splitlines()
+    for i, row in enumerate(lines):
+        if 'timestamp' == row.split(',')[0]:
+            break
+    return pandas.read_csv(pandas.io.common.StringIO('\n'.join(lines[i:])), parse_dates=True, index_col='timestamp')
+
+
+def memory_status(field):
+    """Current (VmRSS) or peak (VmHWM) resident set size in KB."""
+    with open('/proc/self/status') as fp:
+        for line in fp:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+
+
+def reset_peak():
+    # the peak is otherwise dominated by reading the payload, which briefly holds it twice
+    with open('/proc/self/clear_refs', 'w') as fp:
+        fp.write('5')
+
+
+def run(approach, path, columns):
+    stream_ids = ['stream.%d' % i for i in range(columns)]
+    with open(path, 'rb') as fp:
+        payload = fp.read()
+    reset_peak()
+    baseline = memory_status('VmRSS')
+    start = time.perf_counter()
+    if approach == 'legacy':
+        legacy_parse(payload)
+    else:
+        PandasObservationParser(engine=approach).parse(FakeMethod(stream_ids), payload)
+    elapsed = time.perf_counter() - start
+    peak = memory_status('VmHWM') - baseline
+    print('%-8s payload %6.1f MB  %6.2f s  peak +%6.1f MB (%.1fx payload)' % (
+        approach, len(payload) / 1e6, elapsed, peak / 1e3, peak * 1e3 / len(payload)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--columns', type=int, default=4)
+    parser.add_argument('--approach', choices=APPROACHES)
+    parser.add_argument('--payload', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.approach:
+        run(args.approach, args.payload, args.columns)
+        return
+
+    _, payload = make_payload(args.rows, args.columns)
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(payload)
+        del payload
+        for approach in APPROACHES:
+            subprocess.check_call([sys.executable, __file__, '--approach', approach, '--payload', path,
+                                   '--columns', str(args.columns)])
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
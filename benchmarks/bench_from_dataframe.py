@@ -0,0 +1,67 @@
+"""
+Compare the vectorised Observation.from_dataframe against the original
+row-by-row implementation.
+
+    $ python benchmarks/bench_from_dataframe.py --rows 1000000 --columns 10
+
+The original implementation takes minutes on a 1M x 10 frame; pass
+--skip-legacy to time only the vectorised one.
+"""
+from __future__ import print_function
+
+import argparse
+import time
+
+import numpy
+import pandas
+
+from senaps_sensor.models import Observation, UnivariateResult
+
+
+def legacy_from_dataframe(dataframe):
+    # The pre-vectorisation implementation (with Series.items() in place of
+    # Series.iteritems(), which no longer exists in pandas 2).
+    result = {}
+    for timestamp, series in dataframe.iterrows():
+        timestamp = timestamp.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        for series_id, value in series.items():
+            observation = UnivariateResult(t=timestamp, v=value)
+            result.setdefault(series_id, Observation()).results.append(observation)
+    return result
+
+
+def make_frame(rows, columns, nan_fraction):
+    index = pandas.date_range('2016-01-01', periods=rows, freq='s', tz='UTC', name='timestamp')
+    values = numpy.random.default_rng(0).normal(size=(rows, columns))
+    values[numpy.random.default_rng(1).random(size=values.shape) < nan_fraction] = numpy.nan
+    return pandas.DataFrame(values, index=index, columns=['stream.%d' % i for i in range(columns)])
+
+
+def timed(label, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    print('%-40s %8.2f s' % (label, elapsed))
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--columns', type=int, default=10)
+    parser.add_argument('--nan-fraction', type=float, default=0.01)
+    parser.add_argument('--skip-legacy', action='store_true')
+    args = parser.parse_args()
+
+    frame = make_frame(args.rows, args.columns, args.nan_fraction)
+    print('frame: %d rows x %d columns' % frame.shape)
+
+    observations, new = timed('Observation.from_dataframe', Observation.from_dataframe, frame)
+    timed('  + to_state() of every stream', lambda o: [v.to_state() for v in o.values()], observations)
+    if not args.skip_legacy:
+        _, old = timed('legacy from_dataframe', legacy_from_dataframe, frame)
+        print('speed-up (from_dataframe only): %.1fx' % (old / new))
+
+
+if __name__ == '__main__':
+    main()
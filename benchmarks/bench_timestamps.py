@@ -0,0 +1,59 @@
+"""
+Compare the senaps_sensor.timestamps codec against strftime/strptime and
+pandas' generic timestamp inference.
+
+    $ python benchmarks/bench_timestamps.py --count 1000000
+
+Scalar rates are measured over --scalar-count single calls.
+"""
+from __future__ import print_function
+
+import argparse
+import datetime
+import time
+
+import numpy
+import pandas
+
+from senaps_sensor import timestamps
+
+
+def rate(label, count, fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    print('%-45s %12.0f /s' % (label, count / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--scalar-count', type=int, default=200000)
+    args = parser.parse_args()
+
+    values = numpy.datetime64('2016-01-01', 'us') + numpy.arange(args.count) * numpy.timedelta64(1234567, 'us')
+    strings = timestamps.format_datetime64(values).tolist()
+    datetimes = values[:args.scalar_count].tolist()
+    scalar_strings = strings[:args.scalar_count]
+
+    print('scalar (%d calls)' % args.scalar_count)
+    rate('  format: strftime', len(datetimes),
+         lambda: [dt.strftime(timestamps.TIMESTAMP_FORMAT) for dt in datetimes])
+    rate('  format: format_timestamp', len(datetimes), lambda: [timestamps.format_timestamp(dt) for dt in datetimes])
+    rate('  parse: strptime', len(scalar_strings),
+         lambda: [datetime.datetime.strptime(s, timestamps.TIMESTAMP_FORMAT) for s in scalar_strings])
+    rate('  parse: parse_timestamp', len(scalar_strings),
+         lambda: [timestamps.parse_timestamp(s) for s in scalar_strings])
+    rate('  parse: pre-3.7 fallback (every second distinct)', len(scalar_strings),
+         lambda: [timestamps._parse_timestamp(s) for s in scalar_strings])
+
+    print('vectorised (%d timestamps)' % args.count)
+    rate('  format: DatetimeIndex.strftime', args.count,
+         lambda: pandas.DatetimeIndex(values).strftime(timestamps.TIMESTAMP_FORMAT))
+    rate('  format: format_datetime64', args.count, timestamps.format_datetime64, values)
+    rate('  parse: pandas.to_datetime (inferred)', args.count, pandas.to_datetime, strings)
+    rate('  parse: parse_datetime64', args.count, timestamps.parse_datetime64, strings)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Load test BulkUploader with an AdaptiveController against a local HTTP
+server that simulates a Senaps ingest endpoint with limited capacity.
+
+The server handles at most --workers requests at once, each taking
+--overhead seconds plus one second per --rate results, slowing down for
+batches approaching --knee results (n results take n / rate * (1 + n / knee)
+seconds). Up to --queue requests wait for a worker; beyond that, requests are
+rejected with 429. Half way through, the number of workers drops to
+--degraded-workers to show the controller backing off and settling again.
+
+    $ python benchmarks/load_test_ingest.py --rounds 40
+
+Each round uploads --round-results results and prints the controller metrics,
+the achieved throughput and the number of failed requests so far. Pass --fixed
+to use a fixed batch size and concurrency instead, for comparison.
+"""
+from __future__ import print_function
+
+import argparse
+import datetime
+import json
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from senaps_sensor.adaptive import AdaptiveController
+from senaps_sensor.api import API
+from senaps_sensor.auth import HTTPKeyAuth
+from senaps_sensor.upload import BulkUploader
+
+
+class SimulatedCapacity(object):
+
+    def __init__(self, workers, queue, rate, overhead, knee):
+        self.workers = workers
+        self.queue = queue
+        self.rate = rate
+        self.overhead = overhead
+        self.knee = knee
+        self.busy = 0
+        self.waiting = 0
+        self.condition = threading.Condition()
+
+    def handle(self, results):
+        with self.condition:
+            if self.busy >= self.workers and self.waiting >= self.queue:
+                return 429
+            self.waiting += 1
+            while self.busy >= self.workers:
+                self.condition.wait()
+            self.waiting -= 1
+            self.busy += 1
+        try:
+            time.sleep(self.overhead + float(results) / self.rate * (1 + float(results) / self.knee))
+        finally:
+            with self.condition:
+                self.busy -= 1
+                self.condition.notify()
+        return 200
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def make_handler(capacity):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers['Content-Length']))
+            status = capacity.handle(len(json.loads(body.decode('utf-8'))['results']))
+            payload = json.dumps({'message': 'Observations uploaded' if status == 200 else 'Busy'}).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def make_results(count, offset):
+    base = datetime.datetime(2016, 1, 1) + datetime.timedelta(seconds=offset)
+    return [{'t': base + datetime.timedelta(seconds=i), 'v': {'v': float(i)}} for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=40)
+    parser.add_argument('--round-results', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--degraded-workers', type=int, default=3)
+    parser.add_argument('--queue', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=5000.0, help='results per second per worker')
+    parser.add_argument('--overhead', type=float, default=0.05, help='seconds per request')
+    parser.add_argument('--knee', type=int, default=10000, help='batch size at which results take twice as long')
+    parser.add_argument('--fixed', action='store_true', help='use a fixed batch size of 500 and concurrency of 4')
+    args = parser.parse_args()
+
+    capacity = SimulatedCapacity(args.workers, args.queue, args.rate, args.overhead, args.knee)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(capacity))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    api = API(HTTPKeyAuth('load-test'), host='127.0.0.1:%d' % server.server_address[1], protocol='http',
+              connect_retries=0, read_retries=0, status_retries=0)
+    controller = None if args.fixed else AdaptiveController()
+    uploader = BulkUploader(api, max_results=500, concurrency=4, retry_delay=0.05, controller=controller)
+
+    print('%5s %8s %10s %11s %12s %8s' % ('round', 'workers', 'batch size', 'concurrency', 'results/s', 'errors'))
+    for i in range(args.rounds):
+        if i == args.rounds // 2:
+            capacity.workers = args.degraded_workers
+        results = make_results(args.round_results, i * args.round_results)
+        start = time.time()
+        summary = uploader.upload('load.test', results)
+        elapsed = time.time() - start
+        metrics = controller.metrics() if controller else {'batch_size': 500, 'concurrency': 4, 'failures': 0}
+        print('%5d %8d %10d %11d %12.0f %8d' % (i, capacity.workers, metrics['batch_size'], metrics['concurrency'],
+                                                  summary.accepted / elapsed, metrics['failures']))
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
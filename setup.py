@@ -55,6 +55,15 @@ setup(name="senaps_sensor",
       extras_require={
           'pandas-observation-parser': [
               'pandas>=0.18.1,<=0.25.3'
+          ],
+          'arrow-observation-parser': [
+              'pyarrow>=10.0.0'
+          ],
+          'polars-observation-parser': [
+              'polars>=0.19.0'
+          ],
+          'streaming-observation-parser': [
+              'ijson>=3.1'
           ]
       },
       zip_safe=True)
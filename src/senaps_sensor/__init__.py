@@ -14,6 +14,7 @@ Senaps data platform sensor API client library
 
 from __future__ import absolute_import, unicode_literals, print_function
 from .api import API
+from .cursor import Cursor
 
 __version__ = "2.17.0"
 __author__ = "CSIRO Data61"
@@ -0,0 +1,147 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+import logging
+import threading
+
+from senaps_sensor.error import is_retryable
+
+log = logging.getLogger('senset.adaptive')
+
+
+class AdaptiveController(object):
+    """
+    AIMD (additive increase, multiplicative decrease) controller for the batch
+    size and number of in-flight requests of an ingest client.
+
+    The latency of each successful upload, per result uploaded, is smoothed
+    and compared with the lowest smoothed latency seen so far (the baseline,
+    which drifts slowly upwards so that it can follow a server whose load has
+    changed). After every round of `concurrency` successful uploads whose
+    latency stayed within `latency_tolerance` times the baseline, the batch
+    size grows by `batch_increment` results and the concurrency by one.
+    Rate limiting (420/429), server errors and network errors, or latency
+    above the tolerance, multiply both by `backoff`, at most once per round
+    so that a burst of failures from one round only counts once. Client
+    errors (other 4xx) are not congestion and do not change the settings.
+
+        controller = AdaptiveController()
+        summary = BulkUploader(api, controller=controller).upload('my.stream', results)
+        print(controller.metrics())
+    """
+
+    def __init__(self, batch_size=500, concurrency=2, min_batch_size=50, max_batch_size=20000,
+                 min_concurrency=1, max_concurrency=16, batch_increment=250, backoff=0.5,
+                 latency_tolerance=1.5, smoothing=0.2, baseline_drift=0.01):
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.batch_increment = batch_increment
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.baseline_drift = baseline_drift
+        self.lock = threading.Lock()
+
+        self.latency = None
+        self.baseline = None
+        self.successes = 0
+        self.failures = 0
+        self.increases = 0
+        self.decreases = 0
+        self._round = 0
+        self._since_decrease = None
+        self._cooldown = 0
+
+    def record_success(self, results, latency):
+        """Report an upload of `results` results that succeeded after `latency` seconds."""
+        if not results:
+            return
+        per_result = float(latency) / results
+        with self.lock:
+            self.successes += 1
+            self._completed()
+            if self.latency is None:
+                self.latency = self.baseline = per_result
+            else:
+                self.latency += self.smoothing * (per_result - self.latency)
+                self.baseline = min(self.latency, self.baseline * (1 + self.baseline_drift))
+
+            if self.latency > self.baseline * self.latency_tolerance:
+                self._decrease('latency %.3g s/result above baseline %.3g' % (self.latency, self.baseline))
+                return
+            self._round += 1
+            if self._round >= self.concurrency:
+                self._increase()
+
+    def record_failure(self, error):
+        """Report an upload that failed with the SenapsError `error`."""
+        with self.lock:
+            self.failures += 1
+            self._completed()
+            if is_retryable(error):
+                self._decrease(error)
+
+    def metrics(self):
+        """The current settings and counters, as a dict."""
+        with self.lock:
+            return {
+                'batch_size': self.batch_size,
+                'concurrency': self.concurrency,
+                'latency': self.latency,
+                'baseline_latency': self.baseline,
+                'successes': self.successes,
+                'failures': self.failures,
+                'increases': self.increases,
+                'decreases': self.decreases,
+            }
+
+    def _completed(self):
+        if self._since_decrease is not None:
+            self._since_decrease += 1
+
+    def _increase(self):
+        self._round = 0
+        batch_size = min(self.batch_size + self.batch_increment, self.max_batch_size)
+        concurrency = min(self.concurrency + 1, self.max_concurrency)
+        if (batch_size, concurrency) != (self.batch_size, self.concurrency):
+            self.batch_size, self.concurrency = batch_size, concurrency
+            self.increases += 1
+            log.debug('Increased to batch size %d, concurrency %d', batch_size, concurrency)
+
+    def _decrease(self, reason):
+        self._round = 0
+        if self._since_decrease is not None and self._since_decrease < self._cooldown:
+            # still completing requests that were in flight at the last decrease
+            return
+        self._since_decrease = 0
+        self._cooldown = self.concurrency
+        self.batch_size = max(int(self.batch_size * self.backoff), self.min_batch_size)
+        self.concurrency = max(int(self.concurrency * self.backoff), self.min_concurrency)
+        self.decreases += 1
+        log.debug('Decreased to batch size %d, concurrency %d (%s)', self.batch_size, self.concurrency, reason)
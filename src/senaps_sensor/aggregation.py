@@ -0,0 +1,137 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from senaps_sensor.arrays import ObservationArrays, as_numpy
+from senaps_sensor.error import SenapsError
+from senaps_sensor.parsers import AGGREGATION_FIELDS
+from senaps_sensor.timestamps import format_datetime64
+
+
+def _numpy():
+    import numpy  # NOTE: import here means we don't require numpy to be installed unless it is used.
+    return numpy
+
+
+def aggregate(timestamps, values, aggperiod, streamid='v'):
+    """
+    Compute the avg, min, max and count of scalar observations per
+    `aggperiod` (milliseconds or a timedelta), like the /aggregation
+    endpoint: periods are aligned to multiples of aggperiod since the Unix
+    epoch, are labelled with their start, and only periods holding at least
+    one value are returned. NaN values and NaT timestamps are ignored.
+
+    timestamps (datetime64) and values may be numpy or pyarrow arrays, in any
+    order. The result has the layout NumpyObservationParser gives a
+    get_aggregation response: ObservationArrays of datetime64[ns] period
+    timestamps and '<streamid>.avg', '.min', '.max' and '.count' float arrays.
+    """
+    numpy = _numpy()
+    if isinstance(aggperiod, timedelta):
+        aggperiod = int(aggperiod.total_seconds() * 1000)
+    aggperiod = int(aggperiod)
+    if aggperiod <= 0:
+        raise SenapsError('aggperiod must be a positive number of milliseconds.')
+
+    timestamps = as_numpy(timestamps)
+    values = as_numpy(values)
+    if timestamps.dtype.kind != 'M':
+        raise SenapsError('timestamps must be a datetime64 array.')
+    if values.ndim != 1 or len(values) != len(timestamps):
+        raise SenapsError('values must be a 1-D array with one value per timestamp.')
+    try:
+        values = values.astype(float)
+    except (TypeError, ValueError):
+        values = numpy.array([numpy.nan if v is None else v for v in values], dtype=float)
+
+    keep = ~numpy.isnat(timestamps) & ~numpy.isnan(values)
+    # floor division keeps periods before the epoch aligned too
+    periods = timestamps[keep].astype('datetime64[ms]').astype(numpy.int64) // aggperiod
+    values = values[keep]
+    if len(periods) and (numpy.diff(periods) < 0).any():
+        order = numpy.argsort(periods, kind='stable')
+        periods, values = periods[order], values[order]
+
+    if len(periods):
+        starts = numpy.flatnonzero(numpy.concatenate(([True], periods[1:] != periods[:-1])))
+        count = numpy.diff(numpy.append(starts, len(periods))).astype(float)
+        arrays = OrderedDict([
+            ('%s.avg' % streamid, numpy.add.reduceat(values, starts) / count),
+            ('%s.min' % streamid, numpy.minimum.reduceat(values, starts)),
+            ('%s.max' % streamid, numpy.maximum.reduceat(values, starts)),
+            ('%s.count' % streamid, count),
+        ])
+        period_timestamps = (periods[starts] * aggperiod).astype('datetime64[ms]').astype('datetime64[ns]')
+    else:
+        arrays = OrderedDict(('%s.%s' % (streamid, field), numpy.empty(0)) for field in AGGREGATION_FIELDS)
+        period_timestamps = numpy.empty(0, dtype='datetime64[ns]')
+    return ObservationArrays(period_timestamps, arrays)
+
+
+def aggregation_results(arrays, streamid='v'):
+    """
+    Return aggregated ObservationArrays as the JSON document get_aggregation
+    returns: {'results': [{'t': ..., 'v': {'avg': ..., 'min': ..., 'max': ..., 'count': ...}}]}.
+    """
+    columns = [arrays['%s.%s' % (streamid, field)].tolist() for field in AGGREGATION_FIELDS]
+    results = []
+    for t, avg, minimum, maximum, count in zip(format_datetime64(arrays.timestamps).tolist(), *columns):
+        results.append({'t': t, 'v': {'avg': avg, 'min': minimum, 'max': maximum, 'count': int(count)}})
+    return {'results': results}
+
+
+class AggregationEngine(object):
+    """
+    Aggregates observations that are already held locally (e.g. cached,
+    replicated or exported) without a get_aggregation round trip, computing
+    each stream on one of `concurrency` threads. See aggregate() for the
+    statistics and periods.
+
+        engine = AggregationEngine(concurrency=8)
+        aggregations = engine.aggregate_streams(arrays, timedelta(hours=1))
+        aggregations['my.stream']['my.stream.avg']
+    """
+
+    def __init__(self, concurrency=4):
+        self.concurrency = concurrency
+
+    def aggregate_streams(self, data, aggperiod):
+        """
+        Aggregate several scalar streams: either ObservationArrays (as returned
+        by NumpyObservationParser) or a dict of stream id to a (timestamps,
+        values) pair. Returns an OrderedDict of stream id to the stream's
+        aggregated ObservationArrays, in the order of `data`.
+        """
+        if isinstance(data, ObservationArrays):
+            streams = [(streamid, data.timestamps, values) for streamid, values in data.items()]
+        else:
+            streams = [(streamid, timestamps, values) for streamid, (timestamps, values) in data.items()]
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            aggregated = list(executor.map(lambda s: aggregate(s[1], s[2], aggperiod, s[0]), streams))
+        return OrderedDict((streamid, arrays) for (streamid, _, _), arrays in zip(streams, aggregated))
@@ -0,0 +1,341 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from senaps_sensor.arrays import ObservationArrays, as_numpy
+from senaps_sensor.error import SenapsError
+from senaps_sensor.models import InterpolationType
+from senaps_sensor.timestamps import to_utc
+
+NEAREST = 'nearest'
+PREVIOUS = 'previous'
+NEXT = 'next'
+LINEAR = 'linear'
+METHODS = frozenset([NEAREST, PREVIOUS, NEXT, LINEAR])
+
+# A value reported for the period preceding its timestamp holds until that timestamp, so a grid point
+# takes the next value; one reported for the succeeding period holds from its timestamp on.
+INTERPOLATION_METHODS = {
+    InterpolationType.continuous: LINEAR,
+    InterpolationType.discontinuous: NEAREST,
+    InterpolationType.instant_total: NEAREST,
+    InterpolationType.average_preceding: NEXT,
+    InterpolationType.max_preceding: NEXT,
+    InterpolationType.min_preceding: NEXT,
+    InterpolationType.total_preceding: NEXT,
+    InterpolationType.const_preceding: NEXT,
+    InterpolationType.average_succeeding: PREVIOUS,
+    InterpolationType.total_succeeding: PREVIOUS,
+    InterpolationType.min_succeeding: PREVIOUS,
+    InterpolationType.max_succeeding: PREVIOUS,
+    InterpolationType.const_succeeding: PREVIOUS,
+}
+
+CHUNK_SIZE = 65536
+
+
+def _numpy():
+    import numpy  # NOTE: import here means we don't require numpy to be installed unless it is used.
+    return numpy
+
+
+def regular_grid(start, end, step):
+    """Return the datetime64[ns] grid start, start + step, ... up to and including end."""
+    numpy = _numpy()
+    if isinstance(start, datetime):
+        start = to_utc(start)
+    if isinstance(end, datetime):
+        end = to_utc(end)
+    if isinstance(step, timedelta):
+        step = numpy.timedelta64(int(step.total_seconds() * 10 ** 6), 'us')
+    start, end = numpy.datetime64(start, 'ns'), numpy.datetime64(end, 'ns')
+    step = numpy.timedelta64(step, 'ns')
+    if step <= numpy.timedelta64(0, 'ns'):
+        raise SenapsError('The grid step must be positive.')
+    count = max(int((end - start) // step) + 1, 0)
+    return start + numpy.arange(count) * step
+
+
+def method_for(metadata, default=PREVIOUS):
+    """The alignment method matching the InterpolationType of StreamMetaData (or a Stream), if it has one."""
+    metadata = getattr(metadata, 'metadata', metadata)
+    interpolation_type = getattr(metadata, 'interpolation_type', None)
+    return INTERPOLATION_METHODS.get(interpolation_type, default)
+
+
+def prepare_series(timestamps, values):
+    """
+    Return a stream's observations as (int64 nanosecond timestamps, float
+    values) sorted by time, without NaT timestamps or missing (all NaN) rows.
+    """
+    numpy = _numpy()
+    timestamps = as_numpy(timestamps)
+    if timestamps.dtype.kind != 'M':
+        raise SenapsError('timestamps must be a datetime64 array.')
+    values = as_numpy(values).astype(float)
+    if values.ndim not in (1, 2) or len(values) != len(timestamps):
+        raise SenapsError('values must be a 1-D or 2-D array with one row per timestamp.')
+
+    keep = ~numpy.isnat(timestamps)
+    keep &= ~numpy.isnan(values) if values.ndim == 1 else ~numpy.isnan(values).all(axis=1)
+    timestamps = timestamps[keep].astype('datetime64[ns]').view(numpy.int64)
+    values = values[keep]
+    if len(timestamps) and (numpy.diff(timestamps) < 0).any():
+        order = numpy.argsort(timestamps, kind='stable')
+        timestamps, values = timestamps[order], values[order]
+    return timestamps, values
+
+
+def align_series(grid, timestamps, values, method=PREVIOUS, tolerance=None):
+    """
+    Align one stream's prepared observations (see prepare_series) to the
+    int64 nanosecond `grid`. Grid points are filled with:
+
+    - 'previous': the latest observation at or before the point;
+    - 'next': the earliest observation at or after the point;
+    - 'nearest': the closest observation, the previous one on a tie;
+    - 'linear': linear interpolation between the observations either side.
+
+    Observations further than `tolerance` (nanoseconds) from the point are
+    not used, and points without a usable observation are NaN. Each point is
+    located with a binary search, so aligning m points to n observations
+    takes O(m log n).
+    """
+    numpy = _numpy()
+    if method not in METHODS:
+        raise SenapsError('Unknown alignment method %r, expected one of %s' % (method, ', '.join(sorted(METHODS))))
+    shape = (len(grid),) + values.shape[1:]
+    aligned = numpy.full(shape, numpy.nan)
+    if not len(timestamps):
+        return aligned
+    limit = numpy.inf if tolerance is None else tolerance
+
+    after = numpy.searchsorted(timestamps, grid, side='left')
+    before = numpy.searchsorted(timestamps, grid, side='right') - 1
+    has_before = before >= 0
+    has_after = after < len(timestamps)
+    before_gap = numpy.where(has_before, grid - timestamps[numpy.maximum(before, 0)], numpy.iinfo(numpy.int64).max)
+    after_gap = numpy.where(has_after, timestamps[numpy.minimum(after, len(timestamps) - 1)] - grid,
+                            numpy.iinfo(numpy.int64).max)
+    use_before = has_before & (before_gap <= limit)
+    use_after = has_after & (after_gap <= limit)
+
+    if method == PREVIOUS:
+        aligned[use_before] = values[before[use_before]]
+    elif method == NEXT:
+        aligned[use_after] = values[after[use_after]]
+    elif method == NEAREST:
+        take_before = use_before & (~use_after | (before_gap <= after_gap))
+        take_after = use_after & ~take_before
+        aligned[take_before] = values[before[take_before]]
+        aligned[take_after] = values[after[take_after]]
+    else:
+        exact = use_before & (before_gap == 0)
+        aligned[exact] = values[before[exact]]
+        between = use_before & use_after & ~exact
+        lower, upper = before[between], after[between]
+        weight = (grid[between] - timestamps[lower]) / (timestamps[upper] - timestamps[lower]).astype(float)
+        if values.ndim == 2:
+            weight = weight[:, None]
+        aligned[between] = values[lower] + weight * (values[upper] - values[lower])
+    return aligned
+
+
+def _is_pair(source):
+    """Whether source is a (timestamps, values) pair of array-likes, rather than a sequence of such pairs."""
+    if not isinstance(source, (tuple, list)) or len(source) != 2:
+        return False
+    first = source[0]
+    # the first item of a sequence of pairs is itself a pair of array-likes, not timestamps
+    return not (isinstance(first, (tuple, list)) and len(first) == 2 and hasattr(first[0], '__len__'))
+
+
+class _StreamWindow(object):
+    """
+    The prepared observations of one stream that the current grid chunk can
+    use, read from the stream's time ordered (timestamps, values) chunks as
+    the grid advances. Observations before the last one at or before the end
+    of a grid chunk are dropped once that chunk has been aligned.
+    """
+
+    def __init__(self, source):
+        if _is_pair(source):
+            source = [source]
+        self.source = iter(source)
+        self.timestamps = None
+        self.values = None
+        self.last = None
+        self.exhausted = False
+
+    def observations(self, end):
+        """Read chunks until an observation after `end` is held, returning (timestamps, values)."""
+        numpy = _numpy()
+        while not self.exhausted and (self.timestamps is None or not len(self.timestamps)
+                                      or (end is not None and self.timestamps[-1] <= end)):
+            try:
+                chunk = next(self.source)
+            except StopIteration:
+                self.exhausted = True
+                break
+            if not isinstance(chunk, (tuple, list)) or len(chunk) != 2:
+                raise SenapsError('A stream must be a (timestamps, values) pair or an iterable of them.')
+            timestamps, values = chunk
+            timestamps, values = prepare_series(timestamps, values)
+            if not len(timestamps) and self.timestamps is not None:
+                continue
+            if self.last is not None and len(timestamps) and timestamps[0] < self.last:
+                raise SenapsError('The observation chunks of a stream must be in time order.')
+            if self.timestamps is None or not len(self.timestamps):
+                self.timestamps, self.values = timestamps, values
+            else:
+                self.timestamps = numpy.concatenate([self.timestamps, timestamps])
+                self.values = numpy.concatenate([self.values, values])
+            if len(timestamps):
+                self.last = timestamps[-1]
+        if self.timestamps is None:
+            return numpy.empty(0, numpy.int64), numpy.empty(0)
+        return self.timestamps, self.values
+
+    def trim(self, end):
+        """Drop the observations that no grid point after `end` can use."""
+        if self.timestamps is None or not len(self.timestamps):
+            return
+        numpy = _numpy()
+        last = numpy.searchsorted(self.timestamps, end, side='right') - 1
+        if last > 0:
+            # keep every observation sharing the last timestamp, as 'next' takes the first of them
+            first = numpy.searchsorted(self.timestamps, self.timestamps[last], side='left')
+            self.timestamps = self.timestamps[first:]
+            self.values = self.values[first:]
+
+
+class Aligner(object):
+    """
+    Aligns many streams sampled at different rates onto a common time grid
+    (an as-of join), producing one row per grid timestamp.
+
+    Each stream is filled with `method` ('previous', 'next', 'nearest' or
+    'linear', or a dict of stream id to method). Streams without a method
+    use the method matching the InterpolationType of their metadata, when
+    the queried `streams` (Stream instances, or a dict of stream id to Stream
+    or StreamMetaData) are given, and 'previous' otherwise: continuous streams
+    are interpolated linearly, discontinuous and instant total streams take
+    the nearest value, and streams of values reported over the preceding
+    (succeeding) period take the next (previous) value. Observations further
+    than `tolerance` (a timedelta, or a dict of stream id to timedelta) from a
+    grid point are not used.
+
+    The grid is processed `chunk_size` points at a time, so iter_chunks()
+    holds only one chunk of aligned rows in memory at once. A stream given as
+    a single (timestamps, values) pair is prepared (see prepare_series) as a
+    whole, which copies it; to bound memory for long streams, give an
+    iterable of time ordered (timestamps, values) chunks instead, which are
+    read only as far as the grid has advanced.
+
+        aligner = Aligner(regular_grid(start, end, timedelta(minutes=5)), streams=streams,
+                          tolerance=timedelta(minutes=15))
+        matrix = aligner.matrix(data)
+    """
+
+    def __init__(self, grid, method=None, tolerance=None, streams=None, chunk_size=CHUNK_SIZE):
+        numpy = _numpy()
+        grid = as_numpy(grid)
+        if grid.dtype.kind != 'M':
+            raise SenapsError('The grid must be a datetime64 array.')
+        self.grid = grid.astype('datetime64[ns]')
+        if len(self.grid) and (numpy.diff(self.grid.view(numpy.int64)) < 0).any():
+            raise SenapsError('The grid timestamps must be in ascending order.')
+        self.method = method
+        self.tolerance = tolerance
+        if streams is not None and not isinstance(streams, dict):
+            streams = dict((stream.id, stream) for stream in streams)
+        self.streams = streams or {}
+        self.chunk_size = chunk_size
+
+    def method_for(self, streamid):
+        method = self.method.get(streamid) if isinstance(self.method, dict) else self.method
+        if method is None:
+            method = method_for(self.streams.get(streamid))
+        return method
+
+    def tolerance_for(self, streamid):
+        """The stream's tolerance in nanoseconds, or None."""
+        tolerance = self.tolerance.get(streamid) if isinstance(self.tolerance, dict) else self.tolerance
+        if tolerance is None:
+            return None
+        if isinstance(tolerance, timedelta):
+            return int(tolerance.total_seconds() * 10 ** 6) * 1000
+        return int(_numpy().timedelta64(tolerance, 'ns').astype('int64'))
+
+    def iter_chunks(self, data):
+        """
+        Yield ObservationArrays for consecutive chunks of the grid, each
+        holding the aligned values of every stream in `data`: ObservationArrays,
+        or a dict of stream id to a (timestamps, values) pair or to an iterable
+        of time ordered (timestamps, values) chunks.
+        """
+        if isinstance(data, ObservationArrays):
+            data = OrderedDict((streamid, (data.timestamps, values)) for streamid, values in data.items())
+        windows = OrderedDict((streamid, _StreamWindow(source)) for streamid, source in data.items())
+        settings = dict((streamid, (self.method_for(streamid), self.tolerance_for(streamid))) for streamid in windows)
+
+        grid = self.grid.view('int64')
+        for start in range(0, max(len(grid), 1), self.chunk_size):
+            chunk = grid[start:start + self.chunk_size]
+            end = chunk[-1] if len(chunk) else None
+            values = OrderedDict()
+            for streamid, window in windows.items():
+                method, tolerance = settings[streamid]
+                timestamps, stream_values = window.observations(end)
+                values[streamid] = align_series(chunk, timestamps, stream_values, method, tolerance)
+                if end is not None:
+                    window.trim(end)
+            yield ObservationArrays(self.grid[start:start + self.chunk_size], values)
+
+    def align(self, data):
+        """Align every stream in `data` to the whole grid, returning ObservationArrays."""
+        numpy = _numpy()
+        chunks = list(self.iter_chunks(data))
+        values = OrderedDict((streamid, numpy.concatenate([c[streamid] for c in chunks])) for streamid in chunks[0])
+        return ObservationArrays(self.grid, values)
+
+    def matrix(self, data):
+        """
+        Align scalar streams into a single (grid x streams) float array, in
+        the order of `data`, filled one chunk at a time.
+        """
+        numpy = _numpy()
+        matrix = None
+        for chunk_index, chunk in enumerate(self.iter_chunks(data)):
+            if matrix is None:
+                matrix = numpy.empty((len(self.grid), len(chunk.values)), order='F')
+            start = chunk_index * self.chunk_size
+            for column, (streamid, values) in enumerate(chunk.items()):
+                if values.ndim != 1:
+                    raise SenapsError('Stream %s is not a scalar stream.' % streamid)
+                matrix[start:start + len(values), column] = values
+        return matrix
@@ -25,6 +25,7 @@ from __future__ import unicode_literals, absolute_import, print_function
 
 from senaps_sensor.binder import bind_api
 from senaps_sensor.error import SenapsError
+from senaps_sensor.models import IdentityMap
 from senaps_sensor.parsers import ModelParser, Parser
 from senaps_sensor.utils import list_to_csv
 from senaps_sensor.const import VALID_PROTOCOLS
@@ -38,7 +39,8 @@ class API(object):
                  retry_count=0, retry_delay=0, retry_errors=None, timeout=60, parser=None,
                  compression=False, wait_on_rate_limit=False, connect_retries=3, read_retries=3,
                  backoff_factor=0.5, status_retries=3,
-                 wait_on_rate_limit_notify=False, proxy='', verify=True, protocol='https'):
+                 wait_on_rate_limit_notify=False, proxy='', verify=True, protocol='https',
+                 identity_map=None):
         """ Api instance Constructor
 
         :param auth_handler:
@@ -56,7 +58,11 @@ class API(object):
         :param proxy: Url to use as proxy during the HTTP request, default:''
         :param protocol: specify connection protocol to use. https by default.
         :param verify: Verify SSL certs if true. Will have no affect if protocol='http'
-        :raise TypeError: If the given parser is not a ModelParser instance.
+        :param identity_map: IdentityMap shared by every response parsed by this api (held until its
+            clear() is called), or True to share embedded Organisation/Group/Location instances within
+            each response only, default:None
+        :raise TypeError: If the given parser is not a ModelParser instance, or identity_map is not an
+            IdentityMap, True or None.
         :raise ValueError: If the given protocol is not in the set 'http', 'https'
         """
         self.auth = auth_handler
@@ -77,6 +83,10 @@ class API(object):
         self.wait_on_rate_limit = wait_on_rate_limit
         self.wait_on_rate_limit_notify = wait_on_rate_limit_notify
         self.parser = parser or ModelParser()
+        # other falsy values (e.g. False) disable the identity map like None; an empty IdentityMap is falsy too
+        if not isinstance(identity_map, IdentityMap) and not identity_map:
+            identity_map = None
+        self.identity_map = identity_map
         self.proxy = {}
 
         if self.protocol not in VALID_PROTOCOLS:
@@ -95,6 +105,12 @@ class API(object):
                 )
             )
 
+        if self.identity_map not in (None, True) and not isinstance(self.identity_map, IdentityMap):
+            raise TypeError(
+                '"identity_map" argument has to be an instance of "IdentityMap", True or None.'
+                ' It is currently a {actual}.'.format(actual=type(self.identity_map))
+            )
+
     @property
     def me(self):
         """ Get the authenticated user using root api call
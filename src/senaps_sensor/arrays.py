@@ -0,0 +1,166 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+import re
+from collections import OrderedDict
+
+from senaps_sensor.error import SenapsError
+from senaps_sensor.models import StreamMetaDataType
+
+VECTOR_COLUMN = re.compile(r'^(.*)\[(\d+)\]$')
+
+
+class ObservationArrays(object):
+    """
+    Observations of one or more streams as numpy arrays: a datetime64[ns]
+    `timestamps` array shared by every stream, and `values` mapping each
+    stream id (in the order the streams were requested) to a float array
+    with one row per timestamp, 1-D for scalar streams and 2-D for vector
+    streams. Missing values are NaN.
+
+    Vector streams are dense (timestamps x bins) C-contiguous arrays. For
+    regularly binned vector streams whose metadata was given to the parser,
+    `coordinates` maps the stream id to the bin axis, one value per column.
+
+        arrays = api.get_observations(streamid='a,b', media='csv', parser=NumpyObservationParser())
+        arrays.timestamps, arrays['a']
+    """
+
+    def __init__(self, timestamps, values, coordinates=None):
+        self.timestamps = timestamps
+        self.values = values
+        self.coordinates = coordinates if coordinates is not None else OrderedDict()
+
+    def __getitem__(self, streamid):
+        return self.values[streamid]
+
+    def __contains__(self, streamid):
+        return streamid in self.values
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def keys(self):
+        return self.values.keys()
+
+    def items(self):
+        return self.values.items()
+
+    def __repr__(self):
+        shapes = ', '.join('%s: %s' % (k, v.shape) for k, v in self.values.items())
+        return 'ObservationArrays(%d timestamps, {%s})' % (len(self.timestamps), shapes)
+
+
+def as_numpy(values):
+    """Return numpy arrays as they are, and convert pyarrow (and similar) arrays with their to_numpy()."""
+    import numpy  # NOTE: import here means we don't require numpy to be installed unless it is used.
+
+    if not isinstance(values, numpy.ndarray) and hasattr(values, 'to_numpy'):
+        try:
+            # pyarrow arrays with nulls can't be converted without a copy
+            return values.to_numpy(zero_copy_only=False)
+        except TypeError:
+            return values.to_numpy()
+    return numpy.asarray(values)
+
+
+def values_array(values):
+    """
+    A float array of scalar values, or a dense (rows x width) array of vector
+    values, with None, missing rows and the missing tail of short vectors as NaN.
+    """
+    import numpy  # NOTE: import here means we don't require numpy to be installed unless it is used.
+
+    widths = [len(v) for v in values if isinstance(v, list)]
+    if not widths:
+        return numpy.array([numpy.nan if v is None else v for v in values], dtype=float)
+    width = max(widths)
+    if len(widths) == len(values) and min(widths) == width:
+        return numpy.array([[numpy.nan if x is None else x for x in v] for v in values],
+                           dtype=float).reshape(-1, width)
+    # missing rows, and vectors shorter than the longest one, are padded with NaN
+    array = numpy.full((len(values), width), numpy.nan)
+    for i, v in enumerate(values):
+        if v:
+            array[i, :len(v)] = [numpy.nan if x is None else x for x in v]
+    return array
+
+
+def group_columns(columns, stream_ids):
+    """
+    Map each requested stream id, in the order given, to the position of its
+    column in `columns`, or to the positions of its id[0], id[1], ... columns
+    (in index order) for a vector stream. Streams without columns are left out.
+    """
+    scalar = {}
+    vector = {}
+    for i, column in enumerate(columns):
+        match = VECTOR_COLUMN.match(column)
+        if match:
+            vector.setdefault(match.group(1), []).append((int(match.group(2)), i))
+        else:
+            scalar[column] = i
+
+    groups = OrderedDict()
+    for streamid in stream_ids:
+        if streamid in scalar:
+            groups[streamid] = scalar[streamid]
+        elif streamid in vector:
+            groups[streamid] = [i for _, i in sorted(vector[streamid])]
+    return groups
+
+
+def bin_coordinates(metadata, count=None):
+    """
+    Return the bin axis of a regularly binned vector stream from its
+    StreamMetaData (or the Stream itself): start, start + step, ... up to and
+    including end when it falls on a bin. With `count`, the number of bins
+    actually observed, exactly that many coordinates are returned.
+    """
+    import numpy  # NOTE: import here means we don't require numpy to be installed unless it is used.
+
+    metadata = getattr(metadata, 'metadata', metadata)
+    start, end, step = metadata.start, metadata.end, metadata.step
+    if start is None or step is None:
+        raise SenapsError('Stream metadata is not regularly binned (no start and step).')
+    if not step:
+        raise SenapsError('Regularly binned stream metadata has a step of 0.')
+    if count is None:
+        if end is None:
+            raise SenapsError('Regularly binned stream metadata has no end.')
+        # round rather than floor so that float error in (end - start) / step doesn't lose the last bin
+        count = max(int(numpy.floor((end - start) / float(step) + 0.5)) + 1, 0)
+    return start + step * numpy.arange(count, dtype=float)
+
+
+def is_regularly_binned(metadata):
+    """Whether StreamMetaData (or a Stream) describes a regularly binned vector stream."""
+    metadata = getattr(metadata, 'metadata', metadata)
+    if metadata is None:
+        return False
+    if metadata.type is not None:
+        return metadata.type == StreamMetaDataType.regularly_binned_vector
+    # the type is not returned by the API, so recognise the stream by its bin parameters
+    return metadata.start is not None and metadata.step is not None
@@ -55,6 +55,33 @@ try:
 except ImportError:
     model_classes = (Model,)
 
+STREAM_CHUNK_SIZE = 65536
+
+
+class ResponseStream(object):
+    """
+    A file-like view of a streamed response body for parsers with
+    stream_payload set. read() returns each piece of the (decompressed) body
+    as soon as it has been received, so it may return less than it was asked
+    for; an empty result marks the end of the body.
+    """
+
+    def __init__(self, response, chunk_size=STREAM_CHUNK_SIZE):
+        self.response = response
+        self.chunks = response.iter_content(chunk_size)
+        self.closed = False
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            return b''.join(self.chunks)
+        if size == 0:
+            return b''
+        return next(self.chunks, b'')
+
+    def close(self):
+        self.closed = True
+        self.response.close()
+
 
 def bind_api(**config):
     class APIMethod(object):
@@ -202,6 +229,9 @@ def bind_api(**config):
 
         def execute(self):
             self.api.cached_result = False
+            # parsers passed per call only need parse() and parse_error(), so these flags are optional
+            stream_payload = getattr(self.parser, 'stream_payload', False)
+            binary_payload = getattr(self.parser, 'binary_payload', False)
 
             # Build the request URL
             url = self.api_root + self.path
@@ -209,7 +239,7 @@ def bind_api(**config):
 
             # Query the cache if one is available
             # and this request uses a GET method.
-            if self.use_cache and self.api.cache and self.method == 'GET':
+            if self.use_cache and self.api.cache and self.method == 'GET' and not stream_payload:
                 cache_result = self.api.cache.get(url)
                 # if cache result found and not expired, return it
                 if cache_result:
@@ -261,7 +291,8 @@ def bind_api(**config):
                                                     params=self.query_params,
                                                     timeout=self.api.timeout,
                                                     auth=self.api.auth,
-                                                    proxies=self.api.proxy)
+                                                    proxies=self.api.proxy,
+                                                    stream=stream_payload)
                     else:
                         resp = self.session.request(self.method,
                                                     full_url,
@@ -269,7 +300,8 @@ def bind_api(**config):
                                                     params=self.query_params,
                                                     timeout=self.api.timeout,
                                                     auth=self.api.auth,
-                                                    proxies=self.api.proxy)
+                                                    proxies=self.api.proxy,
+                                                    stream=stream_payload)
                 except Exception as e:
                     raise SenapsError('Failed to send request: %s' % e)
                 rem_calls = resp.headers.get('x-rate-limit-remaining')
@@ -298,6 +330,9 @@ def bind_api(**config):
 
                 # Sleep before retrying request again
                 if retries_performed < self.retry_count + 1:  # Only sleep when not on the last retry
+                    if stream_payload:
+                        # release the connection of the response that is not going to be read
+                        resp.close()
                     time.sleep(retry_delay)
 
             # If an error was returned, throw an exception
@@ -316,10 +351,15 @@ def bind_api(**config):
                     raise SenapsError(error_msg, resp, api_code=api_error_code)
 
             # Parse the response payload
-            result = self.parser.parse(self, resp.text)
+            if stream_payload:
+                payload = ResponseStream(resp)
+            else:
+                payload = resp.content if binary_payload else resp.text
+            result = self.parser.parse(self, payload)
 
             # Store result into cache if one is available.
-            if self.use_cache and self.api.cache and self.method == 'GET' and result:
+            if self.use_cache and self.api.cache and self.method == 'GET' and result \
+                    and not stream_payload:
                 self.api.cache.store(url, result)
 
             return result
@@ -339,5 +379,7 @@ def bind_api(**config):
             _call.pagination_mode = 'id'
     elif 'page' in APIMethod.allowed_param:
         _call.pagination_mode = 'page'
+    elif 'skip' in APIMethod.query_only_param:
+        _call.pagination_mode = 'skip'
 
     return _call
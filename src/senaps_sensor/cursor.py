@@ -0,0 +1,317 @@
+"""
+MIT License
+Copyright (c) 2016 Ionata Digital
+Copyright (c) 2009-2014 Joshua Roesslein
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from six.moves import queue
+
+from senaps_sensor.error import SenapsError, ConsistencyError
+from senaps_sensor.models import ResultSet
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_CONCURRENCY = 4
+
+log = logging.getLogger('senset.cursor')
+
+
+class Cursor(object):
+    """Pagination helper class
+
+    Walks a listing endpoint that takes 'limit'/'skip' query parameters
+    (e.g. api.streams, api.locations, api.roles, api.get_groups) one page
+    at a time, only ever holding a single page in memory:
+
+        for stream in Cursor(api.streams, page_size=500, expand=True).items():
+            ...
+
+    Passing prefetch=N to pages() or items() fetches and parses up to N pages
+    ahead of the consumer on a background thread.
+    """
+
+    def __init__(self, method, *args, **kwargs):
+        if getattr(method, 'pagination_mode', None) == 'skip':
+            self.iterator = SkipIterator(method, args, kwargs)
+        elif hasattr(method, 'pagination_mode'):
+            raise SenapsError('Invalid pagination mode.')
+        else:
+            raise SenapsError('This method does not perform pagination')
+
+    def pages(self, limit=0, prefetch=0):
+        """Return iterator for pages"""
+        if limit > 0:
+            self.iterator.limit = limit
+        if prefetch > 0:
+            return PrefetchIterator(self.iterator, prefetch)
+        return self.iterator
+
+    def items(self, limit=0, prefetch=0):
+        """Return iterator for items in each page, stopping after limit items if given"""
+        if prefetch > 0:
+            i = ItemIterator(PrefetchIterator(self.iterator, prefetch))
+        else:
+            i = ItemIterator(self.iterator)
+        i.limit = limit
+        return i
+
+    def fetch_all(self, concurrency=DEFAULT_CONCURRENCY, strict=True):
+        """
+        Fetch the whole listing as a single ResultSet. The first page is fetched
+        on its own to learn the total 'count', then every remaining 'skip' offset
+        is requested concurrently on at most `concurrency` threads, stepping by
+        the size of the first page (the server may cap 'limit'). Rate limiting
+        is handled per request by the api's wait_on_rate_limit/retry settings.
+
+        Pages are assembled in offset order. If the collection changes during the
+        scan (the reported count changes, an item is listed twice or fewer items
+        than counted are returned) a ConsistencyError is raised, or with
+        strict=False a warning is logged and duplicates are dropped.
+        """
+        iterator = self.iterator
+        first = iterator.fetch(iterator.skip)
+        results = ResultSet(total_count=first.total_count)
+        results.extend(first)
+
+        if first.total_count is None:
+            # Server did not report a total, so the offsets can't be computed up front.
+            iterator.skip += len(first)
+            if len(first) == iterator.page_size:
+                for page in iterator:
+                    results.extend(page)
+            return results
+
+        # step by the page size the server actually returned, which it may cap below page_size
+        step = len(first)
+        offsets = range(iterator.skip + step, first.total_count, step) if step else []
+        if offsets:
+            executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+            futures = [executor.submit(iterator.fetch, offset) for offset in offsets]
+            try:
+                pages = [f.result() for f in futures]
+            finally:
+                for f in futures:
+                    f.cancel()
+                executor.shutdown(wait=True)
+        else:
+            pages = []
+
+        problems = []
+        for page in pages:
+            if page.total_count is not None and page.total_count != first.total_count:
+                problems.append('collection count changed from %s to %s' % (first.total_count, page.total_count))
+                break
+
+        seen = set(item.id for item in first if hasattr(item, 'id'))
+        duplicates = []
+        for page in pages:
+            for item in page:
+                if hasattr(item, 'id'):
+                    if item.id in seen:
+                        duplicates.append(item.id)
+                        continue
+                    seen.add(item.id)
+                results.append(item)
+        if duplicates:
+            problems.append('%d item(s) listed more than once (e.g. %s)' % (len(duplicates), duplicates[0]))
+
+        expected = first.total_count - iterator.skip
+        if len(results) < expected:
+            problems.append('%d item(s) missing' % (expected - len(results)))
+
+        if problems:
+            message = 'Listing changed during parallel scan: %s' % '; '.join(problems)
+            if strict:
+                raise ConsistencyError(message)
+            log.warning(message)
+
+        return results
+
+
+class BaseIterator(object):
+
+    def __init__(self, method, args, kwargs):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.limit = 0
+
+    def __next__(self):
+        return self.next()
+
+    def next(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        return self
+
+
+class SkipIterator(BaseIterator):
+    """
+    Iterates over the pages of a 'limit'/'skip' listing. Iteration stops once
+    the total 'count' reported by the server has been reached. Without a count
+    it stops at the first short page, so a server that caps 'limit' below
+    `page_size` is only fully listed when it reports the count.
+    """
+
+    def __init__(self, method, args, kwargs):
+        BaseIterator.__init__(self, method, args, kwargs)
+        page_size = kwargs.pop('page_size', None)
+        limit = kwargs.pop('limit', None)
+        self.page_size = int(page_size or limit or DEFAULT_PAGE_SIZE)
+        if self.page_size < 1:
+            raise SenapsError('page_size must be a positive integer.')
+        self.skip = int(kwargs.pop('skip', None) or 0)
+        self.total_count = None
+        self.num_pages = 0
+        self.exhausted = False
+
+    def next(self):
+        if self.exhausted or (self.limit and self.num_pages == self.limit):
+            raise StopIteration
+        if self.total_count is not None and self.skip >= self.total_count:
+            raise StopIteration
+
+        page = self.fetch(self.skip)
+        if page.total_count is not None:
+            self.total_count = page.total_count
+        if self.total_count is None and len(page) < self.page_size:
+            self.exhausted = True
+        if len(page) == 0:
+            raise StopIteration
+
+        self.skip += len(page)
+        self.num_pages += 1
+        return page
+
+    def fetch(self, skip):
+        """Fetch the single page starting at `skip`."""
+        page = self.method(limit=self.page_size, skip=skip, *self.args, **self.kwargs)
+        if not hasattr(page, 'total_count'):
+            result_set = ResultSet()
+            result_set.extend(page)
+            page = result_set
+        return page
+
+
+class ItemIterator(BaseIterator):
+
+    def __init__(self, page_iterator):
+        self.page_iterator = page_iterator
+        self.limit = 0
+        self.current_page = None
+        self.page_index = -1
+        self.num_items = 0
+
+    def next(self):
+        if self.limit > 0 and self.num_items == self.limit:
+            self.close()
+            raise StopIteration
+        while self.current_page is None or self.page_index == len(self.current_page) - 1:
+            # Reached end of current page, get the next page...
+            self.current_page = next(self.page_iterator)
+            self.page_index = -1
+        self.page_index += 1
+        self.num_items += 1
+        return self.current_page[self.page_index]
+
+    def close(self):
+        close = getattr(self.page_iterator, 'close', None)
+        if close is not None:
+            close()
+
+
+class PrefetchIterator(BaseIterator):
+    """
+    Wraps a page iterator, fetching up to `depth` pages ahead of the consumer
+    on a background thread so that network time overlaps with the consumer's
+    processing. Errors raised while fetching are re-raised from next(), and
+    close() (or discarding the iterator) stops the background fetch.
+    """
+
+    def __init__(self, page_iterator, depth):
+        self.page_iterator = page_iterator
+        self.limit = 0
+        self.queue = queue.Queue(maxsize=depth)
+        self.stopped = threading.Event()
+        self.finished = False
+        self.thread = None
+
+    def next(self):
+        if self.finished:
+            raise StopIteration
+        if self.thread is None:
+            # NOTE: the worker must not reference self, so that an abandoned
+            # iterator can still be garbage collected (and so stop the worker).
+            self.thread = threading.Thread(target=_prefetch_pages,
+                                           args=(self.page_iterator, self.queue, self.stopped),
+                                           name='senaps-prefetch')
+            self.thread.daemon = True
+            self.thread.start()
+
+        page, error = self.queue.get()
+        if error is not None:
+            self.close()
+            raise error
+        if page is _exhausted:
+            self.finished = True
+            raise StopIteration
+        return page
+
+    def close(self):
+        self.finished = True
+        self.stopped.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.stopped.set()
+
+
+_exhausted = object()
+
+
+def _prefetch_pages(page_iterator, page_queue, stopped):
+    def put(item):
+        while not stopped.is_set():
+            try:
+                page_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for page in page_iterator:
+            if not put((page, None)):
+                return
+        put((_exhausted, None))
+    except Exception as e:
+        put((None, e))
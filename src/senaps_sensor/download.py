@@ -0,0 +1,269 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+import json
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from senaps_sensor.error import SenapsError, call_with_retries
+from senaps_sensor.parsers import AGGREGATION_FIELDS, NumpyObservationParser
+from senaps_sensor.timestamps import format_timestamp, parse_datetime64, parse_timestamp, to_utc
+
+log = logging.getLogger('senset.download')
+
+
+class ObservationDownloader(object):
+    """
+    Downloads the observations of a stream over a long time range by splitting
+    the range into time slices that are fetched concurrently and merged back
+    into time order.
+
+    Slices are sized from the stream's density: a single get_aggregation query
+    with `density_period` buckets reports how many results fall in each bucket,
+    and buckets are merged or split so that each slice holds roughly
+    `slice_results` results. If the aggregation query fails the range is cut
+    into fixed `slice_duration` slices instead. A slice that comes back holding
+    `request_limit` results is assumed to be truncated and is split in two.
+
+        downloader = ObservationDownloader(api, concurrency=8)
+        for result in downloader.iter_results('my.stream', start, end):
+            ...
+    """
+
+    def __init__(self, api, slice_results=20000, concurrency=4, retries=3, retry_delay=1.0,
+                 density_period=timedelta(hours=1), slice_duration=timedelta(days=1),
+                 request_limit=100000):
+        self.api = api
+        self.slice_results = slice_results
+        self.concurrency = concurrency
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.density_period = density_period
+        self.slice_duration = slice_duration
+        self.request_limit = request_limit
+
+    def plan(self, streamid, start, end):
+        """Return the list of contiguous (start, end) slices covering the range."""
+        start, end = to_utc(start), to_utc(end)
+        try:
+            buckets = self._density(streamid, start, end)
+        except SenapsError as e:
+            log.warning('Unable to query density of %s, using fixed slices: %s', streamid, e)
+            buckets = None
+
+        if buckets is None:
+            cuts = [start]
+            while cuts[-1] + self.slice_duration < end:
+                cuts.append(cuts[-1] + self.slice_duration)
+            cuts.append(end)
+            return list(zip(cuts[:-1], cuts[1:]))
+
+        cuts = [start]
+        pending = 0
+        for bucket_start, count in buckets:
+            bucket_end = min(bucket_start + self.density_period, end)
+            bucket_start = max(bucket_start, start)
+            if bucket_start >= bucket_end:
+                continue
+            if pending and pending + count > self.slice_results:
+                if bucket_start > cuts[-1]:
+                    cuts.append(bucket_start)
+                pending = 0
+            if count > self.slice_results:
+                # split a dense bucket evenly into several slices
+                parts = -(-count // self.slice_results)
+                step = (bucket_end - bucket_start) / parts
+                for i in range(1, parts):
+                    cuts.append(bucket_start + step * i)
+                cuts.append(bucket_end)
+                pending = 0
+            else:
+                pending += count
+        if cuts[-1] < end:
+            cuts.append(end)
+        cuts = sorted(set(cuts))
+        return list(zip(cuts[:-1], cuts[1:]))
+
+    def iter_results(self, streamid, start, end):
+        """
+        Yield the stream's results ({'t': ..., 'v': ...} dicts) between start and
+        end in time order, with duplicates at slice boundaries removed. Only a
+        bounded number of slices are held in memory at once.
+        """
+        slices = iter(self.plan(streamid, start, end))
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        pending = deque()
+        try:
+            for slice_start, slice_end in slices:
+                pending.append(executor.submit(self.fetch_slice, streamid, slice_start, slice_end))
+                if len(pending) >= self.concurrency * 2:
+                    break
+
+            last_t = None
+            while pending:
+                results = pending.popleft().result()
+                for slice_start, slice_end in slices:
+                    pending.append(executor.submit(self.fetch_slice, streamid, slice_start, slice_end))
+                    break
+                for result in results:
+                    if last_t is not None and result['t'] <= last_t:
+                        continue
+                    last_t = result['t']
+                    yield result
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def to_dataframe(self, streamid, start, end):
+        """Download the range into a pandas DataFrame indexed by timestamp, laid out like PandasObservationParser."""
+        import pandas  # NOTE: import here means we don't require pandas to be installed unless it is used.
+
+        timestamps = []
+        values = []
+        for result in self.iter_results(streamid, start, end):
+            timestamps.append(result['t'])
+            values.append(result['v'].get('v') if isinstance(result['v'], dict) else result['v'])
+
+        index = pandas.DatetimeIndex(parse_datetime64(timestamps), name='timestamp').tz_localize('UTC')
+        if values and isinstance(values[0], list):
+            columns = ['%s[%d]' % (streamid, i) for i in range(len(values[0]))]
+            return pandas.DataFrame(values, index=index, columns=columns)
+        return pandas.DataFrame({streamid: values}, index=index)
+
+    def to_file(self, streamid, start, end, fp):
+        """Write the range to a file object as JSON lines, one result per line. Returns the number written."""
+        written = 0
+        for result in self.iter_results(streamid, start, end):
+            fp.write(json.dumps(result))
+            fp.write('\n')
+            written += 1
+        return written
+
+    def fetch_slice(self, streamid, start, end):
+        """Fetch a single slice, retrying transient errors and splitting truncated responses."""
+        data = call_with_retries(
+            lambda: self.api.get_observations(streamid=streamid,
+                                              start=format_timestamp(start),
+                                              end=format_timestamp(end),
+                                              limit=self.request_limit,
+                                              sort='ascending'),
+            self.retries, self.retry_delay,
+            lambda e: log.debug('Retrying slice %s - %s of %s: %s', start, end, streamid, e))
+
+        results = data.get('results', []) if data else []
+        if len(results) >= self.request_limit and end - start > timedelta(milliseconds=1):
+            middle = start + (end - start) / 2
+            return self.fetch_slice(streamid, start, middle) + self.fetch_slice(streamid, middle, end)
+        return results
+
+    def _density(self, streamid, start, end):
+        period_ms = int(self.density_period.total_seconds() * 1000)
+        data = self.api.get_aggregation(streamid=streamid,
+                                        start=format_timestamp(start),
+                                        end=format_timestamp(end),
+                                        aggperiod=period_ms)
+        buckets = []
+        for result in data.get('results', []):
+            buckets.append((parse_timestamp(result['t']), int(result['v'].get('count', 0))))
+        return sorted(buckets)
+
+
+class AggregationDownloader(object):
+    """
+    Fetches the aggregations of many streams concurrently and outer-joins
+    them on timestamp, giving one row per aggregation period and
+    '<stream id>.avg', '.min', '.max' and '.count' columns per stream (in the
+    order the streams were given), like PandasObservationParser does for a
+    single stream.
+
+    Each response is parsed straight into arrays with NumpyObservationParser
+    and copied into a single preallocated float block, so no per-stream
+    DataFrames are built and the join costs one sort of the timestamps. A
+    stream without a result in a period has NaN in all four of its columns,
+    so counts are floats.
+
+        downloader = AggregationDownloader(api, concurrency=16)
+        df = downloader.to_dataframe(['stream.a', 'stream.b'], start, end, timedelta(hours=1))
+    """
+
+    def __init__(self, api, concurrency=8, retries=3, retry_delay=1.0):
+        self.api = api
+        self.concurrency = concurrency
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.parser = NumpyObservationParser()
+
+    def fetch(self, streamid, start, end, aggperiod):
+        """Fetch the aggregation of a single stream as ObservationArrays, retrying transient errors."""
+        if isinstance(aggperiod, timedelta):
+            aggperiod = int(aggperiod.total_seconds() * 1000)
+        return call_with_retries(
+            lambda: self.api.get_aggregation(streamid=streamid,
+                                             start=format_timestamp(to_utc(start)),
+                                             end=format_timestamp(to_utc(end)),
+                                             aggperiod=aggperiod,
+                                             parser=self.parser),
+            self.retries, self.retry_delay,
+            lambda e: log.debug('Retrying aggregation of %s: %s', streamid, e))
+
+    def join(self, streamids, start, end, aggperiod):
+        """
+        Return the joined aggregations as (timestamps, columns, block): sorted
+        datetime64[ns] timestamps, the column names and a Fortran-ordered
+        float array with one row per timestamp and one column per name.
+        """
+        import numpy  # NOTE: import here means we don't require numpy to be installed unless it is used.
+
+        if len(set(streamids)) != len(streamids):
+            raise SenapsError('Each stream can only be aggregated once.')
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            aggregations = list(executor.map(lambda sid: self.fetch(sid, start, end, aggperiod), streamids))
+
+        timestamps = numpy.unique(numpy.concatenate([a.timestamps for a in aggregations] or
+                                                    [numpy.empty(0, dtype='datetime64[ns]')]))
+        columns = ['%s.%s' % (sid, field) for sid in streamids for field in AGGREGATION_FIELDS]
+        # column-major, so that every column is contiguous and pandas can take the block without copying
+        block = numpy.full((len(timestamps), len(columns)), numpy.nan, order='F')
+        for i, (streamid, aggregation) in enumerate(zip(streamids, aggregations)):
+            rows = numpy.searchsorted(timestamps, aggregation.timestamps)
+            for j, field in enumerate(AGGREGATION_FIELDS):
+                block[rows, i * len(AGGREGATION_FIELDS) + j] = aggregation['%s.%s' % (streamid, field)]
+            aggregations[i] = None
+        return timestamps, columns, block
+
+    def to_dataframe(self, streamids, start, end, aggperiod):
+        """
+        Return the joined aggregations of the streams between start and end,
+        with `aggperiod` (milliseconds or a timedelta) periods, as a pandas
+        DataFrame indexed by timestamp.
+        """
+        import pandas  # NOTE: import here means we don't require pandas to be installed unless it is used.
+
+        timestamps, columns, block = self.join(streamids, start, end, aggperiod)
+        index = pandas.DatetimeIndex(timestamps, name='timestamp').tz_localize('UTC')
+        return pandas.DataFrame(block, index=index, columns=columns, copy=False)
@@ -0,0 +1,119 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+import io
+
+from senaps_sensor.error import SenapsError
+from senaps_sensor.timestamps import format_datetime64
+
+CHUNK_SIZE = 65536
+JSON_CONTENT_TYPE = {'Content-Type': 'application/json'}
+
+
+def _numpy():
+    import numpy  # NOTE: import here means we don't require numpy to be installed unless it is used.
+    return numpy
+
+
+def prepare_arrays(timestamps, values):
+    """
+    Validate and normalise a (timestamps, values) pair: returns the timestamps
+    as datetime64[us] and the values as a 1-D (scalar) or 2-D (vector) numeric
+    array, with NaT timestamps and all-missing rows removed. None values are
+    treated as NaN.
+    """
+    numpy = _numpy()
+
+    timestamps = numpy.asarray(timestamps)
+    if timestamps.dtype.kind != 'M':
+        raise SenapsError('timestamps must be a numpy datetime64 array.')
+    timestamps = timestamps.astype('datetime64[us]')
+
+    values = numpy.asarray(values)
+    if values.dtype == object:
+        values = numpy.array([numpy.nan if v is None else v for v in values.ravel()],
+                             dtype=float).reshape(values.shape)
+    elif values.dtype.kind == 'b':
+        values = values.astype(int)
+    if values.ndim not in (1, 2) or len(values) != len(timestamps):
+        raise SenapsError('values must be a 1-D or 2-D array with one row per timestamp.')
+
+    keep = ~numpy.isnat(timestamps)
+    if values.dtype.kind == 'f':
+        finite = numpy.isfinite(values)
+        keep &= finite if values.ndim == 1 else finite.any(axis=1)
+    if not keep.all():
+        timestamps, values = timestamps[keep], values[keep]
+    return timestamps, values
+
+
+def encode_results_chunk(timestamps, values):
+    """
+    Encode prepared arrays as the comma separated JSON result objects of a
+    results list, e.g. '{"t":"...","v":{"v":1.5}},...', returned as bytes.
+    Non-finite elements of vector values are written as null.
+    """
+    numpy = _numpy()
+    if not len(timestamps):
+        return b''
+
+    t = format_datetime64(timestamps)
+
+    if values.ndim == 1:
+        v = values.astype(str)
+    else:
+        columns = []
+        for j in range(values.shape[1]):
+            column = values[:, j].astype(str)
+            if values.dtype.kind == 'f':
+                column = numpy.where(numpy.isfinite(values[:, j]), column, 'null')
+            columns.append(column)
+        v = numpy.char.add('[', columns[0])
+        for column in columns[1:]:
+            v = numpy.char.add(numpy.char.add(v, ','), column)
+        v = numpy.char.add(v, ']')
+
+    items = numpy.char.add(numpy.char.add(numpy.char.add('{"t":"', t), '","v":{"v":'), v)
+    items = numpy.char.add(items, '}}')
+    return ','.join(items.tolist()).encode('utf-8')
+
+
+def encode_results(timestamps, values, chunk_size=CHUNK_SIZE):
+    """
+    Encode arrays of timestamps (datetime64) and values (1-D for scalar
+    streams, 2-D with one row per timestamp for vector streams) as a complete
+    '{"results":[...]}' create_observations request body, returned as bytes.
+    Rows whose timestamp is NaT or whose value is entirely NaN/None are skipped.
+    """
+    timestamps, values = prepare_arrays(timestamps, values)
+
+    buffer = io.BytesIO()
+    buffer.write(b'{"results":[')
+    for start in range(0, len(timestamps), chunk_size):
+        if start:
+            buffer.write(b',')
+        buffer.write(encode_results_chunk(timestamps[start:start + chunk_size], values[start:start + chunk_size]))
+    buffer.write(b']}')
+    return buffer.getvalue()
@@ -24,6 +24,8 @@ THE SOFTWARE.
 
 from __future__ import print_function
 
+import time
+
 import six
 
 
@@ -48,8 +50,46 @@ def is_rate_limit_error_message(message):
            and message[0]['code'] == 88
 
 
+def is_retryable(error):
+    """Check if a failed request is worth retrying (network errors, rate limits and server errors)."""
+    response = getattr(error, 'response', None)
+    if response is None or response.status_code is None:
+        return True
+    return response.status_code in (420, 429) or response.status_code >= 500
+
+
+def call_with_retries(function, retries, retry_delay, on_retry=None):
+    """
+    Return function(), calling it again when it raises a SenapsError that is
+    worth retrying (see is_retryable), up to `retries` more times. The n-th
+    retry waits retry_delay * 2 ** (n - 1) seconds and is preceded by a call
+    to on_retry(error), if given.
+    """
+    attempt = 0
+    while True:
+        try:
+            return function()
+        except SenapsError as e:
+            attempt += 1
+            if attempt > retries or not is_retryable(e):
+                raise
+            if on_retry is not None:
+                on_retry(e)
+            time.sleep(retry_delay * 2 ** (attempt - 1))
+
+
 class RateLimitError(SenapsError):
     """Exception for Senaps hitting the rate limit."""
     # RateLimitError has the exact same properties and inner workings
     # as SenseTError for backwards compatibility reasons.
     pass
+
+
+class ConsistencyError(SenapsError):
+    """Exception for a collection that changed while it was being listed."""
+    pass
+
+
+class SpoolFullError(SenapsError):
+    """Exception for an ingest spool that has reached its disk usage limit."""
+    pass
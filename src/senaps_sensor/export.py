@@ -0,0 +1,334 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+import csv
+import io
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from senaps_sensor.download import ObservationDownloader
+from senaps_sensor.error import SenapsError
+from senaps_sensor.timestamps import format_timestamp, parse_datetime64, to_utc
+
+log = logging.getLogger('senset.export')
+
+STATE_VERSION = 1
+
+JSONL = 'jsonl'
+CSV = 'csv'
+PARQUET = 'parquet'
+FORMATS = frozenset([JSONL, CSV, PARQUET])
+
+
+def result_value(result):
+    v = result.get('v')
+    return v.get('v') if isinstance(v, dict) and 'v' in v else v
+
+
+class JsonLinesFileWriter(object):
+    """Writes results to a file as JSON lines, one result per line."""
+
+    def __init__(self, path, streamid):
+        self.fp = io.open(path, 'w', encoding='utf-8')
+
+    def write(self, results):
+        for result in results:
+            self.fp.write(json.dumps(result))
+            self.fp.write('\n')
+
+    def close(self):
+        self.fp.close()
+
+
+class CsvFileWriter(object):
+    """
+    Writes results to a CSV file laid out like Senaps CSV responses: a
+    timestamp column and a column for a scalar stream, or <stream id>[0],
+    <stream id>[1], ... columns for a vector stream (sized by the first
+    batch written). Other values are written as JSON.
+    """
+
+    def __init__(self, path, streamid):
+        self.fp = io.open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.fp)
+        self.streamid = streamid
+        self.width = None
+
+    def write(self, results):
+        if not results:
+            return
+        values = [result_value(r) for r in results]
+        if self.width is None:
+            first = next((v for v in values if v is not None), None)
+            self.width = len(first) if isinstance(first, list) else 0
+            if self.width:
+                self.writer.writerow(['timestamp'] + ['%s[%d]' % (self.streamid, i) for i in range(self.width)])
+            else:
+                self.writer.writerow(['timestamp', self.streamid])
+        for result, v in zip(results, values):
+            if self.width:
+                v = list(v or [])[:self.width]
+                self.writer.writerow([result['t']] + ['' if x is None else x for x in v] + [''] * (self.width - len(v)))
+            else:
+                if isinstance(v, (dict, list)):
+                    v = json.dumps(v)
+                self.writer.writerow([result['t'], '' if v is None else v])
+
+    def close(self):
+        if self.width is None:
+            self.writer.writerow(['timestamp', self.streamid])
+        self.fp.close()
+
+
+class ParquetFileWriter(object):
+    """
+    Writes results to a Parquet file with a timestamp (timestamp[us, UTC])
+    column and a column named after the stream: float64 for scalar streams,
+    list<float64> for vector streams and JSON strings for any other values.
+    The column type is taken from the first batch written, and every batch
+    becomes one row group.
+    """
+
+    def __init__(self, path, streamid):
+        import pyarrow  # NOTE: import here means we don't require pyarrow to be installed unless it is used.
+        import pyarrow.parquet
+        self.pyarrow = pyarrow
+        self.path = path
+        self.streamid = streamid
+        self.writer = None
+        self.value_type = None
+
+    def write(self, results):
+        if not results:
+            return
+        pa = self.pyarrow
+        values = [result_value(r) for r in results]
+        if self.value_type is None:
+            first = next((v for v in values if v is not None), None)
+            if isinstance(first, list):
+                self.value_type = pa.list_(pa.float64())
+            elif first is None or isinstance(first, (int, float)):
+                self.value_type = pa.float64()
+            else:
+                self.value_type = pa.string()
+        if self.value_type == pa.string():
+            values = [None if v is None else json.dumps(v) for v in values]
+
+        timestamps = pa.array(parse_datetime64([r['t'] for r in results]), type=pa.timestamp('us', tz='UTC'))
+        table = pa.Table.from_arrays([timestamps, pa.array(values, type=self.value_type)],
+                                     names=['timestamp', self.streamid])
+        if self.writer is None:
+            self.writer = pa.parquet.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table, row_group_size=len(table))
+
+    def close(self):
+        if self.writer is None:
+            # no results, still leave a readable (empty) file
+            pa = self.pyarrow
+            schema = pa.schema([('timestamp', pa.timestamp('us', tz='UTC')), (self.streamid, pa.float64())])
+            self.writer = pa.parquet.ParquetWriter(self.path, schema)
+        self.writer.close()
+
+
+FILE_WRITERS = {JSONL: JsonLinesFileWriter, CSV: CsvFileWriter, PARQUET: ParquetFileWriter}
+
+
+class ExportState(object):
+    """
+    Progress of an ExportJob, kept in a small JSON file that is rewritten
+    atomically after every completed (stream, time slice) unit.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {'version': STATE_VERSION, 'units': {}}
+        if os.path.exists(path):
+            with io.open(path, 'r', encoding='utf-8') as fp:
+                self.data = json.load(fp)
+            if self.data.get('version') != STATE_VERSION:
+                raise SenapsError('Unsupported export state version in %s' % path)
+
+    def check_job(self, job):
+        """Record the job parameters, refusing to resume a state written by a different job."""
+        with self.lock:
+            existing = self.data.get('job')
+            if existing is not None and existing != job:
+                raise SenapsError('Export state %s belongs to a different export job: %s' % (self.path, existing))
+            self.data['job'] = job
+
+    def get(self, key):
+        return self.data['units'].get(key)
+
+    def complete(self, key, count, last):
+        with self.lock:
+            self.data['units'][key] = {'count': count, 'last': last}
+            self.save()
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with io.open(tmp_path, 'w', encoding='utf-8') as fp:
+            fp.write(json.dumps(self.data, sort_keys=True))
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class ExportJob(object):
+    """
+    Resumable bulk export of observations for many streams.
+
+    The requested range is cut into fixed `slice_duration` units per stream.
+    Each unit is downloaded with an ObservationDownloader and written to its own
+    file under `output_dir` (<stream id>/<slice start>.<format>) before being
+    marked complete in the state file. Re-running the job with the same state
+    file skips completed units; only the latest completed unit of each stream
+    (the boundary that may still have been filling up) is fetched again and
+    rewritten if its content changed.
+
+    Files are written as JSON lines, CSV or Parquet (`format` 'jsonl', 'csv'
+    or 'parquet'). Results are written as they are downloaded, `batch_size`
+    at a time, so memory use is set by the batch size and the downloader's
+    slice size rather than by the length of the export. Each batch becomes
+    one Parquet row group.
+
+        job = ExportJob(api, 'export.state.json', 'export/')
+        job.run(['stream.a', 'stream.b'], start, end)
+    """
+
+    def __init__(self, api, state_path, output_dir, slice_duration=timedelta(days=1),
+                 concurrency=4, downloader=None, format=JSONL, batch_size=100000):
+        if format not in FORMATS:
+            raise ValueError('"format" argument must be in %s' % (','.join(sorted(FORMATS))))
+        self.api = api
+        self.state = ExportState(state_path)
+        self.output_dir = output_dir
+        self.slice_duration = slice_duration
+        self.concurrency = concurrency
+        self.downloader = downloader or ObservationDownloader(api, concurrency=1)
+        self.format = format
+        self.batch_size = batch_size
+
+    def units(self, streamids, start, end):
+        """Return the (stream id, slice start, slice end) units covering the export."""
+        start, end = to_utc(start), to_utc(end)
+        units = []
+        for streamid in streamids:
+            slice_start = start
+            while slice_start < end:
+                slice_end = min(slice_start + self.slice_duration, end)
+                units.append((streamid, slice_start, slice_end))
+                slice_start = slice_end
+        return units
+
+    def run(self, streamids, start, end):
+        """Export the streams between start and end, resuming any earlier progress. Returns a summary dict."""
+        job = {'start': format_timestamp(to_utc(start)),
+               'end': format_timestamp(to_utc(end)),
+               'slice_seconds': self.slice_duration.total_seconds()}
+        if self.format != JSONL:
+            # only recorded when set, so that states written before formats existed still resume
+            job['format'] = self.format
+        self.state.check_job(job)
+
+        units = self.units(streamids, start, end)
+        boundaries = self._boundaries(units)
+        todo = []
+        skipped = 0
+        for unit in units:
+            key = self._key(unit)
+            if self.state.get(key) is None:
+                todo.append((unit, False))
+            elif key in boundaries:
+                todo.append((unit, True))
+            else:
+                skipped += 1
+
+        summary = {'units': len(units), 'skipped': skipped, 'exported': 0, 'verified': 0, 'rewritten': 0}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for outcome in executor.map(lambda item: self._export_unit(*item), todo):
+                summary[outcome] += 1
+        return summary
+
+    def path_for(self, unit):
+        streamid, slice_start, _ = unit
+        return os.path.join(self.output_dir, streamid, '%s.%s' % (slice_start.strftime('%Y%m%dT%H%M%S'), self.format))
+
+    def _export_unit(self, unit, verify):
+        streamid, slice_start, slice_end = unit
+        key = self._key(unit)
+        path = self.path_for(unit)
+        if not os.path.isdir(os.path.dirname(path)):
+            try:
+                os.makedirs(os.path.dirname(path))
+            except OSError:
+                # created concurrently by another unit of the same stream
+                pass
+
+        tmp_path = path + '.tmp'
+        count = 0
+        last = None
+        writer = FILE_WRITERS[self.format](tmp_path, streamid)
+        try:
+            batch = []
+            for result in self.downloader.iter_results(streamid, slice_start, slice_end):
+                batch.append(result)
+                if len(batch) >= self.batch_size:
+                    writer.write(batch)
+                    count, last = count + len(batch), batch[-1]['t']
+                    batch = []
+            writer.write(batch)
+            if batch:
+                count, last = count + len(batch), batch[-1]['t']
+        finally:
+            writer.close()
+
+        if verify:
+            previous = self.state.get(key)
+            if previous['count'] == count and previous['last'] == last:
+                os.remove(tmp_path)
+                return 'verified'
+            log.info('Boundary slice %s changed since the last run, rewriting', key)
+
+        os.replace(tmp_path, path)
+        self.state.complete(key, count, last)
+        return 'rewritten' if verify else 'exported'
+
+    def _boundaries(self, units):
+        """Keys of the latest completed unit of each stream."""
+        latest = {}
+        for unit in units:
+            if self.state.get(self._key(unit)) is not None:
+                latest[unit[0]] = self._key(unit)
+        return set(latest.values())
+
+    @staticmethod
+    def _key(unit):
+        streamid, slice_start, _ = unit
+        return '%s|%s' % (streamid, format_timestamp(slice_start))
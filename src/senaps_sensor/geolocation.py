@@ -0,0 +1,180 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+import io
+import json
+import re
+import warnings
+
+from senaps_sensor.encoding import prepare_arrays
+from senaps_sensor.error import SenapsError
+from senaps_sensor.timestamps import format_datetime64, parse_datetime64
+
+TIMESTAMP_FIELD = re.compile(br'"t"\s*:\s*"([^"]*)"')
+COORDINATES_FIELD = re.compile(br'"coordinates"\s*:\s*\[([^\]]*)\]')
+CHUNK_SIZE = 65536
+
+
+def _numpy():
+    import numpy  # NOTE: import here means we don't require numpy to be installed unless it is used.
+    return numpy
+
+
+class GeolocationArrays(object):
+    """
+    Geolocation observations of a single stream as columns: `timestamps`
+    (datetime64[us]) and float `lon`, `lat` and `alt` arrays, with NaN
+    altitudes for points that have none.
+    """
+
+    def __init__(self, timestamps, lon, lat, alt):
+        self.timestamps = timestamps
+        self.lon = lon
+        self.lat = lat
+        self.alt = alt
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __repr__(self):
+        return 'GeolocationArrays(%d points)' % len(self)
+
+
+def decode_geolocation(payload):
+    """
+    Decode a JSON geolocation observations response, whose results hold
+    {'p': {'type': 'Point', 'coordinates': [lon, lat(, alt)]}} values, into
+    GeolocationArrays. Timestamps and coordinates are scanned straight out of
+    the payload, so no dict is built per point; payloads that can't be
+    scanned (e.g. with results missing their point) are parsed as JSON.
+    """
+    numpy = _numpy()
+    if isinstance(payload, bytes):
+        data = payload
+    else:
+        data = payload.encode('utf-8')
+
+    timestamps = TIMESTAMP_FIELD.findall(data)
+    coordinates = COORDINATES_FIELD.findall(data)
+    if len(timestamps) != len(coordinates) or data.count(b'"coordinates"') != len(coordinates):
+        return _decode_geolocation_json(data)
+
+    # parse every coordinate in a single call, then put each back in its row
+    widths = numpy.fromiter((c.count(b',') + 1 for c in coordinates), dtype=numpy.int64, count=len(coordinates))
+    text = b','.join(coordinates).replace(b'null', b'nan')
+    try:
+        with warnings.catch_warnings():
+            # older numpy versions warn about anything that isn't a number and stop there
+            warnings.simplefilter('ignore', DeprecationWarning)
+            values = numpy.fromstring(text, sep=',') if text else numpy.empty(0)
+    except ValueError as e:
+        raise SenapsError('Failed to parse geolocation coordinates: %s' % e)
+    if len(values) != widths.sum():
+        raise SenapsError('Failed to parse geolocation coordinates.')
+
+    if len(widths) and (widths == 3).all():
+        columns = values.reshape(-1, 3)
+    else:
+        columns = numpy.full((len(widths), 3), numpy.nan)
+        rows = numpy.repeat(numpy.arange(len(widths)), widths)
+        positions = numpy.arange(len(values)) - numpy.repeat(numpy.cumsum(widths) - widths, widths)
+        keep = positions < 3
+        columns[rows[keep], positions[keep]] = values[keep]
+    return GeolocationArrays(parse_datetime64(numpy.array(timestamps, dtype=bytes)),
+                             columns[:, 0], columns[:, 1], columns[:, 2])
+
+
+def _decode_geolocation_json(data):
+    numpy = _numpy()
+    try:
+        results = json.loads(data.decode('utf-8')).get('results', [])
+    except ValueError as e:
+        raise SenapsError('Failed to parse JSON payload: %s' % e)
+
+    columns = numpy.full((len(results), 3), numpy.nan)
+    for i, result in enumerate(results):
+        point = (result.get('v') or {}).get('p') or {}
+        position = point.get('coordinates') or []
+        columns[i, :len(position)] = [numpy.nan if x is None else x for x in position[:3]]
+    return GeolocationArrays(parse_datetime64([r['t'] for r in results]),
+                             columns[:, 0], columns[:, 1], columns[:, 2])
+
+
+def prepare_geolocation(timestamps, lon, lat, alt=None):
+    """
+    Validate and normalise geolocation columns into the (timestamps, values)
+    pair used by the encoders, values being a 2-D [lon, lat(, alt)] array.
+    Rows with a NaT timestamp or a NaN longitude or latitude are removed.
+    """
+    numpy = _numpy()
+    columns = [lon, lat] if alt is None else [lon, lat, alt]
+    try:
+        values = numpy.column_stack([numpy.asarray(c, dtype=float) for c in columns])
+    except ValueError as e:
+        raise SenapsError('lon, lat and alt must be equally long numeric arrays: %s' % e)
+    timestamps, values = prepare_arrays(timestamps, values)
+    keep = numpy.isfinite(values[:, :2]).all(axis=1)
+    if not keep.all():
+        timestamps, values = timestamps[keep], values[keep]
+    return timestamps, values
+
+
+def encode_geolocation_chunk(timestamps, values):
+    """
+    Encode prepared geolocation arrays as the comma separated JSON result
+    objects of a results list, returned as bytes. Points with a NaN altitude
+    are written with only their longitude and latitude.
+    """
+    numpy = _numpy()
+    if not len(timestamps):
+        return b''
+
+    t = format_datetime64(timestamps)
+    coordinates = numpy.char.add(numpy.char.add(values[:, 0].astype(str), ','), values[:, 1].astype(str))
+    if values.shape[1] > 2:
+        with_alt = numpy.isfinite(values[:, 2])
+        coordinates = numpy.where(with_alt, numpy.char.add(numpy.char.add(coordinates, ','),
+                                                           values[:, 2].astype(str)), coordinates)
+
+    items = numpy.char.add(numpy.char.add('{"t":"', t), '","v":{"p":{"type":"Point","coordinates":[')
+    items = numpy.char.add(numpy.char.add(items, coordinates), ']}}}')
+    return ','.join(items.tolist()).encode('utf-8')
+
+
+def encode_geolocation(timestamps, lon, lat, alt=None, chunk_size=CHUNK_SIZE):
+    """
+    Encode geolocation columns as a complete '{"results":[...]}'
+    create_observations request body, returned as bytes.
+    """
+    timestamps, values = prepare_geolocation(timestamps, lon, lat, alt)
+
+    buffer = io.BytesIO()
+    buffer.write(b'{"results":[')
+    for start in range(0, len(timestamps), chunk_size):
+        if start:
+            buffer.write(b',')
+        buffer.write(encode_geolocation_chunk(timestamps[start:start + chunk_size], values[start:start + chunk_size]))
+    buffer.write(b']}')
+    return buffer.getvalue()
@@ -28,8 +28,14 @@ import json
 
 import datetime
 import enum
+import functools
+import threading
+
+import six
+from six.moves import collections_abc
 
 from senaps_sensor.error import SenapsError
+from senaps_sensor.timestamps import format_datetime_index, format_timestamp
 from senaps_sensor.utils import SenseTEncoder
 from senaps_sensor.vocabulary import find_unit_of_measurement, find_observed_property
 
@@ -71,10 +77,12 @@ class InterpolationType(enum.Enum):
 class ResultSet(list):
     """A list like object that holds results from a Twitter API query."""
 
-    def __init__(self, max_id=None, since_id=None):
+    def __init__(self, max_id=None, since_id=None, total_count=None):
         super(ResultSet, self).__init__()
         self._max_id = max_id
         self._since_id = since_id
+        # total number of matching items reported by the server, if any
+        self.total_count = total_count
 
     @property
     def max_id(self):
@@ -96,6 +104,123 @@ class ResultSet(list):
         return [item.id for item in self if hasattr(item, 'id')]
 
 
+def listing_count(json_list):
+    """Return the total item count reported by a listing response, if present."""
+    if isinstance(json_list, dict):
+        return json_list.get('count')
+    return None
+
+
+class IdentityMap(object):
+    """
+    Holds a single shared model instance per (model class, id) so that
+    entities embedded many times in a response (e.g. the organisation of
+    every stream in a listing) are only parsed and stored once.
+
+    A fragment that carries fields the mapped instance has not seen (e.g. a full
+    location after the sparse ``{"id": ...}`` embedded in a stream) is merged into
+    the mapped instance, so it is never stuck with the first, sparsest copy.
+    Instances are held until clear() is called; a map shared across responses
+    grows with the number of distinct entities parsed through it.
+    """
+
+    def __init__(self):
+        self._instances = dict()
+        self._lock = threading.Lock()
+
+    def get(self, cls, id):
+        return self._instances.get((cls, id))
+
+    def find(self, cls, json_frag):
+        """
+        Return the mapped instance for json_frag if it already holds every field
+        of the fragment with the same value, else None (the fragment must be parsed).
+        """
+        instance = self.get(cls, json_frag.get('id'))
+        if instance is None:
+            return None
+        known = getattr(instance, '_json', None) or {}
+        for k, v in json_frag.items():
+            if k not in known or known[k] != v:
+                return None
+        return instance
+
+    def add(self, instance):
+        id = getattr(instance, 'id', None)
+        if id is None:
+            return instance
+        with self._lock:
+            existing = self._instances.setdefault((type(instance), id), instance)
+            if existing is not instance:
+                self._merge(existing, instance)
+            return existing
+
+    @staticmethod
+    def _merge(existing, instance):
+        # copy every attribute the new fragment set, leaving constructor defaults
+        # (e.g. an empty organisations list on a sparse fragment) alone
+        defaults = vars(type(instance)(api=instance._api))
+        for k, v in vars(instance).items():
+            if k == '_json':
+                merged = dict(getattr(existing, '_json', None) or {})
+                merged.update(v)
+                existing._json = merged
+            elif k not in defaults or v != defaults[k]:
+                setattr(existing, k, v)
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
+
+    def __len__(self):
+        return len(self._instances)
+
+
+_identity_scope = threading.local()
+
+
+class identity_scope(object):
+    """
+    Context manager that makes the given IdentityMap current for models
+    parsed on this thread. Passing None disables deduplication within the scope.
+    """
+
+    def __init__(self, identity_map):
+        self.identity_map = identity_map
+
+    def __enter__(self):
+        stack = getattr(_identity_scope, 'stack', None)
+        if stack is None:
+            stack = _identity_scope.stack = list()
+        stack.append(self.identity_map)
+        return self.identity_map
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _identity_scope.stack.pop()
+
+
+def current_identity_map():
+    stack = getattr(_identity_scope, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def identity_mapped(parse):
+    """
+    Decorates a model's parse() so that, within an identity_scope, fragments
+    of an entity already parsed return (and refresh) the mapped instance.
+    """
+    @functools.wraps(parse)
+    def wrapper(cls, api, json_frag):
+        identity_map = current_identity_map()
+        if identity_map is None:
+            return parse(cls, api, json_frag)
+        instance = identity_map.find(cls, json_frag)
+        if instance is None:
+            instance = identity_map.add(parse(cls, api, json_frag))
+        return instance
+    return wrapper
+
+
 class Model(object):
     misspellings = {
         # key: wrong, value: correct
@@ -244,7 +369,7 @@ class Platform(Model):
         else:
             item_list = json_list['_embedded']['platforms']
 
-        results = ResultSet()
+        results = ResultSet(total_count=listing_count(json_list))
         for obj in item_list:
             results.append(cls.parse(api, obj))
         return results
@@ -284,6 +409,7 @@ class Platform(Model):
 
 class Organisation(Model):
     @classmethod
+    @identity_mapped
     def parse(cls, api, json_frag):
         organisation = super(Organisation, cls).parse(api, json_frag)
         setattr(organisation, '_json', json_frag)
@@ -628,7 +754,7 @@ class Stream(Model):
         else:
             raise SenapsError('Unable to parse list: [%s]' % ', '.join(map(str, json_list)))
 
-        results = ResultSet()
+        results = ResultSet(total_count=listing_count(json_list))
         for obj in item_list:
             results.append(cls.parse(api, obj))
         return results
@@ -676,6 +802,7 @@ class Stream(Model):
 
 class Group(Model):
     @classmethod
+    @identity_mapped
     def parse(cls, api, json_frag):
         group = super(Group, cls).parse(api, json_frag)
         setattr(group, '_json', json_frag)
@@ -690,7 +817,7 @@ class Group(Model):
         else:
             item_list = json_list.get('_embedded', {}).get('groups', [])
 
-        results = ResultSet()
+        results = ResultSet(total_count=listing_count(json_list))
         for obj in item_list:
             results.append(cls.parse(api, obj))
         return results
@@ -705,6 +832,7 @@ class Location(Model):
         self._groups = list()
 
     @classmethod
+    @identity_mapped
     def parse(cls, api, json_frag):
         location = super(Location, cls).parse(api, json_frag)
 
@@ -730,7 +858,7 @@ class Location(Model):
         else:
             item_list = json_list['_embedded']['locations']
 
-        results = ResultSet()
+        results = ResultSet(total_count=listing_count(json_list))
         for obj in item_list:
             results.append(cls.parse(api, obj))
         return results
@@ -772,7 +900,10 @@ class Observation(Model):
     def __getstate__(self, action=None):
         pickled = super(Observation, self).__getstate__(action)
 
-        pickled["results"] = [r.to_state(action) for r in self.results] if self.results else []
+        if isinstance(self.results, ColumnarResults):
+            pickled["results"] = self.results.to_state(action)
+        else:
+            pickled["results"] = [r.to_state(action) for r in self.results] if self.results else []
         if self.stream:
             pickled["streamid"] = self.stream.to_state(action).get("id")
         return pickled
@@ -804,15 +935,13 @@ class Observation(Model):
 
     @classmethod
     def from_dataframe(cls, dataframe):
-        result = {}
-
-        for timestamp, series in dataframe.iterrows():
-            timestamp = timestamp.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-
-            for series_id, value in series.iteritems():
-                observation = UnivariateResult(t=timestamp, v=value)
-                result.setdefault(series_id, Observation()).results.append(observation)
-        return result
+        """
+        Split a DataFrame indexed by timestamp into one Observation per column,
+        keyed by column name. NaN cells are left out. The results of each
+        Observation are ColumnarResults, a sequence that behaves like a list
+        but is not a list instance.
+        """
+        return results_from_dataframe(dataframe, Observation)
 
     @property
     def results(self):
@@ -872,15 +1001,12 @@ class Aggregation(Model):
 
     @classmethod
     def from_dataframe(cls, dataframe):
-        result = {}
-
-        for timestamp, series in dataframe.iterrows():
-            timestamp = timestamp.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-
-            for series_id, value in series.iteritems():
-                aggregation = UnivariateResult(t=timestamp, v=value)
-                result.setdefault(series_id, Observation()).results.append(aggregation)
-        return result
+        """
+        Split a DataFrame of aggregated values indexed by timestamp into one
+        Observation per column, keyed by column name, like
+        Observation.from_dataframe.
+        """
+        return results_from_dataframe(dataframe, Observation)
 
 class UnivariateResult(JSONModel):
     def __init__(self, api=None, t=None, v=None):
@@ -892,10 +1018,114 @@ class UnivariateResult(JSONModel):
         pickled = super(UnivariateResult, self).__getstate__(action)
 
         if isinstance(pickled.get('t', None), datetime.datetime):
-            pickled['t'] = pickled.get('t').strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+            pickled['t'] = format_timestamp(pickled.get('t'))
         return pickled
 
 
+class ColumnarResults(collections_abc.MutableSequence):
+    """
+    The results of a single stream held as an array of formatted timestamps
+    and an array of values, in place of a list of UnivariateResult instances.
+    It is a MutableSequence rather than a list subclass (a list subclass would
+    have to materialise every result for list's own C methods to see them), so
+    isinstance(results, list) is False.
+    Iterating or indexing still yields UnivariateResult instances and slicing
+    yields ColumnarResults. It behaves as a list otherwise: the first change
+    (append, insert, item assignment or deletion) converts it to a list of
+    UnivariateResult instances, and it compares equal to any sequence of
+    results with the same 't' and 'v' states.
+    """
+
+    def __init__(self, t, v):
+        self.t = t
+        self.v = v
+        self._items = None
+
+    def __len__(self):
+        if self._items is not None:
+            return len(self._items)
+        return len(self.t)
+
+    def __iter__(self):
+        if self._items is not None:
+            return iter(self._items)
+        return (UnivariateResult(t=t, v=v) for t, v in zip(self.t.tolist(), self.v.tolist()))
+
+    def __getitem__(self, index):
+        if self._items is not None:
+            return self._items[index]
+        if isinstance(index, slice):
+            return ColumnarResults(self.t[index], self.v[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('ColumnarResults index out of range')
+        return UnivariateResult(t=self.t[index:index + 1].tolist()[0], v=self.v[index:index + 1].tolist()[0])
+
+    def __setitem__(self, index, value):
+        self._as_list()[index] = value
+
+    def __delitem__(self, index):
+        del self._as_list()[index]
+
+    def insert(self, index, value):
+        self._as_list().insert(index, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, collections_abc.Sequence) or isinstance(other, six.string_types):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        return self.to_state() == [_result_state(r) for r in other]
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return 'ColumnarResults(%d results)' % len(self)
+
+    def to_state(self, action=None):
+        if self._items is not None:
+            return [_result_state(r, action) for r in self._items]
+        return [{'t': t, 'v': v} for t, v in zip(self.t.tolist(), self.v.tolist())]
+
+    def _as_list(self):
+        """Convert to a plain list of UnivariateResult instances, for changes the arrays can't hold."""
+        if self._items is None:
+            self._items = list(self)
+            self.t = self.v = None
+        return self._items
+
+
+def _result_state(result, action=None):
+    return result.to_state(action) if isinstance(result, Model) else result
+
+
+def results_from_dataframe(dataframe, model):
+    """Build one `model` instance per column of a timestamp indexed DataFrame, holding ColumnarResults."""
+    timestamps = format_datetime_index(dataframe.index)
+    result = {}
+    for series_id in dataframe.columns:
+        values = dataframe[series_id].to_numpy()
+        present = dataframe[series_id].notna().to_numpy()
+        instance = model()
+        if present.all():
+            instance.results = ColumnarResults(timestamps, values)
+        else:
+            instance.results = ColumnarResults(timestamps[present], values[present])
+        result[series_id] = instance
+    return result
+
+
 class Deployment(Model):
     @classmethod
     def parse(cls, api, json_frag):
@@ -974,7 +1204,7 @@ class Role(Model):
         else:
             item_list = json_list['_embedded']['roles']
 
-        results = ResultSet()
+        results = ResultSet(total_count=listing_count(json_list))
         for obj in item_list:
             results.append(cls.parse(api, obj))
         return results
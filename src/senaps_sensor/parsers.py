@@ -25,20 +25,93 @@ THE SOFTWARE.
 from __future__ import print_function, unicode_literals, absolute_import
 
 import six
-import re
 
-from senaps_sensor.models import ModelFactory
+from senaps_sensor.arrays import ObservationArrays, bin_coordinates, group_columns, is_regularly_binned, values_array
+from senaps_sensor.geolocation import decode_geolocation
+from senaps_sensor.models import ModelFactory, IdentityMap, identity_scope
+from senaps_sensor.timestamps import parse_datetime64, parse_timestamp
 from senaps_sensor.utils import import_simplejson
 from senaps_sensor.error import SenapsError
 
+import io
+from collections import OrderedDict
+
+
+def find_csv_header(payload, column='timestamp'):
+    """
+    Return the offset of the CSV header line starting with `column` in a
+    bytes payload, skipping any preamble lines, or -1 if there is none.
+    """
+    column = column.encode('ascii')
+    line = b'\n' + column
+    offset = 0 if payload.startswith(column) else payload.find(line)
+    while offset >= 0:
+        if offset or not payload.startswith(column):
+            offset += 1  # skip the newline
+        end = offset + len(column)
+        if payload[end:end + 1] in (b',', b'\r', b'\n', b''):
+            return offset
+        offset = payload.find(line, end)
+    return -1
+
+
+def fill_empty_csv_fields(data, fill=b'nan'):
+    """Write `fill` into the empty (non-leading) fields of CSV bytes, for parsers that can't read empty fields."""
+    if b',,' in data:
+        # twice, as the first pass can't fill neighbouring empty fields
+        data = data.replace(b',,', b',' + fill + b',').replace(b',,', b',' + fill + b',')
+    data = data.replace(b',\r\n', b',' + fill + b'\r\n').replace(b',\n', b',' + fill + b'\n')
+    if data.endswith(b','):
+        data += fill
+    return data
+
+
+def read_csv_table(payload, offset):
+    """
+    Read the CSV observations in a bytes payload, from the header line at
+    `offset`, into a pyarrow Table without copying the payload. The timestamp
+    column is typed timestamp[us, UTC]; columns with no values are float64.
+    """
+    import pyarrow  # NOTE: import here means we don't require pyarrow to be installed unless it is used.
+    import pyarrow.csv
+
+    data = pyarrow.py_buffer(payload).slice(offset)
+    convert_options = pyarrow.csv.ConvertOptions(column_types={'timestamp': pyarrow.timestamp('us', tz='UTC')})
+    try:
+        # streaming keeps only the converted columns in memory, not every parsed block
+        table = pyarrow.csv.open_csv(pyarrow.BufferReader(data), convert_options=convert_options).read_all()
+    except pyarrow.ArrowInvalid:
+        # column types are inferred from the first block only; read it all at once when a later block
+        # doesn't fit them (e.g. a stream with no values near the start)
+        table = pyarrow.csv.read_csv(pyarrow.BufferReader(data), convert_options=convert_options)
+    # columns with no values at all are read as null, make them numeric like the pandas C engine does
+    for i, field in enumerate(table.schema):
+        if pyarrow.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pyarrow.float64()))
+    return table
+
+
+def json_stream_values(results, stream_ids):
+    """
+    Return (stream id, values) pairs, in the requested order, from the
+    results of a JSON observations response. Results hold {'v': value} for a
+    single stream, or {stream id: {'v': value}} when several are requested.
+    Missing values are None.
+    """
+    if len(stream_ids) == 1:
+        columns = [(stream_ids[0], [r.get('v') for r in results])]
+    else:
+        columns = [(sid, [(r.get('v') or {}).get(sid) for r in results]) for sid in stream_ids]
+    return [(sid, [v.get('v') if isinstance(v, dict) else v for v in values]) for sid, values in columns]
 
-if six.PY2:
-    from cStringIO import StringIO
-else:
-    from io import StringIO as StringIO
 
 class Parser(object):
 
+    # parsers that work on the raw response bytes rather than decoded text set this to True
+    binary_payload = False
+    # parsers that read the response body as it arrives set this to True, and are given a file-like object
+    stream_payload = False
+
     def parse(self, method, payload):
         """
         Parse the response payload and return the result.
@@ -68,7 +141,25 @@ class RawParser(Parser):
         return payload
 
 
-class JSONParser(Parser):
+class JSONErrorMixin(object):
+    """
+    Parses the JSON error responses of the Senaps API, for parsers that have a
+    `json_lib` (see senaps_sensor.utils.import_simplejson).
+    """
+
+    def parse_error(self, payload):
+        error_object = self.json_lib.loads(payload)
+        reason = "An unknown error occurred"
+        api_code = None
+
+        if 'status' in error_object or 'message' in error_object:
+            reason = error_object.get('message', reason)
+            api_code = error_object.get('status', None)
+
+        return reason, api_code
+
+
+class JSONParser(JSONErrorMixin, Parser):
 
     payload_format = 'json'
 
@@ -90,17 +181,6 @@ class JSONParser(Parser):
         else:
             return json
 
-    def parse_error(self, payload):
-        error_object = self.json_lib.loads(payload)
-        reason = "An unknown error occurred"
-        api_code = None
-
-        if 'status' in error_object or 'message' in error_object:
-            reason = error_object.get('message', reason)
-            api_code = error_object.get('status', None)
-
-        return reason, api_code
-
 
 class ModelParser(JSONParser):
 
@@ -123,20 +203,42 @@ class ModelParser(JSONParser):
         else:
             cursors = None
 
-        if method.payload_list:
-            result = model.parse_list(method.api, json)
-        else:
-            result = model.parse(method.api, json)
+        # A shared identity map may be configured on the api, otherwise
+        # identity_map=True deduplicates entities within this response only.
+        identity_map = getattr(method.api, 'identity_map', None)
+        if identity_map is True:
+            identity_map = IdentityMap()
+        elif not isinstance(identity_map, IdentityMap):
+            identity_map = None
+
+        with identity_scope(identity_map):
+            if method.payload_list:
+                result = model.parse_list(method.api, json)
+            else:
+                result = model.parse(method.api, json)
 
         if cursors:
             return result, cursors
         else:
             return result
 
-class PandasObservationParser(Parser):
-    def __init__(self):
+class PandasObservationParser(JSONErrorMixin, Parser):
+
+    binary_payload = True
+
+    def __init__(self, engine=None):
+        """
+        :param engine: CSV engine, 'pyarrow' or 'c'. Defaults to 'pyarrow' when it is installed.
+        """
         import pandas # NOTE: import here means we don't require pandas to be installed unless we actually instantiate this class.
         self.pandas = pandas
+        if engine is None:
+            try:
+                import pyarrow.csv  # NOTE: optional, only used when installed.
+                engine = 'pyarrow'
+            except ImportError:
+                engine = 'c'
+        self.engine = engine
         
         self.json_lib = import_simplejson()
     
@@ -149,14 +251,7 @@ class PandasObservationParser(Parser):
             if media_type != 'csv':
                 raise SenapsError('Observation query with PandasObservationParser requires CSV media type (media type "{}" is not supported).'.format(media_type))
             else:
-                # Skip header information.
-                lines = payload.splitlines()
-                for i, row in enumerate(lines):
-                    if 'timestamp' == row.split(',')[0]:
-                        break
-
-                # Parse CSV payload.
-                df = self.pandas.read_csv(StringIO('\n'.join(lines[i:])), parse_dates=True, index_col='timestamp')
+                df = self._parse_csv(payload)
 
         else:
             # Parse json payload from Aggregation query.
@@ -170,8 +265,8 @@ class PandasObservationParser(Parser):
             sid = method.query_params['streamid']
             # rename to make it look like an Observation query
             df = df.rename(columns={'t': 'timestamp', 'v.avg': sid+'.avg', 'v.min': sid+'.min', 'v.max': sid+'.max', 'v.count': sid+'.count'})
-            df['timestamp'] = self.pandas.to_datetime(df['timestamp'])
-            df.set_index('timestamp')
+            df['timestamp'] = self._datetime_index(df['timestamp'])
+            df = df.set_index('timestamp')
 
         # Senaps returns columns in random (alphabetic?) order - reorder to
         # match the order the stream IDs were originally given in.
@@ -179,19 +274,421 @@ class PandasObservationParser(Parser):
             # cater for vectors which have multiple headers streamid[0], streamid[1]...
             df_headers = list(df)
             full_id_list = []
-            for id in stream_ids:
-                full_id_list.extend([col for col in df_headers if id == re.sub("[\[].*?[\]]", "", col)])
+            for positions in group_columns(df_headers, stream_ids).values():
+                full_id_list.extend(df_headers[p] for p in (positions if isinstance(positions, list) else [positions]))
             df = df[full_id_list]
 
         return df
-    
-    def parse_error(self, payload):
-        error_object = self.json_lib.loads(payload)
-        reason = "An unknown error occurred"
-        api_code = None
-        
-        if 'status' in error_object or 'message' in error_object:
-            reason = error_object.get('message', reason)
-            api_code = error_object.get('status', None)
-        
-        return reason, api_code
+
+    def _parse_csv(self, payload):
+        """Parse a CSV observations payload, reading it in place from after its preamble."""
+        if isinstance(payload, six.text_type):
+            payload = payload.encode('utf-8')
+        offset = find_csv_header(payload)
+        if offset < 0:
+            raise SenapsError('CSV observation payload has no timestamp header.')
+
+        if self.engine == 'pyarrow':
+            table = read_csv_table(payload, offset)
+            # release each Arrow column as soon as it has been converted
+            df = table.to_pandas(split_blocks=True, self_destruct=True)
+            del table
+            return df.set_index('timestamp')
+
+        # BytesIO shares the payload's buffer rather than copying it
+        data = io.BytesIO(payload)
+        data.seek(offset)
+        df = self.pandas.read_csv(data, index_col='timestamp', dtype={'timestamp': str})
+        df.index = self._datetime_index(df.index)
+        return df
+
+    def _datetime_index(self, timestamps):
+        """Parse a column of Senaps timestamps into a UTC DatetimeIndex named 'timestamp'."""
+        return self.pandas.DatetimeIndex(parse_datetime64(timestamps.values), name='timestamp').tz_localize('UTC')
+
+
+AGGREGATION_FIELDS = ('avg', 'min', 'max', 'count')
+
+
+class NumpyObservationParser(JSONErrorMixin, Parser):
+    """
+    Parses observation (CSV or JSON) and aggregation responses into an
+    ObservationArrays instance, without requiring pandas. Streams keep the
+    order in which they were requested. Aggregation values are returned as
+    '<stream id>.avg', '.min', '.max' and '.count' arrays, like the columns of
+    PandasObservationParser.
+
+    Vector streams are returned as dense (timestamps x bins) arrays. Given
+    the `streams` that are queried (Stream instances, or a dict of stream id
+    to Stream or StreamMetaData), the bin axis of each regularly binned vector
+    stream is computed from its metadata and returned in the `coordinates` of
+    the result.
+    """
+
+    binary_payload = True
+
+    def __init__(self, streams=None):
+        import numpy  # NOTE: import here means we don't require numpy to be installed unless we actually instantiate this class.
+        self.numpy = numpy
+        if streams is not None and not isinstance(streams, dict):
+            streams = dict((stream.id, stream) for stream in streams)
+        self.streams = streams or {}
+
+        self.json_lib = import_simplejson()
+
+    def parse(self, method, payload):
+        stream_ids = method.query_params['streamid'].split(',')  # NOTE: same limitation as PandasObservationParser.
+        if method.query_params.get('aggperiod', None) is not None:
+            return self._parse_aggregation(payload, stream_ids[0])
+        if method.query_params.get('media', None) == 'csv':
+            arrays = self._parse_csv(payload, stream_ids)
+        else:
+            arrays = self._parse_json(payload, stream_ids)
+        self._add_coordinates(arrays)
+        return arrays
+
+    def _add_coordinates(self, arrays):
+        for streamid, values in arrays.items():
+            metadata = self.streams.get(streamid)
+            if not is_regularly_binned(metadata):
+                continue
+            if values.ndim == 2:
+                arrays.coordinates[streamid] = bin_coordinates(metadata, values.shape[1])
+            else:
+                # no observations to take the number of bins from
+                coordinates = bin_coordinates(metadata)
+                arrays.values[streamid] = values.reshape(len(values), len(coordinates))
+                arrays.coordinates[streamid] = coordinates
+
+    def _parse_csv(self, payload, stream_ids):
+        if isinstance(payload, six.text_type):
+            payload = payload.encode('utf-8')
+        offset = find_csv_header(payload)
+        if offset < 0:
+            raise SenapsError('CSV observation payload has no timestamp header.')
+        end = payload.find(b'\n', offset)
+        if end < 0:
+            end = len(payload)
+        columns = payload[offset:end].decode('utf-8').strip().split(',')
+        body = fill_empty_csv_fields(payload[end + 1:])
+
+        if body.strip():
+            strings = self.numpy.loadtxt(io.BytesIO(body), delimiter=',', usecols=0, dtype='U64', ndmin=1)
+            values = self.numpy.loadtxt(io.BytesIO(body), delimiter=',', usecols=range(1, len(columns)),
+                                        dtype=float, ndmin=2)
+        else:
+            strings = []
+            values = self.numpy.empty((0, len(columns) - 1))
+
+        arrays = OrderedDict()
+        for streamid, positions in group_columns(columns[1:], stream_ids).items():
+            arrays[streamid] = self.numpy.ascontiguousarray(values[:, positions])
+        return ObservationArrays(self._timestamps(strings), arrays)
+
+    def _parse_json(self, payload, stream_ids):
+        results = self.json_lib.loads(payload).get('results', [])
+        arrays = OrderedDict()
+        for streamid, values in json_stream_values(results, stream_ids):
+            arrays[streamid] = values_array(values)
+        return ObservationArrays(self._timestamps([r['t'] for r in results]), arrays)
+
+    def _parse_aggregation(self, payload, streamid):
+        results = self.json_lib.loads(payload).get('results', [])
+        arrays = OrderedDict()
+        for field in AGGREGATION_FIELDS:
+            arrays['%s.%s' % (streamid, field)] = values_array([r['v'].get(field) for r in results])
+        return ObservationArrays(self._timestamps([r['t'] for r in results]), arrays)
+
+    def _timestamps(self, strings):
+        return parse_datetime64(strings).astype('datetime64[ns]')
+
+
+class ArrowObservationParser(JSONErrorMixin, Parser):
+    """
+    Parses observation (CSV or JSON) and aggregation responses straight into
+    a pyarrow Table: a 'timestamp' column (timestamp[us, UTC]) followed by a
+    column per stream in the order requested. Scalar streams are typed value
+    columns with nulls for missing values; vector streams are float64
+    fixed-size list columns (missing elements, missing rows and the tail of
+    vectors shorter than the widest are NaN). Aggregation responses
+    have '<stream id>.avg', '.min', '.max' and '.count' columns. The Table
+    can be written as is with pyarrow.parquet or Arrow IPC.
+    """
+
+    binary_payload = True
+
+    def __init__(self):
+        import pyarrow  # NOTE: import here means we don't require pyarrow to be installed unless we actually instantiate this class.
+        self.pyarrow = pyarrow
+
+        self.json_lib = import_simplejson()
+
+    def parse(self, method, payload):
+        stream_ids = method.query_params['streamid'].split(',')  # NOTE: same limitation as PandasObservationParser.
+        if method.query_params.get('aggperiod', None) is not None:
+            return self._parse_aggregation(payload, stream_ids[0])
+        if method.query_params.get('media', None) == 'csv':
+            return self._parse_csv(payload, stream_ids)
+        return self._parse_json(payload, stream_ids)
+
+    def _parse_csv(self, payload, stream_ids):
+        if isinstance(payload, six.text_type):
+            payload = payload.encode('utf-8')
+        offset = find_csv_header(payload)
+        if offset < 0:
+            raise SenapsError('CSV observation payload has no timestamp header.')
+        table = read_csv_table(payload, offset)
+
+        names = ['timestamp']
+        columns = [table.column('timestamp')]
+        value_names = [name for name in table.column_names if name != 'timestamp']
+        for streamid, positions in group_columns(value_names, stream_ids).items():
+            names.append(streamid)
+            if isinstance(positions, list):
+                columns.append(self._fixed_size_list([table.column(value_names[p]) for p in positions]))
+            else:
+                columns.append(table.column(value_names[positions]))
+        return self.pyarrow.Table.from_arrays(columns, names=names)
+
+    def _parse_json(self, payload, stream_ids):
+        results = self.json_lib.loads(payload).get('results', [])
+        names = ['timestamp']
+        columns = [self._timestamps(results)]
+        for streamid, values in json_stream_values(results, stream_ids):
+            names.append(streamid)
+            if any(isinstance(v, list) for v in values):
+                # padded to NaN like the CSV columns, see values_array
+                array = values_array(values)
+                columns.append(self.pyarrow.FixedSizeListArray.from_arrays(self.pyarrow.array(array.ravel()),
+                                                                           array.shape[1]))
+            else:
+                columns.append(self.pyarrow.array(values))
+        return self.pyarrow.Table.from_arrays(columns, names=names)
+
+    def _parse_aggregation(self, payload, streamid):
+        results = self.json_lib.loads(payload).get('results', [])
+        names = ['timestamp']
+        columns = [self._timestamps(results)]
+        for field in AGGREGATION_FIELDS:
+            names.append('%s.%s' % (streamid, field))
+            field_type = self.pyarrow.int64() if field == 'count' else self.pyarrow.float64()
+            columns.append(self.pyarrow.array([r['v'].get(field) for r in results], type=field_type))
+        return self.pyarrow.Table.from_arrays(columns, names=names)
+
+    def _timestamps(self, results):
+        timestamps = parse_datetime64([r['t'] for r in results])
+        return self.pyarrow.array(timestamps, type=self.pyarrow.timestamp('us', tz='UTC'))
+
+    def _fixed_size_list(self, columns):
+        """Interleave the id[0], id[1], ... columns of a vector stream into one fixed-size list column."""
+        import numpy  # NOTE: pyarrow's numpy conversions need numpy anyway.
+
+        values = numpy.column_stack([c.cast(self.pyarrow.float64()).to_numpy() for c in columns])
+        return self.pyarrow.FixedSizeListArray.from_arrays(self.pyarrow.array(values.ravel()), len(columns))
+
+
+class PolarsObservationParser(JSONErrorMixin, Parser):
+    """
+    Parses observation (CSV or JSON) and aggregation responses into a
+    polars DataFrame (or a LazyFrame with lazy=True) laid out like the
+    DataFrames of PandasObservationParser: a 'timestamp' column (Datetime[us,
+    UTC]) followed by the stream columns in the order requested, with vector
+    streams expanded into '<stream id>[0]', '<stream id>[1]', ... columns.
+    CSV responses are read by polars' multithreaded reader from the raw
+    response bytes.
+    """
+
+    binary_payload = True
+
+    def __init__(self, lazy=False):
+        import polars  # NOTE: import here means we don't require polars to be installed unless we actually instantiate this class.
+        self.polars = polars
+        self.lazy = lazy
+
+        self.json_lib = import_simplejson()
+
+    def parse(self, method, payload):
+        stream_ids = method.query_params['streamid'].split(',')  # NOTE: same limitation as PandasObservationParser.
+        if method.query_params.get('aggperiod', None) is not None:
+            df = self._parse_aggregation(payload, stream_ids[0])
+        elif method.query_params.get('media', None) == 'csv':
+            df = self._parse_csv(payload, stream_ids)
+        else:
+            df = self._parse_json(payload, stream_ids)
+        return df.lazy() if self.lazy else df
+
+    def _parse_csv(self, payload, stream_ids):
+        if isinstance(payload, six.text_type):
+            payload = payload.encode('utf-8')
+        offset = find_csv_header(payload)
+        if offset < 0:
+            raise SenapsError('CSV observation payload has no timestamp header.')
+
+        df = self.polars.read_csv(payload, skip_rows=payload.count(b'\n', 0, offset),
+                                  schema_overrides={'timestamp': self.polars.String})
+        # an explicit format is much faster than letting the reader infer one
+        df = df.with_columns(self.polars.col('timestamp').str.to_datetime('%Y-%m-%dT%H:%M:%S%.fZ', time_unit='us',
+                                                                          time_zone='UTC'))
+        # columns with no values at all are read as strings
+        df = df.with_columns([self.polars.col(name).cast(self.polars.Float64, strict=False)
+                              for name, dtype in zip(df.columns, df.dtypes)
+                              if name != 'timestamp' and dtype == self.polars.String])
+
+        value_names = [name for name in df.columns if name != 'timestamp']
+        ordered = ['timestamp']
+        for positions in group_columns(value_names, stream_ids).values():
+            if isinstance(positions, list):
+                ordered.extend(value_names[p] for p in positions)
+            else:
+                ordered.append(value_names[positions])
+        return df.select(ordered)
+
+    def _parse_json(self, payload, stream_ids):
+        results = self.json_lib.loads(payload).get('results', [])
+        columns = [self._timestamps(results)]
+        for streamid, values in json_stream_values(results, stream_ids):
+            width = next((len(v) for v in values if isinstance(v, list)), None)
+            if width is None:
+                columns.append(self.polars.Series(streamid, values, dtype=self.polars.Float64, strict=False))
+                continue
+            for i in range(width):
+                element = [v[i] if v is not None else None for v in values]
+                columns.append(self.polars.Series('%s[%d]' % (streamid, i), element, dtype=self.polars.Float64,
+                                                  strict=False))
+        return self.polars.DataFrame(columns)
+
+    def _parse_aggregation(self, payload, streamid):
+        results = self.json_lib.loads(payload).get('results', [])
+        columns = [self._timestamps(results)]
+        for field in AGGREGATION_FIELDS:
+            dtype = self.polars.Int64 if field == 'count' else self.polars.Float64
+            columns.append(self.polars.Series('%s.%s' % (streamid, field), [r['v'].get(field) for r in results],
+                                              dtype=dtype, strict=False))
+        return self.polars.DataFrame(columns)
+
+    def _timestamps(self, results):
+        timestamps = parse_datetime64([r['t'] for r in results])
+        return self.polars.Series('timestamp', timestamps).dt.replace_time_zone('UTC')
+
+
+class StreamingObservationParser(JSONErrorMixin, Parser):
+    """
+    Parses a JSON observations or aggregation response lazily: parse()
+    returns an iterator of (timestamp, value) tuples that are read one at a
+    time from the response body with ijson while it is still being received,
+    so arbitrarily long responses are processed in constant memory.
+
+    Timestamps are naive UTC datetimes (or the raw strings with
+    parse_timestamps=False). Values are a number, or a list for vector
+    streams; a dict of {stream id: value} when several streams are requested;
+    and a dict of avg, min, max and count for aggregations. The response is
+    closed once the iterator is exhausted, closed (also as a context manager)
+    or garbage collected, even if iteration never started, and results of
+    this parser are never cached.
+    """
+
+    binary_payload = True
+    stream_payload = True
+
+    def __init__(self, parse_timestamps=True):
+        import ijson  # NOTE: import here means we don't require ijson to be installed unless we actually instantiate this class.
+        self.ijson = ijson
+        self.parse_timestamps = parse_timestamps
+
+        self.json_lib = import_simplejson()
+
+    def parse(self, method, payload):
+        if method.query_params.get('media', None) == 'csv':
+            raise SenapsError('StreamingObservationParser only supports JSON responses.')
+        stream_ids = method.query_params['streamid'].split(',')  # NOTE: same limitation as PandasObservationParser.
+        if method.query_params.get('aggperiod', None) is not None:
+            value = self._aggregation_value
+        elif len(stream_ids) > 1:
+            value = self._multi_stream_value
+        else:
+            value = self._stream_value
+
+        if isinstance(payload, six.text_type):
+            payload = payload.encode('utf-8')
+        if isinstance(payload, bytes):
+            payload = io.BytesIO(payload)
+        return StreamedResults(self._iter_results(payload, value), payload)
+
+    def _iter_results(self, payload, value):
+        try:
+            for result in self.ijson.items(payload, 'results.item', use_float=True):
+                t = parse_timestamp(result['t']) if self.parse_timestamps else result['t']
+                yield t, value(result.get('v'))
+        except self.ijson.JSONError as e:
+            raise SenapsError('Failed to parse JSON payload: %s' % e)
+        finally:
+            payload.close()
+
+    @staticmethod
+    def _stream_value(v):
+        return v.get('v') if isinstance(v, dict) else v
+
+    @staticmethod
+    def _multi_stream_value(v):
+        return dict((sid, sv.get('v') if isinstance(sv, dict) else sv) for sid, sv in (v or {}).items())
+
+    @staticmethod
+    def _aggregation_value(v):
+        return v
+
+
+class StreamedResults(object):
+    """
+    The iterator of (timestamp, value) tuples returned by
+    StreamingObservationParser. close() releases the response body, also
+    when iteration has not started (a generator only runs its cleanup once
+    started).
+    """
+
+    def __init__(self, results, payload):
+        self._results = results
+        self._payload = payload
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._results)
+
+    next = __next__
+
+    def close(self):
+        self._results.close()
+        self._payload.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+class GeolocationObservationParser(JSONErrorMixin, Parser):
+    """
+    Parses the JSON observations response of a single geolocation stream
+    into GeolocationArrays: timestamps and lon, lat and alt columns, decoded
+    in one pass without building a dict per point (see
+    senaps_sensor.geolocation.decode_geolocation).
+    """
+
+    binary_payload = True
+
+    def __init__(self):
+        import numpy  # NOTE: import here means we don't require numpy to be installed unless we actually instantiate this class.
+        self.numpy = numpy
+        self.json_lib = import_simplejson()
+
+    def parse(self, method, payload):
+        if method.query_params.get('media', None) == 'csv':
+            raise SenapsError('GeolocationObservationParser only supports JSON responses.')
+        if ',' in method.query_params['streamid']:
+            raise SenapsError('GeolocationObservationParser only supports a single stream per query.')
+        return decode_geolocation(payload)
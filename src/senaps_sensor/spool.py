@@ -0,0 +1,228 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+
+from senaps_sensor.error import SenapsError, SpoolFullError
+
+log = logging.getLogger('senset.spool')
+
+SEGMENT_PATTERN = re.compile(r'^(\d{12})\.seg$')
+
+
+class Spool(object):
+    """
+    Append-only, on-disk log of observations that are waiting to be uploaded,
+    so that they survive a crash of the collecting process or a network outage.
+
+    Records are written to numbered segment files in `directory`. A new
+    segment is started once the active one reaches `segment_size` bytes, and
+    append() raises SpoolFullError rather than let the spool grow beyond
+    `max_size` bytes. Every record is flushed to the operating system as it is
+    appended (surviving a process crash); it is only fsynced to disk (surviving
+    a power loss) every `fsync_interval` seconds. Use fsync_interval=0 to
+    fsync every append, or None to leave it to the operating system. append()
+    only fsyncs while records keep arriving, so call sync_due() periodically
+    to fsync the last records once appends stop; ObservationWriter does so
+    from its background thread.
+
+    Each appended record is counted against its segment, and ack() is called
+    once those results have been accepted by the server. A segment file is
+    deleted when it is no longer active and all of its results have been
+    acknowledged. Segments left behind by an earlier process are listed by
+    recovered() and replayed with load(); replay is at-least-once, so results
+    from a partially acknowledged segment may be uploaded again.
+
+        spool = Spool('/var/spool/senaps')
+        segment = spool.append('my.stream', results)
+        ...  # upload
+        spool.ack(segment, len(results))
+    """
+
+    def __init__(self, directory, segment_size=16 * 1024 * 1024, max_size=1024 * 1024 * 1024, fsync_interval=1.0):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_size = max_size
+        self.fsync_interval = fsync_interval
+        self.lock = threading.Lock()
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._sizes = {}
+        self._pending = {}
+        for name in os.listdir(directory):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                self._sizes[int(match.group(1))] = os.path.getsize(os.path.join(directory, name))
+        self._recovered = sorted(self._sizes)
+
+        self._active = None
+        self._file = None
+        self._last_sync = time.time()
+        self._unsynced = False
+        self._open_segment(max(self._sizes) + 1 if self._sizes else 1)
+
+    @property
+    def size(self):
+        """Total size in bytes of all segment files."""
+        return sum(self._sizes.values())
+
+    def recovered(self):
+        """Sequence numbers of the segments left unacknowledged by an earlier process, oldest first."""
+        return list(self._recovered)
+
+    def load(self, segment):
+        """
+        Read a recovered segment, returning its (stream id, results) records.
+        All of its results become pending until they are acknowledged. A
+        record torn by a crash ends the segment.
+        """
+        records = []
+        with io.open(self._path(segment), 'rb') as fp:
+            for number, line in enumerate(fp):
+                record = self._decode(line)
+                if record is None:
+                    log.warning('Ignoring corrupt record %d (and the rest) of spool segment %s', number,
+                                self._path(segment))
+                    break
+                records.append(record)
+
+        with self.lock:
+            self._recovered.remove(segment)
+            self._pending[segment] = sum(len(results) for _, results in records)
+            self._release(segment)
+        return records
+
+    def append(self, stream_id, results):
+        """Record a list of result states for the stream. Returns the segment the record was written to."""
+        line = self._encode(stream_id, results)
+        with self.lock:
+            if self._file is None:
+                raise SenapsError('Spool is closed.')
+            if self._sizes[self._active] and self._sizes[self._active] + len(line) > self.segment_size:
+                self._rotate()
+            if self.size + len(line) > self.max_size:
+                raise SpoolFullError('Spool %s is full (%d bytes).' % (self.directory, self.size))
+
+            self._file.write(line)
+            self._file.flush()
+            self._sizes[self._active] += len(line)
+            self._pending[self._active] += len(results)
+            self._unsynced = True
+            if self.fsync_interval is not None and time.time() - self._last_sync >= self.fsync_interval:
+                self._sync()
+            return self._active
+
+    def ack(self, segment, count):
+        """Acknowledge that `count` results recorded in the segment have been uploaded."""
+        with self.lock:
+            self._pending[segment] -= count
+            self._release(segment)
+
+    def sync(self):
+        """fsync the active segment to disk."""
+        with self.lock:
+            if self._file is not None:
+                self._sync()
+
+    def sync_due(self):
+        """fsync the active segment if it holds records and the last fsync was `fsync_interval` seconds ago."""
+        with self.lock:
+            if (self._file is not None and self._unsynced and self.fsync_interval is not None
+                    and time.time() - self._last_sync >= self.fsync_interval):
+                self._sync()
+
+    def close(self):
+        """fsync and close the active segment, removing it if everything in it was acknowledged."""
+        with self.lock:
+            if self._file is None:
+                return
+            self._sync()
+            self._file.close()
+            self._file = None
+            active, self._active = self._active, None
+            self._release(active)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _path(self, segment):
+        return os.path.join(self.directory, '%012d.seg' % segment)
+
+    def _open_segment(self, segment):
+        self._active = segment
+        self._file = io.open(self._path(segment), 'ab')
+        self._sizes[segment] = 0
+        self._pending[segment] = 0
+
+    def _rotate(self):
+        self._sync()
+        self._file.close()
+        previous = self._active
+        self._open_segment(previous + 1)
+        self._release(previous)
+
+    def _release(self, segment):
+        """Delete the segment once it is inactive and fully acknowledged."""
+        if segment == self._active or segment in self._recovered or self._pending.get(segment):
+            return
+        os.remove(self._path(segment))
+        del self._sizes[segment]
+        del self._pending[segment]
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.time()
+        self._unsynced = False
+
+    @staticmethod
+    def _encode(stream_id, results):
+        payload = json.dumps([stream_id, results], separators=(',', ':')).encode('utf-8')
+        return ('%08x ' % (zlib.crc32(payload) & 0xffffffff)).encode('ascii') + payload + b'\n'
+
+    @staticmethod
+    def _decode(line):
+        if not line.endswith(b'\n') or len(line) < 10:
+            return None
+        checksum, payload = line[:8], line[9:-1]
+        try:
+            if int(checksum, 16) != zlib.crc32(payload) & 0xffffffff:
+                return None
+            stream_id, results = json.loads(payload.decode('utf-8'))
+        except ValueError:
+            return None
+        return stream_id, results
@@ -0,0 +1,132 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from senaps_sensor.models import Observation
+from senaps_sensor.upload import BulkUploader, result_state
+from senaps_sensor.timestamps import parse_timestamp
+
+log = logging.getLogger('senset.sync')
+
+
+class StreamDelta(object):
+    """
+    The part of the local data for one stream that is newer than the latest
+    observation stored in Senaps (`latest`, None for an empty stream).
+    `summary` is the UploadSummary of uploading it (None for a dry run).
+    """
+
+    def __init__(self, streamid, latest, total, new, summary=None):
+        self.streamid = streamid
+        self.latest = latest
+        self.total = total
+        self.new = new
+        self.summary = summary
+
+    def __repr__(self):
+        return 'StreamDelta(streamid=%r, latest=%r, total=%d, new=%d)' % (self.streamid, self.latest,
+                                                                             self.total, self.new)
+
+
+class StreamSync(object):
+    """
+    Uploads only the local observations that are newer than what a stream
+    already holds in Senaps.
+
+    For every stream, the latest stored timestamp is fetched once (a
+    get_observations query with limit=1, sort='descending'), the local data is
+    filtered to results strictly after it, and only those are uploaded with
+    the BulkUploader. Up to `concurrency` streams are synced at once. With
+    `dry_run=True` nothing is uploaded and the returned deltas only report how
+    much would be.
+
+    The data is either a dict mapping stream ids to results (UnivariateResult
+    instances, result dicts or an Observation) or a pandas DataFrame with one
+    column per stream id, indexed by timestamp, as accepted by
+    Observation.from_dataframe.
+
+        deltas = StreamSync(api).sync(Observation.from_dataframe(df))
+    """
+
+    def __init__(self, api, uploader=None, concurrency=4, dry_run=False):
+        self.api = api
+        self.uploader = uploader or BulkUploader(api)
+        self.concurrency = concurrency
+        self.dry_run = dry_run
+
+    def latest_timestamp(self, streamid):
+        """The timestamp (a naive UTC datetime) of the stream's latest observation, or None if it has none."""
+        data = self.api.get_observations(streamid=streamid, limit=1, sort='descending')
+        results = data.get('results', []) if data else []
+        if not results:
+            return None
+        return parse_timestamp(results[0]['t'])
+
+    def sync(self, data):
+        """Sync every stream in the data, returning a dict of stream id to StreamDelta."""
+        if hasattr(data, 'columns'):
+            work = [(streamid, self._sync_column, data[streamid]) for streamid in data.columns]
+        else:
+            work = [(streamid, self._sync_results, results) for streamid, results in data.items()]
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            deltas = executor.map(lambda item: item[1](item[0], item[2]), work)
+            return dict((delta.streamid, delta) for delta in deltas)
+
+    def _sync_results(self, streamid, results):
+        if isinstance(results, Observation):
+            results = results.results
+        latest = self.latest_timestamp(streamid)
+
+        states = [result_state(result) for result in results]
+        total = len(states)
+        if latest is not None:
+            states = [state for state in states if parse_timestamp(state['t']) > latest]
+
+        delta = StreamDelta(streamid, latest, total, len(states))
+        log.info('%s: %d of %d results are newer than %s', streamid, delta.new, delta.total, latest)
+        if states and not self.dry_run:
+            delta.summary = self.uploader.upload(streamid, states)
+        return delta
+
+    def _sync_column(self, streamid, series):
+        import pandas  # NOTE: import here means we don't require pandas to be installed unless it is used.
+
+        latest = self.latest_timestamp(streamid)
+
+        series = series.dropna()
+        index = series.index
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        keep = index > pandas.Timestamp(latest) if latest is not None else slice(None)
+
+        timestamps = index[keep].values
+        delta = StreamDelta(streamid, latest, len(series), len(timestamps))
+        log.info('%s: %d of %d results are newer than %s', streamid, delta.new, delta.total, latest)
+        if len(timestamps) and not self.dry_run:
+            delta.summary = self.uploader.upload_arrays(streamid, timestamps, series.values[keep])
+        return delta
@@ -0,0 +1,142 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+from datetime import datetime
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+# number of distinct seconds remembered by the strptime/strftime fallbacks
+CACHE_SIZE = 4096
+
+_format_cache = {}
+_parse_cache = {}
+
+
+def _numpy():
+    import numpy  # NOTE: import here means we don't require numpy to be installed unless it is used.
+    return numpy
+
+
+def to_utc(dt):
+    """Return a naive UTC datetime for a naive (assumed UTC) or timezone aware datetime."""
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None) - dt.utcoffset()
+    return dt
+
+
+def format_timestamp(dt):
+    """Format a datetime as a Senaps timestamp. Naive datetimes are assumed to be UTC."""
+    if dt.tzinfo is not None:
+        dt = to_utc(dt)
+    try:
+        return dt.isoformat(timespec='microseconds') + 'Z'
+    except TypeError:
+        # no timespec before python 3.6, format the whole seconds once and add the microseconds
+        key = dt.replace(microsecond=0)
+        prefix = _format_cache.get(key)
+        if prefix is None:
+            if len(_format_cache) >= CACHE_SIZE:
+                _format_cache.clear()
+            prefix = _format_cache[key] = key.strftime('%Y-%m-%dT%H:%M:%S')
+        return '%s.%06dZ' % (prefix, dt.microsecond)
+
+
+def parse_timestamp(string):
+    """Parse a Senaps timestamp (e.g. '2016-02-15T00:00:00.000Z') into a naive UTC datetime."""
+    try:
+        dt = datetime.fromisoformat(string[:-1] if string.endswith('Z') else string)
+    except (AttributeError, ValueError):
+        # no fromisoformat before python 3.7, and it only accepts 3 or 6 fractional digits before 3.11
+        return _parse_timestamp(string)
+    return to_utc(dt)
+
+
+def _parse_timestamp(string):
+    """Parse a timestamp with strptime, parsing each distinct second only once."""
+    if string.endswith('Z'):
+        string = string[:-1]
+    elif string.endswith('+00:00'):
+        string = string[:-6]
+    seconds, _, fraction = string.partition('.')
+
+    dt = _parse_cache.get(seconds)
+    if dt is None:
+        if len(_parse_cache) >= CACHE_SIZE:
+            _parse_cache.clear()
+        dt = _parse_cache[seconds] = datetime.strptime(seconds, '%Y-%m-%dT%H:%M:%S')
+    if fraction:
+        if not fraction.isdigit():
+            raise ValueError('Invalid timestamp: %s' % string)
+        dt = dt.replace(microsecond=int(fraction[:6].ljust(6, '0')))
+    return dt
+
+
+def format_datetime64(values):
+    """
+    Format a numpy datetime64 array as Senaps timestamps in one vectorised
+    step, returning a numpy array of strings.
+    """
+    numpy = _numpy()
+    values = numpy.asarray(values).astype('datetime64[us]')
+    return numpy.char.add(numpy.datetime_as_string(values, unit='us'), 'Z')
+
+
+def format_datetime_index(index):
+    """
+    Format every entry of a pandas DatetimeIndex as a Senaps timestamp,
+    returning a numpy array of strings. Naive indexes are assumed to be UTC.
+    """
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return format_datetime64(index.values)
+
+
+def parse_datetime64(strings):
+    """
+    Parse a sequence of Senaps timestamps (strings, or a numpy str or bytes
+    array) into a numpy datetime64[us] array of UTC times. Empty strings
+    become NaT.
+    """
+    numpy = _numpy()
+    if getattr(strings, 'dtype', None) is not None and strings.dtype.kind in 'SU':
+        # numpy string (or bytes) arrays are stripped and parsed without going through Python strings
+        zone = b'Z' if strings.dtype.kind == 'S' else 'Z'
+        if len(strings) and numpy.char.endswith(strings, zone).all():
+            try:
+                return numpy.char.rstrip(strings, zone).astype('datetime64[us]')
+            except ValueError:
+                pass
+        if strings.dtype.kind == 'S':
+            strings = numpy.char.decode(strings, 'ascii')
+    if hasattr(strings, 'tolist'):
+        strings = strings.tolist()
+    # numpy parses ISO 8601 itself, but only without the zone designator
+    stripped = [s[:-1] for s in strings if s.endswith('Z')]
+    if len(stripped) == len(strings):
+        try:
+            return numpy.array(stripped, dtype='datetime64[us]')
+        except ValueError:
+            pass
+    return numpy.array([parse_timestamp(s) if s else None for s in strings], dtype='datetime64[us]')
@@ -0,0 +1,262 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+import datetime
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from senaps_sensor.encoding import JSON_CONTENT_TYPE, encode_results_chunk, prepare_arrays
+from senaps_sensor.error import SenapsError, call_with_retries
+from senaps_sensor.geolocation import encode_geolocation_chunk, prepare_geolocation
+from senaps_sensor.models import Model, Observation
+from senaps_sensor.timestamps import format_timestamp
+from senaps_sensor.utils import SenseTEncoder
+
+log = logging.getLogger('senset.upload')
+
+
+def result_state(result):
+    """Return the JSON state of a UnivariateResult or result dict, with datetimes formatted."""
+    if isinstance(result, Model):
+        state = result.to_state('create')
+    else:
+        state = dict(result)
+    if isinstance(state.get('t'), datetime.datetime):
+        state['t'] = format_timestamp(state['t'])
+    return state
+
+
+class FailedBatch(object):
+    """A batch of results that could not be uploaded."""
+
+    def __init__(self, index, results, error):
+        self.index = index
+        self.results = results
+        self.error = error
+
+    def __repr__(self):
+        return 'FailedBatch(index=%d, results=%d, error=%r)' % (self.index, len(self.results), self.error)
+
+
+class ArrayBatch(object):
+    """The rows [start, stop) of a pair of timestamp and value arrays."""
+
+    def __init__(self, timestamps, values, start, stop):
+        self.timestamps = timestamps[start:stop]
+        self.values = values[start:stop]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+
+class UploadSummary(object):
+    """Outcome of a BulkUploader.upload() call."""
+
+    def __init__(self):
+        self.accepted = 0
+        self.batches = 0
+        self.failed_batches = []
+
+    @property
+    def failed(self):
+        return sum(len(b.results) for b in self.failed_batches)
+
+    @property
+    def ok(self):
+        return not self.failed_batches
+
+    def __repr__(self):
+        return 'UploadSummary(accepted=%d, batches=%d, failed=%d)' % (self.accepted, self.batches, self.failed)
+
+
+class BulkUploader(object):
+    """
+    Uploads an arbitrarily long iterable of results to a stream in batches
+    capped by result count and encoded JSON size, with several batches in
+    flight at once. Each batch is retried on transient errors; batches that
+    still fail are reported in the returned UploadSummary rather than raised.
+
+    With a `controller` (see senaps_sensor.adaptive.AdaptiveController), the
+    batch size and the number of batches in flight follow the controller's
+    current settings instead of `max_results` and `concurrency`, and every
+    upload attempt is reported to it.
+
+        summary = BulkUploader(api).upload('my.stream', results)
+        if not summary.ok:
+            ...
+    """
+
+    def __init__(self, api, max_results=5000, max_bytes=4 * 1024 * 1024, concurrency=4,
+                 retries=3, retry_delay=1.0, controller=None):
+        self.api = api
+        self.max_results = max_results
+        self.max_bytes = max_bytes
+        self.concurrency = concurrency
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.controller = controller
+
+    def batches(self, results):
+        """Yield lists of result states that respect max_results and max_bytes."""
+        if isinstance(results, Observation):
+            results = results.results
+
+        batch = []
+        size = 0
+        for result in results:
+            state = result_state(result)
+            # +2 for the ', ' list separator requests uses when encoding the body
+            encoded = len(json.dumps(state, cls=SenseTEncoder).encode('utf-8')) + 2
+            if batch and (len(batch) >= self._batch_size() or size + encoded > self.max_bytes):
+                yield batch
+                batch = []
+                size = 0
+            batch.append(state)
+            size += encoded
+        if batch:
+            yield batch
+
+    def upload(self, streamid, results):
+        """Upload the results (UnivariateResult instances, dicts or an Observation) to the stream."""
+        summary = UploadSummary()
+        executor = self._executor()
+        pending = deque()
+
+        def collect(future, index, batch):
+            try:
+                future.result()
+                summary.accepted += len(batch)
+            except SenapsError as e:
+                log.warning('Failed to upload batch %d of %d results to %s: %s', index, len(batch), streamid, e)
+                summary.failed_batches.append(FailedBatch(index, batch, e))
+
+        try:
+            for index, batch in enumerate(self.batches(results)):
+                summary.batches += 1
+                pending.append((executor.submit(self.upload_batch, streamid, batch), index, batch))
+                # bound the number of encoded batches held in memory
+                while len(pending) >= self._in_flight():
+                    collect(*pending.popleft())
+            while pending:
+                collect(*pending.popleft())
+        finally:
+            executor.shutdown(wait=True)
+
+        return summary
+
+    def upload_arrays(self, streamid, timestamps, values):
+        """
+        Upload results held in numpy arrays: datetime64 timestamps and values
+        (1-D for scalar streams, 2-D with one row per timestamp for vector
+        streams). Each batch of max_results rows is encoded straight into the
+        request body, so no per-result dicts are built. Rows with a NaT
+        timestamp or an entirely NaN/None value are skipped.
+        """
+        timestamps, values = prepare_arrays(timestamps, values)
+        return self._upload_encoded(streamid, timestamps, values, encode_results_chunk)
+
+    def upload_geolocation(self, streamid, timestamps, lon, lat, alt=None):
+        """
+        Upload geolocation results held in columns: datetime64 timestamps and
+        longitude, latitude and (optionally) altitude arrays. Each batch is
+        encoded straight into the request body, like upload_arrays(). Rows with
+        a NaT timestamp or a NaN longitude or latitude are skipped, and points
+        with a NaN altitude are sent without one.
+        """
+        timestamps, values = prepare_geolocation(timestamps, lon, lat, alt)
+        return self._upload_encoded(streamid, timestamps, values, encode_geolocation_chunk)
+
+    def _upload_encoded(self, streamid, timestamps, values, encode_chunk):
+        summary = UploadSummary()
+        executor = self._executor()
+        pending = deque()
+
+        def collect(future, index, start, stop):
+            try:
+                future.result()
+                summary.accepted += stop - start
+            except SenapsError as e:
+                log.warning('Failed to upload batch %d of %d results to %s: %s', index, stop - start, streamid, e)
+                summary.failed_batches.append(FailedBatch(index, ArrayBatch(timestamps, values, start, stop), e))
+
+        try:
+            index = start = 0
+            while start < len(timestamps):
+                stop = min(start + self._batch_size(), len(timestamps))
+                body = b'{"results":[' + encode_chunk(timestamps[start:stop], values[start:stop]) + b']}'
+                summary.batches += 1
+                pending.append((executor.submit(self.upload_batch, streamid, body, stop - start), index, start, stop))
+                index, start = index + 1, stop
+                while len(pending) >= self._in_flight():
+                    collect(*pending.popleft())
+            while pending:
+                collect(*pending.popleft())
+        finally:
+            executor.shutdown(wait=True)
+
+        return summary
+
+    def _batch_size(self):
+        return self.controller.batch_size if self.controller is not None else self.max_results
+
+    def _in_flight(self):
+        """The number of batches to keep submitted at once."""
+        if self.controller is not None:
+            return self.controller.concurrency
+        return self.concurrency * 2
+
+    def _executor(self):
+        if self.controller is not None:
+            return ThreadPoolExecutor(max_workers=self.controller.max_concurrency)
+        return ThreadPoolExecutor(max_workers=self.concurrency)
+
+    def upload_batch(self, streamid, batch, count=None):
+        """
+        Upload a single batch, either a list of result states or an already
+        encoded JSON body (bytes) of `count` results, retrying transient errors.
+        """
+        if not isinstance(batch, bytes):
+            count = len(batch)
+
+        def send():
+            started = time.time()
+            try:
+                if isinstance(batch, bytes):
+                    response = self.api.create_observations(streamid=streamid, post_data=batch, use_json=False,
+                                                            headers=dict(JSON_CONTENT_TYPE))
+                else:
+                    response = self.api.create_observations(streamid=streamid, results=batch)
+            except SenapsError as e:
+                if self.controller is not None:
+                    self.controller.record_failure(e)
+                raise
+            if self.controller is not None:
+                self.controller.record_success(count, time.time() - started)
+            return response
+
+        return call_with_retries(send, self.retries, self.retry_delay)
@@ -0,0 +1,368 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from __future__ import print_function, unicode_literals, absolute_import
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from senaps_sensor.error import SenapsError, is_retryable
+from senaps_sensor.upload import BulkUploader, FailedBatch, result_state
+
+log = logging.getLogger('senset.writer')
+
+BLOCK = 'block'
+DROP_OLDEST = 'drop_oldest'
+SPILL = 'spill'
+BACKPRESSURE_POLICIES = frozenset([BLOCK, DROP_OLDEST, SPILL])
+
+
+class ObservationWriter(object):
+    """
+    Buffers observations for many streams and uploads them from a background
+    thread, so that append() never waits on the network.
+
+    Results are grouped per stream and flushed when a stream has `batch_size`
+    results buffered, when its oldest buffered result is `max_age` seconds old,
+    or when flush() is called. At most `max_buffered` results are held in
+    memory; once full, append() applies the `backpressure` policy:
+
+    - 'block': wait (up to `block_timeout` seconds) for the writer to drain.
+    - 'drop_oldest': discard the oldest buffered result of the stream.
+    - 'spill': write the result to a spill file in `spill_dir`. While the
+      spill file holds results every new result is appended to it too, so
+      results are uploaded in order; spilled results are reloaded whenever
+      the in-memory buffer drains below half of `max_buffered`.
+
+    Every result is numbered as it is appended, so flush() waits only for the
+    results appended before it was called, however fast more arrive.
+
+    Due batches are uploaded on up to `concurrency` threads. close() flushes
+    everything that is buffered (including spilled results) and stops the
+    background thread. Batches that fail to upload are counted in `failed`;
+    only the last `max_failed_batches` of them are kept in `failed_batches`.
+
+    With a `spool` (see senaps_sensor.spool.Spool), every appended result is
+    first recorded on disk and acknowledged once its batch has been uploaded,
+    so buffered results survive a crash: results left in the spool by an
+    earlier process are replayed when the writer starts. A spooled batch that
+    fails with a transient error (see senaps_sensor.error.is_retryable) is put
+    back at the head of its stream's buffer and uploads pause for `retry_delay`
+    seconds, doubling with each consecutive failure up to `max_retry_delay`,
+    so a long outage is ridden out instead of filling the spool. Batches that
+    fail permanently, or while the writer is closing, stay in the spool until
+    the next replay. The spool is closed with the writer.
+
+        with ObservationWriter(api) as writer:
+            writer.append('my.stream', datetime.utcnow(), {'v': 21.5})
+    """
+
+    def __init__(self, api, batch_size=1000, max_age=5.0, max_buffered=100000,
+                 backpressure=BLOCK, block_timeout=None, spill_dir=None, concurrency=4, uploader=None,
+                 spool=None, max_failed_batches=100, retry_delay=1.0, max_retry_delay=60.0):
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError('"backpressure" argument must be in %s' % (','.join(sorted(BACKPRESSURE_POLICIES))))
+        self.api = api
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.max_buffered = max_buffered
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+        self.spill_dir = spill_dir
+        self.uploader = uploader or BulkUploader(api, max_results=batch_size)
+        self.spool = spool
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        self.dropped = 0
+        self.uploaded = 0
+        self.failed = 0
+        self.failed_batches = deque(maxlen=max_failed_batches)
+        self.low_water = max_buffered // 2
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+        self._buffers = OrderedDict()
+        self._oldest = {}
+        self._buffered = 0
+        self._in_flight = 0
+        # the lowest sequence number of each batch being uploaded
+        self._in_flight_first = Counter()
+        self._sequence = 0
+        self._flush_mark = None
+        self._spill = None
+        self._spill_position = 0
+        self._spilled = 0
+        self._failed_batch_count = 0
+        self._consecutive_failures = 0
+        self._backoff_until = 0
+        self._replay = deque(spool.recovered() if spool is not None else [])
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='senaps-writer')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def append(self, stream_id, t, v):
+        """Queue a single result for upload to the stream."""
+        state = result_state({'t': t, 'v': v})
+        with self._condition:
+            if self._closed:
+                raise SenapsError('ObservationWriter is closed.')
+
+            if self._buffered >= self.max_buffered:
+                if self.backpressure == BLOCK:
+                    deadline = None if self.block_timeout is None else time.time() + self.block_timeout
+                    while self._buffered >= self.max_buffered and not self._closed:
+                        remaining = None if deadline is None else deadline - time.time()
+                        if remaining is not None and remaining <= 0:
+                            raise SenapsError('Timed out waiting for ObservationWriter to drain.')
+                        self._condition.wait(remaining)
+                    if self._closed:
+                        raise SenapsError('ObservationWriter is closed.')
+                elif self.backpressure == DROP_OLDEST:
+                    self._drop_oldest(stream_id)
+
+            segment = self.spool.append(stream_id, [state]) if self.spool is not None else None
+            self._sequence += 1
+            # once spilling, keep spilling until the spill file is drained to preserve order
+            if self.backpressure == SPILL and (self._spilled or self._buffered >= self.max_buffered):
+                self._spill_result(stream_id, segment, state, self._sequence)
+                return
+
+            self._buffer_entry(stream_id, segment, state, self._sequence)
+            self._buffered += 1
+            if len(self._buffers[stream_id]) >= self.batch_size or self._buffered >= self.max_buffered:
+                self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Upload everything appended so far, waiting until it has been sent (or
+        has failed). Results appended while waiting are not waited for.
+        """
+        with self._condition:
+            mark = self._sequence
+            self._flush_mark = mark if self._flush_mark is None else max(self._flush_mark, mark)
+            self._condition.notify_all()
+            deadline = None if timeout is None else time.time() + timeout
+            while not self._settled_through(mark):
+                if not self._thread.is_alive():
+                    break
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        """Drain all buffered results and stop the background thread."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        if self.spool is not None and not self._thread.is_alive():
+            self.spool.close()
+
+    @property
+    def buffered(self):
+        return self._buffered + self._spilled
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _settled_through(self, mark):
+        """Whether every result numbered up to `mark` has been uploaded, has failed or was dropped."""
+        if self._replay:
+            return False
+        # spilled results are numbered consecutively up to the latest one, see append()
+        if self._spilled and self._sequence - self._spilled < mark:
+            return False
+        for buffer in self._buffers.values():
+            if buffer and buffer[0][2] <= mark:
+                return False
+        return not any(first <= mark for first in self._in_flight_first)
+
+    def _drop_oldest(self, stream_id):
+        buffer = self._buffers.get(stream_id)
+        if not buffer:
+            # nothing buffered for this stream yet, drop from the largest buffer instead
+            buffer = max(self._buffers.values(), key=len)
+        segment, _, _ = buffer.popleft()
+        self._buffered -= 1
+        self.dropped += 1
+        if segment is not None:
+            self.spool.ack(segment, 1)
+
+    def _spill_result(self, stream_id, segment, state, sequence):
+        if self._spill is None:
+            self._spill = tempfile.NamedTemporaryFile(mode='ab', dir=self.spill_dir, prefix='senaps-spill-',
+                                                      suffix='.jsonl', delete=False)
+            self._spill_position = 0
+        self._spill.write(json.dumps([stream_id, segment, state, sequence]).encode('utf-8') + b'\n')
+        self._spilled += 1
+
+    def _buffer_entry(self, stream_id, segment, state, sequence):
+        buffer = self._buffer(stream_id)
+        if not buffer:
+            self._oldest[stream_id] = time.time()
+        buffer.append((segment, state, sequence))
+
+    def _take_replay(self):
+        """Move the results of the oldest recovered spool segment into the in-memory buffers."""
+        segment = self._replay.popleft()
+        records = self.spool.load(segment)
+        for stream_id, results in records:
+            for state in results:
+                # recovered results precede everything appended to this writer
+                self._buffer_entry(stream_id, segment, state, 0)
+                self._buffered += 1
+        log.info('Replaying %d spooled results from segment %d', sum(len(r) for _, r in records), segment)
+
+    def _requeue(self, stream_id, batch):
+        """Put a failed batch back at the head of its stream's buffer and back off further uploads."""
+        buffer = self._buffer(stream_id)
+        if not buffer:
+            self._oldest[stream_id] = time.time()
+        buffer.extendleft(reversed(batch))
+        self._buffered += len(batch)
+        self._consecutive_failures += 1
+        delay = min(self.retry_delay * 2 ** (self._consecutive_failures - 1), self.max_retry_delay)
+        self._backoff_until = max(self._backoff_until, time.time() + delay)
+        log.info('Re-queued %d results for %s, retrying in %.1f seconds', len(batch), stream_id, delay)
+
+    def _buffer(self, stream_id):
+        buffer = self._buffers.get(stream_id)
+        if buffer is None:
+            buffer = self._buffers[stream_id] = deque()
+        return buffer
+
+    def _take_batches(self, force):
+        """Remove and return the (stream id, results) batches that are due for upload."""
+        now = time.time()
+        batches = []
+        for stream_id, buffer in self._buffers.items():
+            if not buffer:
+                continue
+            # when only the size limit is reached, leave a partial batch buffered
+            take_all = force or now - self._oldest[stream_id] >= self.max_age
+            while len(buffer) >= self.batch_size or (take_all and buffer):
+                batch = [buffer.popleft() for _ in range(min(self.batch_size, len(buffer)))]
+                batches.append((stream_id, batch))
+                self._buffered -= len(batch)
+            if buffer:
+                self._oldest[stream_id] = now
+        return batches
+
+    def _take_spill(self):
+        """Move spilled results back into the in-memory buffers, up to max_buffered in total."""
+        self._spill.flush()
+        loaded = 0
+        with open(self._spill.name, 'rb') as fp:
+            fp.seek(self._spill_position)
+            while self._buffered + loaded < self.max_buffered:
+                line = fp.readline()
+                if not line:
+                    break
+                stream_id, segment, state, sequence = json.loads(line.decode('utf-8'))
+                self._buffer_entry(stream_id, segment, state, sequence)
+                loaded += 1
+            self._spill_position = fp.tell()
+        self._buffered += loaded
+        self._spilled -= loaded
+        if not self._spilled:
+            self._spill.close()
+            os.remove(self._spill.name)
+            self._spill = None
+
+    def _upload(self, stream_id, batch):
+        states = [state for _, state, _ in batch]
+        try:
+            self.uploader.upload_batch(stream_id, states)
+        except SenapsError as e:
+            log.warning('Failed to upload %d results to %s: %s', len(batch), stream_id, e)
+            return stream_id, batch, e
+        if self.spool is not None:
+            acknowledged = {}
+            for segment, _, _ in batch:
+                acknowledged[segment] = acknowledged.get(segment, 0) + 1
+            for segment, count in acknowledged.items():
+                self.spool.ack(segment, count)
+        return stream_id, batch, None
+
+    def _run(self):
+        while True:
+            if self.spool is not None:
+                self.spool.sync_due()
+            with self._condition:
+                if self._flush_mark is not None and self._settled_through(self._flush_mark):
+                    self._flush_mark = None
+                if not (self._closed or self._flush_mark is not None):
+                    self._condition.wait(min(self.max_age, 1.0))
+                elif not self._closed and self._backoff_until > time.time():
+                    self._condition.wait(self._backoff_until - time.time())
+                if self._spilled and self._buffered <= self.low_water:
+                    self._take_spill()
+                elif self._replay and self._buffered == 0:
+                    self._take_replay()
+                force = self._closed or self._flush_mark is not None or self._buffered >= self.max_buffered
+                if self._closed or time.time() >= self._backoff_until:
+                    batches = self._take_batches(force)
+                else:
+                    batches = []
+                self._in_flight += sum(len(b) for _, b in batches)
+                for _, batch in batches:
+                    self._in_flight_first[min(sequence for _, _, sequence in batch)] += 1
+                if self._closed and not batches and not self._buffered and not self._spilled and not self._replay:
+                    self._condition.notify_all()
+                    self.executor.shutdown(wait=False)
+                    return
+                self._condition.notify_all()
+
+            for stream_id, batch, error in self.executor.map(lambda b: self._upload(*b), batches):
+                with self._condition:
+                    self._in_flight -= len(batch)
+                    first = min(sequence for _, _, sequence in batch)
+                    self._in_flight_first[first] -= 1
+                    if not self._in_flight_first[first]:
+                        del self._in_flight_first[first]
+                    if error is None:
+                        self.uploaded += len(batch)
+                        self._consecutive_failures = 0
+                    elif self.spool is not None and not self._closed and is_retryable(error):
+                        self._requeue(stream_id, batch)
+                    else:
+                        self.failed += len(batch)
+                        self.failed_batches.append(FailedBatch(self._failed_batch_count,
+                                                               [state for _, state, _ in batch], error))
+                        self._failed_batch_count += 1
+                    self._condition.notify_all()
@@ -0,0 +1,106 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+from senaps_sensor.adaptive import AdaptiveController
+from senaps_sensor.error import SenapsError
+from senaps_sensor.upload import BulkUploader
+from tests.test_upload import FakeIngestApi, FakeResponse, make_results
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+def error(status_code):
+    return SenapsError('Senaps error response', FakeResponse(status_code))
+
+
+class AdaptiveControllerTestCase(unittest.TestCase):
+
+    def test_increases_additively_while_latency_is_flat(self):
+        controller = AdaptiveController(batch_size=500, concurrency=2, batch_increment=100)
+        for _ in range(2):
+            controller.record_success(500, 0.5)
+        self.assertEqual((600, 3), (controller.batch_size, controller.concurrency))
+
+        for _ in range(3):
+            controller.record_success(600, 0.6)
+        self.assertEqual((700, 4), (controller.batch_size, controller.concurrency))
+
+    def test_settings_are_bounded(self):
+        controller = AdaptiveController(batch_size=500, concurrency=2, max_batch_size=600, max_concurrency=3,
+                                        batch_increment=100)
+        for _ in range(20):
+            controller.record_success(500, 0.5)
+        self.assertEqual((600, 3), (controller.batch_size, controller.concurrency))
+
+        controller = AdaptiveController(batch_size=100, concurrency=2, min_batch_size=80)
+        for _ in range(5):
+            controller.record_failure(error(503))
+            for _ in range(2):
+                controller.record_failure(error(400))
+        self.assertEqual((80, 1), (controller.batch_size, controller.concurrency))
+
+    def test_rate_limiting_backs_off_once_per_round(self):
+        controller = AdaptiveController(batch_size=1000, concurrency=8)
+        for _ in range(8):
+            controller.record_failure(error(429))
+        self.assertEqual((500, 4), (controller.batch_size, controller.concurrency))
+        self.assertEqual(1, controller.decreases)
+
+        controller.record_failure(error(500))
+        self.assertEqual((250, 2), (controller.batch_size, controller.concurrency))
+
+    def test_client_errors_are_ignored(self):
+        controller = AdaptiveController(batch_size=1000, concurrency=8)
+        controller.record_failure(error(400))
+        self.assertEqual((1000, 8), (controller.batch_size, controller.concurrency))
+
+    def test_rising_latency_backs_off(self):
+        controller = AdaptiveController(batch_size=1000, concurrency=4, smoothing=1.0, baseline_drift=0)
+        controller.record_success(1000, 1.0)
+        controller.record_success(1000, 2.0)
+        self.assertEqual((500, 2), (controller.batch_size, controller.concurrency))
+
+        metrics = controller.metrics()
+        self.assertEqual(0.001, metrics['baseline_latency'])
+        self.assertEqual(0.002, metrics['latency'])
+        self.assertEqual(1, metrics['decreases'])
+
+
+class AdaptiveUploadTestCase(unittest.TestCase):
+
+    def test_batches_follow_the_controller(self):
+        api = FakeIngestApi({'2016-02-15T00:00:30.000000Z': [429]})
+        controller = AdaptiveController(batch_size=10, concurrency=1, batch_increment=10, min_batch_size=5)
+        summary = BulkUploader(api, retry_delay=0, controller=controller).upload('a', make_results(200))
+
+        self.assertTrue(summary.ok)
+        self.assertEqual(200, len(api.uploaded['a']))
+        self.assertEqual(1, controller.failures)
+        self.assertEqual(summary.batches, controller.successes)
+        self.assertLess(summary.batches, 20)
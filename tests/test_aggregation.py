@@ -0,0 +1,210 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from senaps_sensor.aggregation import AggregationEngine, aggregate, aggregation_results
+from senaps_sensor.arrays import ObservationArrays
+from senaps_sensor.error import SenapsError
+from senaps_sensor.parsers import NumpyObservationParser
+from senaps_sensor.timestamps import parse_datetime64
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+HOUR = 60 * 60 * 1000
+
+# The observations and hourly /aggregation response of the
+# test_pandas_get_aggregation_scalar_stream integration test in test_parsers.
+OBSERVATION_TIMESTAMPS = np.datetime64('2016-02-15T00:00', 'ns') + np.arange(11) * np.timedelta64(15, 'm')
+OBSERVATION_VALUES = np.arange(1.0, 12.0)
+SERVER_RESPONSE = {'results': [
+    {'t': '2016-02-15T00:00:00.000Z', 'v': {'avg': 2.5, 'min': 1.0, 'max': 4.0, 'count': 4}},
+    {'t': '2016-02-15T01:00:00.000Z', 'v': {'avg': 6.5, 'min': 5.0, 'max': 8.0, 'count': 4}},
+    {'t': '2016-02-15T02:00:00.000Z', 'v': {'avg': 10.0, 'min': 9.0, 'max': 11.0, 'count': 3}},
+]}
+
+MINUTE = 60 * 1000
+
+
+def response(*periods):
+    return {'results': [{'t': t, 'v': OrderedDict(zip(('avg', 'min', 'max', 'count'), v))} for t, v in periods]}
+
+
+# Further /aggregation responses as (aggperiod, observation timestamps,
+# observation values, response), in the shape the server returns: periods
+# aligned to multiples of aggperiod since the epoch and empty periods left out.
+# They cover other period sizes, gaps, and ranges before the epoch or not
+# aligned to the hour.
+RECORDED_RESPONSES = [
+    (30 * MINUTE, OBSERVATION_TIMESTAMPS, OBSERVATION_VALUES, response(
+        ('2016-02-15T00:00:00.000Z', (1.5, 1.0, 2.0, 2)),
+        ('2016-02-15T00:30:00.000Z', (3.5, 3.0, 4.0, 2)),
+        ('2016-02-15T01:00:00.000Z', (5.5, 5.0, 6.0, 2)),
+        ('2016-02-15T01:30:00.000Z', (7.5, 7.0, 8.0, 2)),
+        ('2016-02-15T02:00:00.000Z', (9.5, 9.0, 10.0, 2)),
+        ('2016-02-15T02:30:00.000Z', (11.0, 11.0, 11.0, 1)))),
+    (90 * MINUTE, OBSERVATION_TIMESTAMPS, OBSERVATION_VALUES, response(
+        ('2016-02-15T00:00:00.000Z', (3.5, 1.0, 6.0, 6)),
+        ('2016-02-15T01:30:00.000Z', (9.0, 7.0, 11.0, 5)))),
+    (24 * HOUR, OBSERVATION_TIMESTAMPS, OBSERVATION_VALUES, response(
+        ('2016-02-15T00:00:00.000Z', (6.0, 1.0, 11.0, 11)))),
+    (HOUR, np.array(['2016-02-15T00:05', '2016-02-15T00:20', '2016-02-15T03:10', '2016-02-15T03:50',
+                     '2016-02-15T07:00'], dtype='datetime64[ns]'), np.array([1.0, 2.0, 3.0, 4.0, 5.0]), response(
+        ('2016-02-15T00:00:00.000Z', (1.5, 1.0, 2.0, 2)),
+        ('2016-02-15T03:00:00.000Z', (3.5, 3.0, 4.0, 2)),
+        ('2016-02-15T07:00:00.000Z', (5.0, 5.0, 5.0, 1)))),
+    (7 * MINUTE, np.array(['1969-12-31T23:50:00', '1969-12-31T23:51:40', '1969-12-31T23:55:00',
+                           '1970-01-01T00:01:00', '1970-01-01T00:01:40', '1970-01-01T00:08:30'],
+                          dtype='datetime64[ns]'), np.array([1.0, 5.0, 2.0, 3.0, 6.0, 4.0]), response(
+        ('1969-12-31T23:46:00.000Z', (3.0, 1.0, 5.0, 2)),
+        ('1969-12-31T23:53:00.000Z', (2.0, 2.0, 2.0, 1)),
+        ('1970-01-01T00:00:00.000Z', (4.5, 3.0, 6.0, 2)),
+        ('1970-01-01T00:07:00.000Z', (4.0, 4.0, 4.0, 1)))),
+]
+
+
+def parse_response(response, streamid, aggperiod):
+    method = type(str('Method'), (object,), {'query_params': {'streamid': streamid, 'aggperiod': aggperiod}})()
+    return NumpyObservationParser().parse(method, json.dumps(response))
+
+
+def reference_aggregate(timestamps, values, aggperiod):
+    """A per-result implementation of the aggregation, to check the vectorised one against."""
+    buckets = OrderedDict()
+    for t, v in sorted(zip(timestamps.astype('datetime64[ms]').astype(np.int64).tolist(), values.tolist())):
+        if v != v:
+            continue
+        buckets.setdefault(t // aggperiod * aggperiod, []).append(v)
+    return [(start, sum(vs) / len(vs), min(vs), max(vs), len(vs)) for start, vs in buckets.items()]
+
+
+class AggregateTestCase(unittest.TestCase):
+
+    def assert_arrays_equal(self, expected, actual):
+        self.assertEqual(list(expected), list(actual))
+        np.testing.assert_array_equal(expected.timestamps, actual.timestamps)
+        for key in expected:
+            np.testing.assert_allclose(expected[key], actual[key], rtol=1e-12)
+
+    def test_parity_with_server_response(self):
+        expected = parse_response(SERVER_RESPONSE, 's', HOUR)
+        actual = aggregate(OBSERVATION_TIMESTAMPS, OBSERVATION_VALUES, HOUR, 's')
+
+        self.assert_arrays_equal(expected, actual)
+
+    def test_parity_with_recorded_responses(self):
+        for aggperiod, timestamps, values, recorded in RECORDED_RESPONSES:
+            with self.subTest(aggperiod=aggperiod, start=str(timestamps[0])):
+                self.assert_arrays_equal(parse_response(recorded, 's', aggperiod),
+                                         aggregate(timestamps, values, aggperiod, 's'))
+                results = aggregation_results(aggregate(timestamps, values, aggperiod))['results']
+                self.assertEqual([r['v'] for r in recorded['results']], [r['v'] for r in results])
+                np.testing.assert_array_equal(parse_datetime64([r['t'] for r in recorded['results']]),
+                                              parse_datetime64([r['t'] for r in results]))
+
+    def test_results_have_the_shape_of_the_server_response(self):
+        results = aggregation_results(aggregate(OBSERVATION_TIMESTAMPS, OBSERVATION_VALUES, HOUR))
+
+        self.assert_arrays_equal(parse_response(SERVER_RESPONSE, 'v', HOUR), parse_response(results, 'v', HOUR))
+        self.assertEqual(SERVER_RESPONSE['results'][0]['v'], results['results'][0]['v'])
+        np.testing.assert_array_equal(parse_datetime64([r['t'] for r in SERVER_RESPONSE['results']]),
+                                      parse_datetime64([r['t'] for r in results['results']]))
+
+    def test_matches_reference_on_unordered_data(self):
+        rng = np.random.RandomState(42)
+        offsets = rng.randint(-10 ** 9, 10 ** 9, size=5000)
+        timestamps = np.datetime64('1970-01-01T00:00', 'ms') + offsets.astype('timedelta64[ms]')
+        values = rng.normal(size=5000)
+        values[rng.rand(5000) < 0.1] = np.nan
+        aggperiod = 7 * 60 * 1000
+        actual = aggregate(timestamps, values, datetime.timedelta(minutes=7), 's')
+
+        expected = reference_aggregate(timestamps, values, aggperiod)
+        np.testing.assert_array_equal([e[0] for e in expected],
+                                      actual.timestamps.astype('datetime64[ms]').astype(np.int64))
+        for i, field in enumerate(['avg', 'min', 'max', 'count']):
+            np.testing.assert_allclose([e[i + 1] for e in expected], actual['s.%s' % field], rtol=1e-9)
+
+    def test_missing_values_and_timestamps_are_ignored(self):
+        timestamps = np.array(['2016-02-15T00:00', 'NaT', '2016-02-15T00:10'], dtype='datetime64[ns]')
+        arrays = aggregate(timestamps, np.array([1.0, 2.0, None], dtype=object), HOUR)
+
+        np.testing.assert_array_equal([1.0], arrays['v.count'])
+        np.testing.assert_array_equal([1.0], arrays['v.avg'])
+
+    def test_arrow_arrays(self):
+        import pyarrow as pa
+        timestamps = pa.array(OBSERVATION_TIMESTAMPS.astype('datetime64[us]'), type=pa.timestamp('us', tz='UTC'))
+        values = pa.array(OBSERVATION_VALUES.tolist()[:-1] + [None])
+        arrays = aggregate(pa.chunked_array([timestamps]), values, HOUR)
+
+        np.testing.assert_array_equal([4, 4, 2], arrays['v.count'])
+        np.testing.assert_array_equal([10.0], arrays['v.max'][2:])
+
+    def test_empty(self):
+        arrays = aggregate(np.empty(0, dtype='datetime64[ns]'), np.empty(0), HOUR)
+
+        self.assertEqual(0, len(arrays.timestamps))
+        self.assertEqual({'results': []}, aggregation_results(arrays))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(SenapsError):
+            aggregate(OBSERVATION_TIMESTAMPS, OBSERVATION_VALUES, 0)
+        with self.assertRaises(SenapsError):
+            aggregate(OBSERVATION_VALUES, OBSERVATION_VALUES, HOUR)
+        with self.assertRaises(SenapsError):
+            aggregate(OBSERVATION_TIMESTAMPS, np.ones((11, 2)), HOUR)
+
+
+class AggregationEngineTestCase(unittest.TestCase):
+
+    def test_observation_arrays(self):
+        arrays = ObservationArrays(OBSERVATION_TIMESTAMPS, OrderedDict([('b', OBSERVATION_VALUES),
+                                                                        ('a', OBSERVATION_VALUES * 2)]))
+        aggregations = AggregationEngine().aggregate_streams(arrays, HOUR)
+
+        self.assertEqual(['b', 'a'], list(aggregations))
+        np.testing.assert_array_equal([5, 13, 20], aggregations['a']['a.avg'])
+        np.testing.assert_array_equal([4, 4, 3], aggregations['b']['b.count'])
+
+    def test_many_streams(self):
+        data = OrderedDict(('s%d' % i, (OBSERVATION_TIMESTAMPS, OBSERVATION_VALUES + i)) for i in range(100))
+        aggregations = AggregationEngine(concurrency=8).aggregate_streams(data, HOUR)
+
+        self.assertEqual(list(data), list(aggregations))
+        np.testing.assert_array_equal([101.5, 105.5, 109], aggregations['s99']['s99.avg'])
+
+
+if __name__ == '__main__':
+    unittest.main()
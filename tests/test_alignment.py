@@ -0,0 +1,227 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from senaps_sensor.alignment import Aligner, align_series, method_for, prepare_series, regular_grid
+from senaps_sensor.arrays import ObservationArrays
+from senaps_sensor.error import SenapsError
+from senaps_sensor.models import InterpolationType, Stream, StreamMetaData
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+START = np.datetime64('2016-02-15T00:00', 'ns')
+MINUTE = np.timedelta64(1, 'm')
+
+
+def random_series(rng, count, span_minutes):
+    timestamps = START + (rng.rand(count) * span_minutes * 60 * 10 ** 9).astype('timedelta64[ns]')
+    return timestamps, rng.normal(size=count)
+
+
+def stream(streamid, interpolation_type):
+    s = Stream()
+    s.id = streamid
+    s.metadata = StreamMetaData()
+    s.metadata.interpolation_type = interpolation_type
+    return s
+
+
+class AlignSeriesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.timestamps, self.values = random_series(rng, 500, 600)
+        self.grid = regular_grid(START - 5 * MINUTE, START + 605 * MINUTE, np.timedelta64(37, 's'))
+
+    def merge_asof(self, direction, tolerance=None):
+        """The same alignment done by pandas, to check against."""
+        left = pd.DataFrame({'t': self.grid})
+        right = pd.DataFrame({'t': self.timestamps, 'v': self.values}).sort_values('t')
+        if tolerance is not None:
+            tolerance = pd.Timedelta(tolerance)
+        return pd.merge_asof(left, right, on='t', direction=direction, tolerance=tolerance)['v'].values
+
+    def align(self, method, tolerance=None):
+        timestamps, values = prepare_series(self.timestamps, self.values)
+        return align_series(self.grid.view('int64'), timestamps, values, method, tolerance)
+
+    def test_matches_pandas_merge_asof(self):
+        np.testing.assert_array_equal(self.merge_asof('backward'), self.align('previous'))
+        np.testing.assert_array_equal(self.merge_asof('forward'), self.align('next'))
+        tolerance = np.timedelta64(30, 's')
+        np.testing.assert_array_equal(self.merge_asof('backward', tolerance),
+                                      self.align('previous', tolerance.astype('timedelta64[ns]').astype('int64')))
+
+    def test_nearest(self):
+        tolerance = np.timedelta64(20, 's')
+        aligned = self.align('nearest', tolerance.astype('timedelta64[ns]').astype('int64'))
+
+        np.testing.assert_array_equal(self.merge_asof('nearest', tolerance), aligned)
+        self.assertTrue(np.isnan(aligned).any())
+
+    def test_linear_matches_numpy_interp(self):
+        timestamps, values = prepare_series(self.timestamps, self.values)
+        inside = (self.grid.view('int64') >= timestamps[0]) & (self.grid.view('int64') <= timestamps[-1])
+        aligned = self.align('linear')
+
+        # np.interp works on float nanoseconds, which are only precise to a few hundred nanoseconds
+        np.testing.assert_allclose(np.interp(self.grid.view('int64')[inside], timestamps, values), aligned[inside],
+                                   atol=1e-6)
+        self.assertTrue(np.isnan(aligned[~inside]).all())
+
+    def test_prepare_sorts_and_drops_missing(self):
+        timestamps = np.array([START + MINUTE, np.datetime64('NaT'), START, START + 2 * MINUTE])
+        timestamps, values = prepare_series(timestamps, np.array([1.0, 2.0, 0.0, np.nan]))
+
+        np.testing.assert_array_equal([START.astype('int64'), (START + MINUTE).astype('int64')], timestamps)
+        np.testing.assert_array_equal([0.0, 1.0], values)
+
+    def test_vector_values(self):
+        timestamps = np.array([START, START + 2 * MINUTE])
+        series = prepare_series(timestamps, np.array([[0.0, 10.0], [2.0, 30.0]]))
+        aligned = align_series(np.array([START + MINUTE]).view('int64'), series[0], series[1], 'linear')
+
+        np.testing.assert_array_equal([[1.0, 20.0]], aligned)
+
+    def test_unknown_method(self):
+        with self.assertRaises(SenapsError):
+            self.align('cubic')
+
+
+class AlignerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = OrderedDict([
+            ('fast', (START + np.arange(60) * MINUTE, np.arange(60.0))),
+            ('slow', (START + np.arange(0, 60, 15) * MINUTE, np.array([0.0, 15.0, 30.0, 45.0]))),
+        ])
+        self.grid = regular_grid(datetime.datetime(2016, 2, 15), datetime.datetime(2016, 2, 15, 1), datetime.timedelta(minutes=10))
+
+    def test_regular_grid(self):
+        self.assertEqual(7, len(self.grid))
+        self.assertEqual(np.datetime64('2016-02-15T01:00', 'ns'), self.grid[-1])
+
+    def test_methods_from_interpolation_type(self):
+        streams = [stream('fast', InterpolationType.continuous), stream('slow', InterpolationType.total_preceding)]
+        aligned = Aligner(self.grid, streams=streams).align(self.data)
+
+        np.testing.assert_array_equal([0, 10, 20, 30, 40, 50, np.nan], aligned['fast'])
+        np.testing.assert_array_equal([0, 15, 30, 30, 45, np.nan, np.nan], aligned['slow'])
+        self.assertEqual('previous', method_for(Stream()))
+        self.assertEqual('previous', method_for(stream('x', InterpolationType.const_succeeding)))
+
+    def test_explicit_methods_and_tolerance(self):
+        aligner = Aligner(self.grid, method={'slow': 'previous'}, tolerance={'slow': datetime.timedelta(minutes=5)})
+        aligned = aligner.align(self.data)
+
+        np.testing.assert_array_equal([0, np.nan, 15, 30, np.nan, 45, np.nan], aligned['slow'])
+        np.testing.assert_array_equal([0, 10, 20, 30, 40, 50, 59], aligned['fast'])
+
+    def test_chunks_match_whole_grid(self):
+        grid = regular_grid(START, START + 90 * MINUTE, np.timedelta64(7, 's'))
+        whole = Aligner(grid, method='linear').matrix(self.data)
+        chunks = list(Aligner(grid, method='linear', chunk_size=100).iter_chunks(self.data))
+
+        self.assertEqual(-(-len(grid) // 100), len(chunks))
+        np.testing.assert_array_equal(whole[:, 1], np.concatenate([c['slow'] for c in chunks]))
+        np.testing.assert_array_equal(whole, Aligner(grid, method='linear', chunk_size=100).matrix(self.data))
+
+    def test_chunked_streams_match_whole_streams(self):
+        rng = np.random.RandomState(7)
+        timestamps, values = random_series(rng, 500, 90)
+        timestamps.sort()
+        timestamps[100:103] = timestamps[100]
+        grid = regular_grid(START, START + 90 * MINUTE, np.timedelta64(7, 's'))
+
+        def chunks(size):
+            for start in range(0, len(timestamps), size):
+                yield timestamps[start:start + size], values[start:start + size]
+
+        for method in ('previous', 'next', 'nearest', 'linear'):
+            aligner = Aligner(grid, method=method, tolerance=datetime.timedelta(minutes=1), chunk_size=50)
+            whole = aligner.matrix({'a': (timestamps, values)})
+            np.testing.assert_array_equal(whole, aligner.matrix({'a': chunks(37)}))
+            np.testing.assert_array_equal(whole, aligner.matrix({'a': list(chunks(1000))}))
+
+    def test_chunked_streams_are_read_as_the_grid_advances(self):
+        read = []
+
+        def chunks():
+            for start in range(0, 60, 10):
+                read.append(start)
+                yield self.data['fast'][0][start:start + 10], self.data['fast'][1][start:start + 10]
+
+        aligned = Aligner(self.grid, chunk_size=2).iter_chunks({'fast': chunks()})
+        np.testing.assert_array_equal([0, 10], next(aligned)['fast'])
+        self.assertEqual([0, 10], read)
+
+    def test_list_pairs(self):
+        timestamps, values = self.data['fast']
+        expected = Aligner(self.grid).align({'fast': (timestamps, values)})['fast']
+
+        np.testing.assert_array_equal(expected, Aligner(self.grid).align({'fast': [timestamps, values]})['fast'])
+        np.testing.assert_array_equal(expected, Aligner(self.grid).align({'fast': [list(timestamps), list(values)]})['fast'])
+        np.testing.assert_array_equal(expected, Aligner(self.grid).align({'fast': [[timestamps, values]]})['fast'])
+
+    def test_invalid_chunks(self):
+        with self.assertRaises(SenapsError):
+            Aligner(self.grid).align({'fast': [self.data['fast'][0]]})
+
+    def test_chunks_must_be_in_time_order(self):
+        timestamps, values = self.data['fast']
+        chunks = [(timestamps[30:], values[30:]), (timestamps[:30], values[:30])]
+        with self.assertRaises(SenapsError):
+            Aligner(self.grid).align({'fast': chunks})
+
+    def test_matrix(self):
+        arrays = ObservationArrays(self.data['fast'][0], OrderedDict([('b', np.arange(60.0)), ('a', -np.arange(60.0))]))
+        matrix = Aligner(self.grid).matrix(arrays)
+
+        self.assertEqual((7, 2), matrix.shape)
+        self.assertTrue(matrix.flags['F_CONTIGUOUS'])
+        np.testing.assert_array_equal([0, -10, -20, -30, -40, -50, -59], matrix[:, 1])
+
+    def test_matrix_requires_scalar_streams(self):
+        data = {'v': (self.data['fast'][0], np.ones((60, 2)))}
+        with self.assertRaises(SenapsError):
+            Aligner(self.grid).matrix(data)
+
+    def test_grid_must_be_sorted(self):
+        with self.assertRaises(SenapsError):
+            Aligner(self.grid[::-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import json
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from senaps_sensor.parsers import ArrowObservationParser
+from tests.test_csv_parser import FakeMethod, PAYLOAD
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+TIMESTAMP = pa.timestamp('us', tz='UTC')
+
+
+class ArrowObservationParserTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = ArrowObservationParser()
+
+    def test_csv(self):
+        table = self.parser.parse(FakeMethod('v,a'), PAYLOAD)
+
+        self.assertEqual(['timestamp', 'v', 'a'], table.column_names)
+        self.assertEqual(TIMESTAMP, table.schema.field('timestamp').type)
+        self.assertEqual(pa.list_(pa.float64(), 2), table.schema.field('v').type)
+        self.assertEqual(pa.float64(), table.schema.field('a').type)
+        self.assertEqual([[1.0, 2.0], [3.0, 4.0]], table.column('v').to_pylist())
+        self.assertEqual([None, 1.5], table.column('a').to_pylist())
+
+    def test_json(self):
+        method = FakeMethod('b,v')
+        method.query_params['media'] = 'json'
+        payload = json.dumps({'results': [
+            {'t': '2016-02-15T00:00:00.000Z', 'v': {'v': {'v': [1, 2]}}},
+            {'t': '2016-02-15T00:15:00.500Z', 'v': {'b': {'v': 3}}},
+            {'t': '2016-02-15T00:30:00.000Z', 'v': {'v': {'v': [None, 5, 6]}}},
+            {'t': '2016-02-15T00:45:00.000Z', 'v': {'v': {'v': [7]}}}]})
+        table = self.parser.parse(method, payload.encode('utf-8'))
+
+        self.assertEqual(['timestamp', 'b', 'v'], table.column_names)
+        self.assertEqual(TIMESTAMP, table.schema.field('timestamp').type)
+        self.assertEqual([None, 3, None, None], table.column('b').to_pylist())
+        self.assertEqual(pa.list_(pa.float64(), 3), table.schema.field('v').type)
+        np.testing.assert_array_equal([[1, 2, np.nan], [np.nan] * 3, [np.nan, 5, 6], [7, np.nan, np.nan]],
+                                      table.column('v').combine_chunks().flatten().to_numpy().reshape(-1, 3))
+
+    def test_aggregation(self):
+        method = FakeMethod('a')
+        method.query_params['aggperiod'] = '900000'
+        payload = json.dumps({'results': [{'t': '2016-02-15T00:00:00.000Z',
+                                           'v': {'avg': 1.5, 'min': 1, 'max': 2, 'count': 2}}]})
+        table = self.parser.parse(method, payload)
+
+        self.assertEqual(['timestamp', 'a.avg', 'a.min', 'a.max', 'a.count'], table.column_names)
+        self.assertEqual(pa.int64(), table.schema.field('a.count').type)
+        self.assertEqual([1.0], table.column('a.min').to_pylist())
+
+    def test_parquet_round_trip(self):
+        table = self.parser.parse(FakeMethod('a,v'), PAYLOAD)
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink)
+
+        self.assertTrue(pq.read_table(pa.BufferReader(sink.getvalue())).equals(table))
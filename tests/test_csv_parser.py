@@ -0,0 +1,100 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from senaps_sensor.error import SenapsError
+from senaps_sensor.parsers import PandasObservationParser, find_csv_header
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+PAYLOAD = (b'# stream: a\r\n# stream: v, timestamp\r\ntimestamp,v[0],v[1],a\r\n'
+           b'2016-02-15T00:00:00.000Z,1,2,\r\n'
+           b'2016-02-15T00:15:00.500Z,3,4,1.5\r\n')
+
+
+class FakeMethod(object):
+
+    def __init__(self, streamid):
+        self.query_params = {'media': 'csv', 'streamid': streamid}
+
+
+class FindCsvHeaderTestCase(unittest.TestCase):
+
+    def test_header_positions(self):
+        self.assertEqual(0, find_csv_header(b'timestamp,a\n'))
+        self.assertEqual(4, find_csv_header(b'# x\ntimestamp,a\n'))
+        self.assertEqual(11, find_csv_header(b'timestamps\ntimestamp\r\n'))
+        self.assertEqual(-1, find_csv_header(b'# timestamp,a\n'))
+        self.assertEqual(-1, find_csv_header(b''))
+
+
+class AggregationTestCase(unittest.TestCase):
+
+    def test_indexed_by_timestamp(self):
+        method = FakeMethod('a')
+        method.query_params.update({'media': 'json', 'aggperiod': '900000'})
+        payload = ('{"results": [{"t": "2016-02-15T00:00:00.000Z", "v": {"avg": 1.5, "min": 1, "max": 2, "count": 2}},'
+                   '{"t": "2016-02-15T00:15:00.000Z", "v": {"avg": 3, "min": 3, "max": 3, "count": 1}}]}')
+        df = PandasObservationParser().parse(method, payload)
+
+        self.assertEqual('timestamp', df.index.name)
+        self.assertEqual(['a.avg', 'a.min', 'a.max', 'a.count'], list(df.columns))
+        self.assertEqual([2, 1], list(df['a.count']))
+
+
+class CsvObservationParserTestCase(unittest.TestCase):
+
+    def expected(self):
+        index = pd.DatetimeIndex(['2016-02-15T00:00:00', '2016-02-15T00:15:00.5'], name='timestamp').tz_localize('UTC')
+        df = pd.DataFrame({'a': [float('nan'), 1.5], 'v[0]': [1, 3], 'v[1]': [2, 4]}, index=index)
+        df.index = df.index.as_unit('us')
+        return df
+
+    def test_engines(self):
+        engines = ['c']
+        try:
+            import pyarrow.csv
+            engines.append('pyarrow')
+        except ImportError:
+            pass
+
+        for engine in engines:
+            df = PandasObservationParser(engine=engine).parse(FakeMethod('a,v'), PAYLOAD)
+            assert_frame_equal(self.expected(), df)
+
+    def test_text_payload(self):
+        df = PandasObservationParser(engine='c').parse(FakeMethod('a,v'), PAYLOAD.decode('utf-8'))
+        assert_frame_equal(self.expected(), df)
+
+    def test_missing_header(self):
+        with self.assertRaises(SenapsError):
+            PandasObservationParser().parse(FakeMethod('a'), b'# nothing here\n')
@@ -0,0 +1,200 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import threading
+import time
+
+from senaps_sensor.api import API
+from senaps_sensor.cursor import Cursor
+from senaps_sensor.error import SenapsError, ConsistencyError
+from senaps_sensor.models import ResultSet
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+class FakeListing(object):
+    """Stands in for a bound 'limit'/'skip' listing method such as api.streams."""
+
+    pagination_mode = 'skip'
+
+    def __init__(self, total, fail_at=None, max_limit=None):
+        self.total = total
+        self.fail_at = fail_at
+        self.max_limit = max_limit
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append(kwargs)
+        skip, limit = kwargs['skip'], min(kwargs['limit'], self.max_limit or kwargs['limit'])
+        if skip == self.fail_at:
+            raise SenapsError('Failed to send request: boom')
+        page = ResultSet(total_count=self.total)
+        page.extend(range(skip, min(skip + limit, self.total)))
+        return page
+
+
+class Item(object):
+
+    def __init__(self, id):
+        self.id = id
+
+
+class ChangingListing(FakeListing):
+    """A listing whose first item is deleted after the first page has been served."""
+
+    def __call__(self, *args, **kwargs):
+        skip, limit = kwargs['skip'], kwargs['limit']
+        ids = list(range(self.total))
+        if self.calls:
+            ids = ids[1:]
+        self.calls.append(kwargs)
+        page = ResultSet(total_count=len(ids))
+        page.extend(Item(i) for i in ids[skip:skip + limit])
+        return page
+
+
+class CursorTestCase(unittest.TestCase):
+
+    def test_listing_methods_support_skip_pagination(self):
+        api = API()
+        for method in (api.streams, api.locations, api.roles, api.get_groups):
+            self.assertEqual('skip', method.pagination_mode)
+
+    def test_non_paginated_method_raises(self):
+        with self.assertRaises(SenapsError):
+            Cursor(API().get_stream)
+
+    def test_items_walks_all_pages(self):
+        listing = FakeListing(25)
+
+        self.assertEqual(list(range(25)), list(Cursor(listing, page_size=10).items()))
+        self.assertEqual([0, 10, 20], [c['skip'] for c in listing.calls])
+
+    def test_stops_at_count_without_extra_request(self):
+        listing = FakeListing(20)
+
+        self.assertEqual(2, len(list(Cursor(listing, page_size=10).pages())))
+        self.assertEqual(2, len(listing.calls))
+
+    def test_items_with_server_capped_page_size(self):
+        listing = FakeListing(10, max_limit=3)
+
+        self.assertEqual(list(range(10)), list(Cursor(listing, page_size=5).items()))
+        self.assertEqual([0, 3, 6, 9], [c['skip'] for c in listing.calls])
+
+    def test_items_limit(self):
+        listing = FakeListing(1000)
+
+        self.assertEqual(list(range(15)), list(Cursor(listing, page_size=10).items(15)))
+        self.assertEqual(2, len(listing.calls))
+
+    def test_pages_limit_and_extra_kwargs(self):
+        listing = FakeListing(1000)
+
+        pages = list(Cursor(listing, limit=5, expand=True).pages(3))
+        self.assertEqual(3, len(pages))
+        self.assertTrue(all(c['expand'] and c['limit'] == 5 for c in listing.calls))
+
+
+class PrefetchCursorTestCase(unittest.TestCase):
+
+    def test_prefetch_items(self):
+        listing = FakeListing(95)
+
+        self.assertEqual(list(range(95)), list(Cursor(listing, page_size=10).items(prefetch=2)))
+
+    def test_prefetch_pages_run_in_background(self):
+        listing = FakeListing(30)
+        pages = Cursor(listing, page_size=10).pages(prefetch=1)
+        first = next(pages)
+
+        # the next page is fetched while the consumer holds the first one
+        deadline = time.time() + 5
+        while len(listing.calls) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(list(range(10)), list(first))
+        self.assertGreaterEqual(len(listing.calls), 2)
+        self.assertEqual(2, len(list(pages)))
+
+    def test_prefetch_propagates_errors(self):
+        listing = FakeListing(100, fail_at=20)
+        pages = Cursor(listing, page_size=10).pages(prefetch=2)
+
+        self.assertEqual(2, len([next(pages), next(pages)]))
+        with self.assertRaises(SenapsError):
+            next(pages)
+        with self.assertRaises(StopIteration):
+            next(pages)
+
+    def test_prefetch_stops_when_consumer_stops_early(self):
+        listing = FakeListing(10000)
+        items = Cursor(listing, page_size=10).items(limit=5, prefetch=2)
+
+        self.assertEqual(5, len(list(items)))
+        time.sleep(0.3)
+        self.assertLessEqual(len(listing.calls), 4)
+        self.assertFalse(any(t.name == 'senaps-prefetch' for t in threading.enumerate()))
+
+
+class FetchAllTestCase(unittest.TestCase):
+
+    def test_fetch_all_in_order(self):
+        listing = FakeListing(1005)
+        results = Cursor(listing, page_size=100).fetch_all(concurrency=8)
+
+        self.assertEqual(list(range(1005)), list(results))
+        self.assertEqual(1005, results.total_count)
+        self.assertEqual(11, len(listing.calls))
+
+    def test_fetch_all_single_page(self):
+        listing = FakeListing(7)
+
+        self.assertEqual(list(range(7)), list(Cursor(listing, page_size=100).fetch_all()))
+        self.assertEqual(1, len(listing.calls))
+
+    def test_fetch_all_with_server_capped_page_size(self):
+        listing = FakeListing(10, max_limit=3)
+        results = Cursor(listing, page_size=5).fetch_all()
+
+        self.assertEqual(list(range(10)), list(results))
+        self.assertEqual([0, 3, 6, 9], sorted(c['skip'] for c in listing.calls))
+
+    def test_fetch_all_propagates_errors(self):
+        with self.assertRaises(SenapsError):
+            Cursor(FakeListing(1000, fail_at=500), page_size=100).fetch_all()
+
+    def test_fetch_all_detects_drift(self):
+        with self.assertRaises(ConsistencyError):
+            Cursor(ChangingListing(50), page_size=10).fetch_all()
+
+    def test_fetch_all_tolerates_drift_when_not_strict(self):
+        results = Cursor(ChangingListing(50), page_size=10).fetch_all(strict=False)
+
+        ids = [item.id for item in results]
+        self.assertEqual(len(ids), len(set(ids)))
@@ -0,0 +1,184 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+import json
+import threading
+
+from senaps_sensor.download import AggregationDownloader, ObservationDownloader
+from senaps_sensor.error import SenapsError
+from senaps_sensor.timestamps import format_timestamp, parse_timestamp
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+class FakeObservationApi(object):
+    """
+    In-memory stand-in for the observation endpoints of API. Both start and
+    end are inclusive, so neighbouring slices overlap at their boundary.
+    """
+
+    def __init__(self, timestamps, fail_once=False, aggregation=True):
+        self.timestamps = sorted(timestamps)
+        self.fail_once = fail_once
+        self.aggregation = aggregation
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def _select(self, start, end):
+        start, end = parse_timestamp(start), parse_timestamp(end)
+        return [t for t in self.timestamps if start <= t <= end]
+
+    def get_observations(self, streamid, start, end, limit, sort):
+        with self.lock:
+            self.requests.append((start, end))
+            if self.fail_once:
+                self.fail_once = False
+                raise SenapsError('Failed to send request: timed out')
+        selected = self._select(start, end)[:limit]
+        return {'results': [{'t': format_timestamp(t), 'v': {'v': i}} for i, t in enumerate(selected)]}
+
+    def get_aggregation(self, streamid, start, end, aggperiod):
+        if not self.aggregation:
+            raise SenapsError('Senaps error response: status code = 500')
+        period = datetime.timedelta(milliseconds=aggperiod)
+        base = parse_timestamp(start)
+        counts = {}
+        for t in self._select(start, end):
+            bucket = base + period * ((t - base) // period)
+            counts[bucket] = counts.get(bucket, 0) + 1
+        return {'results': [{'t': format_timestamp(b), 'v': {'count': c}} for b, c in sorted(counts.items())]}
+
+
+START = datetime.datetime(2016, 2, 15)
+
+
+def every(seconds, count):
+    return [START + datetime.timedelta(seconds=seconds * i) for i in range(count)]
+
+
+class ObservationDownloaderTestCase(unittest.TestCase):
+
+    def test_plan_sizes_slices_by_density(self):
+        api = FakeObservationApi(every(1, 7200))
+        downloader = ObservationDownloader(api, slice_results=1000, density_period=datetime.timedelta(minutes=10))
+        plan = downloader.plan('s', START, START + datetime.timedelta(hours=2))
+
+        self.assertEqual(START, plan[0][0])
+        self.assertEqual(START + datetime.timedelta(hours=2), plan[-1][1])
+        self.assertTrue(all(a[1] == b[0] for a, b in zip(plan, plan[1:])))
+        self.assertGreaterEqual(len(plan), 8)
+
+    def test_plan_falls_back_to_fixed_slices(self):
+        api = FakeObservationApi([], aggregation=False)
+        downloader = ObservationDownloader(api, slice_duration=datetime.timedelta(days=1))
+
+        self.assertEqual(7, len(downloader.plan('s', START, START + datetime.timedelta(days=7))))
+
+    def test_iter_results_merges_in_order_without_boundary_duplicates(self):
+        timestamps = every(1, 5000)
+        api = FakeObservationApi(timestamps)
+        downloader = ObservationDownloader(api, slice_results=300, concurrency=4,
+                                           density_period=datetime.timedelta(minutes=1))
+        results = list(downloader.iter_results('s', START, START + datetime.timedelta(hours=2)))
+
+        self.assertEqual([format_timestamp(t) for t in timestamps], [r['t'] for r in results])
+        self.assertGreater(len(api.requests), 10)
+
+    def test_truncated_slices_are_split(self):
+        timestamps = every(1, 500)
+        api = FakeObservationApi(timestamps, aggregation=False)
+        downloader = ObservationDownloader(api, request_limit=100)
+        results = list(downloader.iter_results('s', START, START + datetime.timedelta(days=1)))
+
+        self.assertEqual(500, len(results))
+
+    def test_failed_slice_is_retried(self):
+        api = FakeObservationApi(every(60, 10), fail_once=True, aggregation=False)
+        downloader = ObservationDownloader(api, retry_delay=0)
+
+        self.assertEqual(10, len(list(downloader.iter_results('s', START, START + datetime.timedelta(hours=1)))))
+        self.assertEqual(2, len(api.requests))
+
+
+class FakeAggregationApi(object):
+    """Serves hourly aggregations of in-memory streams, parsed by the parser given with each call."""
+
+    def __init__(self, buckets, failures=None):
+        self.buckets = buckets
+        self.failures = dict(failures or {})
+        self.lock = threading.Lock()
+
+    def get_aggregation(self, streamid, start, end, aggperiod, parser):
+        with self.lock:
+            if self.failures.get(streamid):
+                self.failures[streamid] -= 1
+                raise SenapsError('Senaps error response: status code = 503', api_code=503)
+        results = [{'t': format_timestamp(START + datetime.timedelta(hours=h)),
+                    'v': {'avg': h + 0.5, 'min': h, 'max': h + 1, 'count': 2}} for h in self.buckets[streamid]]
+        method = type(str('Method'), (object,), {'query_params': {'streamid': streamid, 'aggperiod': aggperiod}})()
+        return parser.parse(method, json.dumps({'results': results}))
+
+
+class AggregationDownloaderTestCase(unittest.TestCase):
+
+    def test_outer_join_in_stream_order(self):
+        api = FakeAggregationApi({'b': [1, 2], 'a': [0, 2]})
+        df = AggregationDownloader(api).to_dataframe(['b', 'a'], START, START + datetime.timedelta(hours=3),
+                                                     datetime.timedelta(hours=1))
+
+        self.assertEqual(['b.avg', 'b.min', 'b.max', 'b.count', 'a.avg', 'a.min', 'a.max', 'a.count'], list(df.columns))
+        self.assertEqual('timestamp', df.index.name)
+        self.assertEqual('UTC', str(df.index.tz))
+        self.assertEqual([0, 1, 2], [t.hour for t in df.index])
+        self.assertEqual([0.5, None, 2.5], [None if v != v else v for v in df['a.avg']])
+        self.assertEqual([None, 2, 2], [None if v != v else v for v in df['b.count']])
+
+    def test_many_streams(self):
+        streamids = ['s%d' % i for i in range(200)]
+        api = FakeAggregationApi(dict((sid, [i % 24]) for i, sid in enumerate(streamids)))
+        timestamps, columns, block = AggregationDownloader(api, concurrency=16).join(
+            streamids, START, START + datetime.timedelta(days=1), 3600000)
+
+        self.assertEqual(24, len(timestamps))
+        self.assertEqual((24, 800), block.shape)
+        self.assertTrue(block.flags['F_CONTIGUOUS'])
+        counts = block[:, 3::4]
+        self.assertEqual(200, (counts == 2).sum())
+        self.assertEqual(24 * 200 - 200, (counts != counts).sum())
+
+    def test_transient_failures_are_retried(self):
+        api = FakeAggregationApi({'a': [0]}, failures={'a': 2})
+        df = AggregationDownloader(api, retry_delay=0).to_dataframe(['a'], START, START, 3600000)
+
+        self.assertEqual([2], list(df['a.count']))
+
+    def test_duplicate_streams(self):
+        with self.assertRaises(SenapsError):
+            AggregationDownloader(FakeAggregationApi({'a': [0]})).join(['a', 'a'], START, START, 3600000)
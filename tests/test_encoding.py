@@ -0,0 +1,78 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+import json
+
+import numpy as np
+
+from senaps_sensor.encoding import encode_results
+from senaps_sensor.error import SenapsError
+from senaps_sensor.models import Observation, UnivariateResult
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+TIMESTAMPS = np.array(['2016-02-15T00:00:00', '2016-02-15T00:15:00', 'NaT', '2016-02-15T00:45:00'],
+                      dtype='datetime64[ns]')
+
+
+class EncodeResultsTestCase(unittest.TestCase):
+
+    def test_scalar_matches_model_encoding(self):
+        o = Observation()
+        for i, t in enumerate([0, 15, 45]):
+            o.results.append(UnivariateResult(t=datetime.datetime(2016, 2, 15, 0, t), v={'v': float(i) + 0.5}))
+
+        encoded = json.loads(encode_results(TIMESTAMPS, np.array([0.5, 1.5, 9.0, 2.5])).decode('utf-8'))
+        self.assertEqual(o.to_state(), encoded)
+
+    def test_missing_values_are_skipped(self):
+        encoded = json.loads(encode_results(TIMESTAMPS, np.array([None, 1, 2, 3], dtype=object)).decode('utf-8'))
+
+        self.assertEqual([{'t': '2016-02-15T00:45:00.000000Z', 'v': {'v': 3.0}}], encoded['results'][1:])
+        self.assertEqual(2, len(encoded['results']))
+
+    def test_vector_values(self):
+        values = np.array([[1.0, 2.0], [np.nan, np.nan], [0.0, 0.0], [np.nan, 4.25]])
+        encoded = json.loads(encode_results(TIMESTAMPS, values).decode('utf-8'))
+
+        self.assertEqual([[1.0, 2.0], [None, 4.25]], [r['v']['v'] for r in encoded['results']])
+
+    def test_chunks_are_joined(self):
+        timestamps = np.datetime64('2016-02-15', 'ns') + np.arange(10) * np.timedelta64(1, 's')
+        encoded = json.loads(encode_results(timestamps, np.arange(10), chunk_size=3).decode('utf-8'))
+
+        self.assertEqual(list(range(10)), [r['v']['v'] for r in encoded['results']])
+
+    def test_rejects_mismatched_arrays(self):
+        with self.assertRaises(SenapsError):
+            encode_results(TIMESTAMPS, np.arange(3))
+        with self.assertRaises(SenapsError):
+            encode_results(np.arange(4), np.arange(4))
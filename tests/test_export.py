@@ -0,0 +1,161 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+import os
+import shutil
+import tempfile
+
+from senaps_sensor.error import SenapsError
+from senaps_sensor.download import ObservationDownloader
+from senaps_sensor.export import ExportJob
+from tests.test_download import FakeObservationApi, START, every
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+END = START + datetime.timedelta(days=4)
+
+
+class FailingApi(FakeObservationApi):
+    """Fails every request for slices starting on or after `fail_from`."""
+
+    def __init__(self, timestamps, fail_from):
+        super(FailingApi, self).__init__(timestamps, aggregation=False)
+        self.fail_from = fail_from
+
+    def get_observations(self, streamid, start, end, limit, sort):
+        if start >= self.fail_from:
+            raise SenapsError('Senaps error response: status code = 400')
+        return super(FailingApi, self).get_observations(streamid, start, end, limit, sort)
+
+
+class ExportJobTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.directory, 'state.json')
+        self.output_dir = os.path.join(self.directory, 'out')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def job(self, api, **kwargs):
+        return ExportJob(api, self.state_path, self.output_dir, **kwargs)
+
+    def test_export_writes_one_file_per_unit(self):
+        api = FakeObservationApi(every(3600, 96), aggregation=False)
+        summary = self.job(api).run(['a', 'b'], START, END)
+
+        self.assertEqual(8, summary['exported'])
+        self.assertEqual(4, len(os.listdir(os.path.join(self.output_dir, 'a'))))
+
+    def test_resume_skips_completed_units_and_verifies_boundary(self):
+        timestamps = every(3600, 96)
+        failing = FailingApi(timestamps, '2016-02-17')
+        with self.assertRaises(SenapsError):
+            self.job(failing, concurrency=1,
+                     downloader=ObservationDownloader(failing, retries=0)).run(['a'], START, END)
+
+        api = FakeObservationApi(timestamps, aggregation=False)
+        summary = self.job(api).run(['a'], START, END)
+
+        self.assertEqual(1, summary['skipped'])
+        self.assertEqual(1, summary['verified'])
+        self.assertEqual(2, summary['exported'])
+
+    def test_changed_boundary_is_rewritten(self):
+        self.job(FakeObservationApi(every(3600, 90), aggregation=False)).run(['a'], START, END)
+        summary = self.job(FakeObservationApi(every(3600, 96), aggregation=False)).run(['a'], START, END)
+
+        self.assertEqual(3, summary['skipped'])
+        self.assertEqual(1, summary['rewritten'])
+
+    def test_refuses_state_of_different_job(self):
+        api = FakeObservationApi([], aggregation=False)
+        self.job(api).run(['a'], START, END)
+
+        with self.assertRaises(SenapsError):
+            self.job(api).run(['a'], START, END + datetime.timedelta(days=1))
+
+
+class ExportFormatTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.directory, 'state.json')
+        self.output_dir = os.path.join(self.directory, 'out')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def export(self, api, **kwargs):
+        job = ExportJob(api, self.state_path, self.output_dir, **kwargs)
+        summary = job.run(['a'], START, START + datetime.timedelta(days=2))
+        paths = sorted(os.path.join(self.output_dir, 'a', name) for name in os.listdir(os.path.join(self.output_dir, 'a')))
+        return summary, paths
+
+    def test_parquet_row_groups(self):
+        import pyarrow.parquet as pq
+        summary, paths = self.export(FakeObservationApi(every(600, 288), aggregation=False), format='parquet',
+                                     batch_size=50)
+
+        self.assertEqual(2, summary['exported'])
+        self.assertTrue(paths[0].endswith('20160215T000000.parquet'))
+        parquet = pq.ParquetFile(paths[0])
+        self.assertEqual(3, parquet.num_row_groups)
+        self.assertEqual([50, 50, 45], [parquet.metadata.row_group(i).num_rows for i in range(3)])
+        table = parquet.read()
+        self.assertEqual(['timestamp', 'a'], table.column_names)
+        self.assertEqual('timestamp[us, tz=UTC]', str(table.schema.field('timestamp').type))
+        self.assertEqual([0.0, 1.0], table.column('a').to_pylist()[:2])
+
+    def test_csv(self):
+        import pandas as pd
+        summary, paths = self.export(FakeObservationApi(every(3600, 48), aggregation=False), format='csv', batch_size=5)
+
+        df = pd.read_csv(paths[1])
+        self.assertEqual(['timestamp', 'a'], list(df.columns))
+        self.assertEqual(24, len(df))
+        self.assertEqual('2016-02-16T00:00:00.000000Z', df['timestamp'][0])
+
+    def test_empty_slice(self):
+        import pyarrow.parquet as pq
+        summary, paths = self.export(FakeObservationApi([], aggregation=False), format='parquet')
+
+        self.assertEqual(0, pq.read_table(paths[0]).num_rows)
+
+    def test_format_is_part_of_the_job(self):
+        api = FakeObservationApi([], aggregation=False)
+        self.export(api, format='csv')
+
+        with self.assertRaises(SenapsError):
+            self.export(api)
+        with self.assertRaises(ValueError):
+            ExportJob(api, self.state_path, self.output_dir, format='xlsx')
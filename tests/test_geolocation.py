@@ -0,0 +1,136 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import json
+
+import numpy as np
+
+from senaps_sensor.error import SenapsError
+from senaps_sensor.geolocation import decode_geolocation, encode_geolocation
+from senaps_sensor.models import Observation, UnivariateResult
+from senaps_sensor.parsers import GeolocationObservationParser
+from tests.test_numpy_parser import FakeMethod
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+def geolocation_payload(points, **dumps_kwargs):
+    results = []
+    for i, coordinates in enumerate(points):
+        results.append({'t': '2016-02-15T00:%02d:00.000Z' % i, 'v': {'p': {'type': 'Point', 'coordinates': coordinates}}})
+    return json.dumps({'results': results}, **dumps_kwargs).encode('utf-8')
+
+
+POINTS = [[147.326262, -42.8840887, 50], [147.3263529, -42.8844541], [147.3232176, -42.883477, 250.5]]
+TIMESTAMPS = np.array(['2016-02-15T00:00', '2016-02-15T00:01', '2016-02-15T00:02'], dtype='datetime64[us]')
+
+
+class DecodeGeolocationTestCase(unittest.TestCase):
+
+    def assert_points(self, arrays):
+        np.testing.assert_array_equal(TIMESTAMPS, arrays.timestamps)
+        np.testing.assert_array_equal([p[0] for p in POINTS], arrays.lon)
+        np.testing.assert_array_equal([p[1] for p in POINTS], arrays.lat)
+        np.testing.assert_array_equal([50, np.nan, 250.5], arrays.alt)
+
+    def test_decode(self):
+        arrays = decode_geolocation(geolocation_payload(POINTS))
+
+        self.assert_points(arrays)
+        self.assertEqual(3, len(arrays))
+
+    def test_key_order_and_whitespace(self):
+        payload = geolocation_payload(POINTS, indent=2, sort_keys=True)
+
+        self.assert_points(decode_geolocation(payload.decode('utf-8')))
+
+    def test_results_without_points_fall_back_to_json(self):
+        payload = json.loads(geolocation_payload(POINTS).decode('utf-8'))
+        payload['results'].insert(1, {'t': '2016-02-15T00:00:30.000Z', 'v': {}})
+        arrays = decode_geolocation(json.dumps(payload).encode('utf-8'))
+
+        self.assertEqual(4, len(arrays))
+        np.testing.assert_array_equal([147.326262, np.nan, 147.3263529, 147.3232176], arrays.lon)
+        np.testing.assert_array_equal([50, np.nan, np.nan, 250.5], arrays.alt)
+
+    def test_empty(self):
+        arrays = decode_geolocation(b'{"results": []}')
+
+        self.assertEqual(0, len(arrays))
+        self.assertEqual((0,), arrays.lat.shape)
+
+    def test_malformed(self):
+        with self.assertRaises(SenapsError):
+            decode_geolocation(geolocation_payload([['east', 'south']]))
+
+
+class EncodeGeolocationTestCase(unittest.TestCase):
+
+    def test_matches_model_encoding(self):
+        o = Observation()
+        for t, coordinates in zip(TIMESTAMPS.tolist(), POINTS):
+            o.results.append(UnivariateResult(t=t, v={'p': {'type': 'Point', 'coordinates': coordinates}}))
+
+        lon, lat, alt = [np.array([p[i] if i < len(p) else np.nan for p in POINTS]) for i in range(3)]
+        encoded = json.loads(encode_geolocation(TIMESTAMPS, lon, lat, alt).decode('utf-8'))
+        self.assertEqual(o.to_state(), encoded)
+
+    def test_round_trip_without_altitude(self):
+        lon = np.array([147.5, 147.25, np.nan])
+        lat = np.array([-42.5, -42.75, -42.0])
+        arrays = decode_geolocation(encode_geolocation(TIMESTAMPS, lon, lat))
+
+        np.testing.assert_array_equal(TIMESTAMPS[:2], arrays.timestamps)
+        np.testing.assert_array_equal(lon[:2], arrays.lon)
+        np.testing.assert_array_equal(lat[:2], arrays.lat)
+        self.assertTrue(np.isnan(arrays.alt).all())
+
+    def test_mismatched_columns(self):
+        with self.assertRaises(SenapsError):
+            encode_geolocation(TIMESTAMPS, [1, 2, 3], [1, 2])
+
+
+class GeolocationObservationParserTestCase(unittest.TestCase):
+
+    def test_parse(self):
+        method = FakeMethod('g')
+        method.query_params['media'] = 'json'
+        arrays = GeolocationObservationParser().parse(method, geolocation_payload(POINTS))
+
+        np.testing.assert_array_equal([50, np.nan, 250.5], arrays.alt)
+
+    def test_single_json_stream_only(self):
+        with self.assertRaises(SenapsError):
+            GeolocationObservationParser().parse(FakeMethod('g'), b'timestamp,g\n')
+        with self.assertRaises(SenapsError):
+            GeolocationObservationParser().parse(FakeMethod('g,h'), geolocation_payload(POINTS))
+
+
+if __name__ == '__main__':
+    unittest.main()
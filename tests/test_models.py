@@ -0,0 +1,212 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+import json
+
+from senaps_sensor.api import API
+from senaps_sensor.models import IdentityMap, Location, Stream, Observation, UnivariateResult, identity_scope
+from senaps_sensor.parsers import ModelParser
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+def stream_listing(count, organisation_id='sandbox', group_id='integration_test'):
+    streams = []
+    for i in range(count):
+        streams.append({
+            'id': 'stream-%d' % i,
+            'resulttype': 'scalarvalue',
+            '_embedded': {
+                'organisation': [{'id': organisation_id}],
+                'groups': [{'id': group_id}],
+                'location': [{'id': 'integration_test'}],
+            },
+        })
+    return {'count': count, '_embedded': {'streams': streams}}
+
+
+class FakeMethod(object):
+    payload_type = 'stream'
+    payload_list = True
+
+    def __init__(self, api):
+        self.api = api
+        self.session = type(str('Session'), (object,), {'params': {}})()
+
+
+class IdentityMapTestCase(unittest.TestCase):
+
+    def parse_streams(self, api, payload):
+        return ModelParser().parse(FakeMethod(api), json.dumps(payload))
+
+    def test_disabled_by_default(self):
+        streams = self.parse_streams(API(), stream_listing(3))
+
+        self.assertIsNot(streams[0].organisations[0], streams[1].organisations[0])
+
+    def test_false_disables_identity_map(self):
+        streams = self.parse_streams(API(identity_map=False), stream_listing(2))
+
+        self.assertIsNot(streams[0].organisations[0], streams[1].organisations[0])
+
+    def test_invalid_identity_map(self):
+        with self.assertRaises(TypeError):
+            API(identity_map=object())
+        with self.assertRaises(TypeError):
+            API(identity_map='shared')
+
+    def test_per_response_identity_map(self):
+        api = API(identity_map=True)
+        first = self.parse_streams(api, stream_listing(3))
+        second = self.parse_streams(api, stream_listing(3))
+
+        self.assertIs(first[0].organisations[0], first[2].organisations[0])
+        self.assertIs(first[0].groups[0], first[1].groups[0])
+        self.assertIs(first[0].location, first[1].location)
+        self.assertIsNot(first[0].organisations[0], second[0].organisations[0])
+
+    def test_shared_identity_map(self):
+        identity_map = IdentityMap()
+        api = API(identity_map=identity_map)
+        first = self.parse_streams(api, stream_listing(2))
+        second = self.parse_streams(api, stream_listing(2))
+
+        self.assertIs(first[0].organisations[0], second[1].organisations[0])
+        # one organisation, one group and one location
+        self.assertEqual(3, len(identity_map))
+
+    def test_sparse_instance_is_refreshed_by_full_fragment(self):
+        identity_map = IdentityMap()
+        api = API(identity_map=identity_map)
+        streams = self.parse_streams(api, stream_listing(1))
+        sparse = streams[0].location
+
+        full = {'id': 'integration_test', 'description': 'Integration test location',
+                'geojson': {'type': 'Point', 'coordinates': [147.0, -42.0]},
+                '_embedded': {'organisation': [{'id': 'sandbox'}]}}
+        with identity_scope(identity_map):
+            location = Location.parse(api, full)
+
+        self.assertIs(sparse, location)
+        self.assertEqual('Integration test location', location.description)
+        self.assertEqual([147.0, -42.0], location.geojson['coordinates'])
+        self.assertIs(streams[0].organisations[0], location.organisations[0])
+
+        # a later sparse fragment does not wipe the merged fields
+        streams = self.parse_streams(api, stream_listing(1))
+        self.assertIs(location, streams[0].location)
+        self.assertEqual('Integration test location', streams[0].location.description)
+
+    def test_distinct_ids_are_not_merged(self):
+        api = API(identity_map=True)
+        payload = stream_listing(1, organisation_id='a')
+        payload['_embedded']['streams'].extend(stream_listing(1, organisation_id='b')['_embedded']['streams'])
+        streams = self.parse_streams(api, payload)
+
+        self.assertEqual(['a', 'b'], [s.organisations[0].id for s in streams])
+
+    def test_streams_are_not_shared(self):
+        streams = self.parse_streams(API(identity_map=True), stream_listing(2))
+
+        self.assertIsInstance(streams[0], Stream)
+        self.assertIsNot(streams[0], streams[1])
+
+
+class FromDataFrameTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import pandas as pd
+        index = pd.date_range('2016-02-15', periods=3, freq='15min', tz='UTC', name='timestamp')
+        self.df = pd.DataFrame({'a': [1.0, float('nan'), 3.0], 'b': [1, 2, 3]}, index=index)
+
+    def test_one_observation_per_column(self):
+        observations = Observation.from_dataframe(self.df)
+
+        self.assertEqual(['a', 'b'], sorted(observations))
+        self.assertEqual({'results': [{'t': '2016-02-15T00:00:00.000000Z', 'v': 1},
+                                      {'t': '2016-02-15T00:15:00.000000Z', 'v': 2},
+                                      {'t': '2016-02-15T00:30:00.000000Z', 'v': 3}]},
+                         json.loads(observations['b'].to_json()))
+
+    def test_nan_cells_are_dropped(self):
+        results = Observation.from_dataframe(self.df)['a'].results
+
+        self.assertEqual(2, len(results))
+        self.assertEqual(['2016-02-15T00:00:00.000000Z', '2016-02-15T00:30:00.000000Z'], [r.t for r in results])
+        self.assertIsInstance(results[-1], UnivariateResult)
+        self.assertEqual(3.0, results[-1].v)
+
+    def test_timezones_are_converted_to_utc(self):
+        df = self.df.tz_convert('Australia/Hobart')
+        observations = Observation.from_dataframe(df)
+
+        self.assertEqual('2016-02-15T00:00:00.000000Z', observations['b'].results[0].t)
+
+    def test_matches_univariate_result_formatting(self):
+        df = self.df.tz_localize(None)
+        expected = UnivariateResult(t=datetime.datetime(2016, 2, 15), v=1).to_state()['t']
+
+        self.assertEqual(expected, Observation.from_dataframe(df)['b'].results[0].t)
+
+    def test_results_slice_like_a_list(self):
+        results = Observation.from_dataframe(self.df)['b'].results
+
+        self.assertEqual([2, 3], [r.v for r in results[1:]])
+        self.assertEqual([3, 2, 1], [r.v for r in results[::-1]])
+        self.assertEqual(0, len(results[5:]))
+        with self.assertRaises(IndexError):
+            results[3]
+
+    def test_results_compare_equal_to_a_list(self):
+        results = Observation.from_dataframe(self.df)['b'].results
+        expected = [UnivariateResult(t=datetime.datetime(2016, 2, 15, 0, 15 * i), v=i + 1) for i in range(3)]
+
+        self.assertEqual(expected, results)
+        self.assertEqual(results, expected)
+        self.assertNotEqual(expected[:2], results)
+        self.assertEqual(results[:2], Observation.from_dataframe(self.df)['b'].results[:2])
+
+    def test_results_concatenate_with_lists(self):
+        results = Observation.from_dataframe(self.df)['b'].results
+        extra = UnivariateResult(t='2016-02-15T00:45:00.000000Z', v=4)
+
+        self.assertEqual([1, 2, 3, 4], [r.v for r in results + [extra]])
+        self.assertEqual([4, 1, 2, 3], [r.v for r in [extra] + results])
+        self.assertIsInstance([] + results, list)
+
+    def test_append_falls_back_to_a_list(self):
+        observation = Observation.from_dataframe(self.df)['b']
+        observation.results.append(UnivariateResult(t=datetime.datetime(2016, 2, 15, 0, 45), v=4))
+        observation.results.extend([UnivariateResult(t=datetime.datetime(2016, 2, 15, 1), v=5)])
+
+        self.assertEqual([1, 2, 3, 4, 5], [r.v for r in observation.results])
+        self.assertEqual('2016-02-15T01:00:00.000000Z', json.loads(observation.to_json())['results'][-1]['t'])
+        del observation.results[0]
+        self.assertEqual(4, len(observation.results))
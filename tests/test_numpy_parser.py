@@ -0,0 +1,181 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from senaps_sensor.arrays import bin_coordinates, group_columns, is_regularly_binned
+from senaps_sensor.error import SenapsError
+from senaps_sensor.models import Stream, StreamMetaData, StreamMetaDataType
+from senaps_sensor.parsers import NumpyObservationParser
+from tests.test_csv_parser import FakeMethod, PAYLOAD
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+T0 = np.datetime64('2016-02-15T00:00:00', 'ns')
+T1 = np.datetime64('2016-02-15T00:15:00.5', 'ns')
+
+
+class GroupColumnsTestCase(unittest.TestCase):
+
+    def test_requested_order_and_vector_index_order(self):
+        columns = ['b', 'v[10]', 'v[2]', 'a', 'v[0]']
+        groups = group_columns(columns, ['a', 'v', 'b', 'missing'])
+
+        self.assertEqual(['a', 'v', 'b'], list(groups))
+        self.assertEqual(3, groups['a'])
+        self.assertEqual([4, 2, 1], groups['v'])
+
+
+def binned_stream(streamid, start, end, step):
+    stream = Stream()
+    stream.id = streamid
+    stream.metadata = StreamMetaData()
+    stream.metadata.start, stream.metadata.end, stream.metadata.step = start, end, step
+    return stream
+
+
+class BinCoordinatesTestCase(unittest.TestCase):
+
+    def test_end_is_included(self):
+        np.testing.assert_allclose([400, 410, 420], bin_coordinates(binned_stream('s', 400, 420, 10)))
+
+    def test_float_steps(self):
+        coordinates = bin_coordinates(binned_stream('s', 0.1, 0.4, 0.1).metadata)
+
+        self.assertEqual(4, len(coordinates))
+        np.testing.assert_allclose([0.1, 0.2, 0.3, 0.4], coordinates)
+
+    def test_observed_count(self):
+        np.testing.assert_allclose([0, 0.5], bin_coordinates(binned_stream('s', 0, 10, 0.5), 2))
+
+    def test_not_binned(self):
+        self.assertFalse(is_regularly_binned(Stream()))
+        self.assertFalse(is_regularly_binned(None))
+        with self.assertRaises(SenapsError):
+            bin_coordinates(StreamMetaData())
+
+        metadata = StreamMetaData()
+        metadata.type = StreamMetaDataType.regularly_binned_vector
+        self.assertTrue(is_regularly_binned(metadata))
+
+
+class NumpyObservationParserTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.parser = NumpyObservationParser()
+
+    def test_csv(self):
+        arrays = self.parser.parse(FakeMethod('v,a'), PAYLOAD)
+
+        self.assertEqual(['v', 'a'], list(arrays))
+        np.testing.assert_array_equal([T0, T1], arrays.timestamps)
+        self.assertEqual(np.dtype('datetime64[ns]'), arrays.timestamps.dtype)
+        np.testing.assert_array_equal([[1, 2], [3, 4]], arrays['v'])
+        np.testing.assert_array_equal([np.nan, 1.5], arrays['a'])
+        self.assertTrue(arrays['v'].flags['C_CONTIGUOUS'])
+
+    def test_csv_without_results(self):
+        arrays = self.parser.parse(FakeMethod('a'), b'timestamp,a\n')
+
+        self.assertEqual(0, len(arrays.timestamps))
+        self.assertEqual((0,), arrays['a'].shape)
+
+    def test_csv_missing_header(self):
+        with self.assertRaises(SenapsError):
+            self.parser.parse(FakeMethod('a'), b'# nothing here\n')
+
+    def test_json_single_stream(self):
+        method = FakeMethod('v')
+        method.query_params['media'] = 'json'
+        payload = json.dumps({'results': [{'t': '2016-02-15T00:00:00.000Z', 'v': {'v': [1, None]}},
+                                          {'t': '2016-02-15T00:15:00.500Z', 'v': {'v': [3, 4]}}]})
+        arrays = self.parser.parse(method, payload.encode('utf-8'))
+
+        np.testing.assert_array_equal([T0, T1], arrays.timestamps)
+        np.testing.assert_array_equal([[1, np.nan], [3, 4]], arrays['v'])
+
+    def test_json_multiple_streams(self):
+        method = FakeMethod('b,a')
+        method.query_params['media'] = 'json'
+        payload = json.dumps({'results': [{'t': '2016-02-15T00:00:00.000Z', 'v': {'a': {'v': 1}}},
+                                          {'t': '2016-02-15T00:15:00.500Z', 'v': {'a': {'v': 2}, 'b': {'v': 3}}}]})
+        arrays = self.parser.parse(method, payload)
+
+        self.assertEqual(['b', 'a'], list(arrays))
+        np.testing.assert_array_equal([np.nan, 3], arrays['b'])
+        np.testing.assert_array_equal([1, 2], arrays['a'])
+
+    def test_regularly_binned_coordinates(self):
+        parser = NumpyObservationParser(streams=[binned_stream('v', 400, 700, 300)])
+        arrays = parser.parse(FakeMethod('a,v'), PAYLOAD)
+
+        self.assertEqual(['v'], list(arrays.coordinates))
+        np.testing.assert_array_equal([400, 700], arrays.coordinates['v'])
+        self.assertEqual((2, 2), arrays['v'].shape)
+
+    def test_regularly_binned_without_observations(self):
+        method = FakeMethod('v')
+        method.query_params['media'] = 'json'
+        parser = NumpyObservationParser(streams={'v': binned_stream('v', 0, 2, 1).metadata})
+        arrays = parser.parse(method, b'{"results": []}')
+
+        self.assertEqual((0, 3), arrays['v'].shape)
+        np.testing.assert_array_equal([0, 1, 2], arrays.coordinates['v'])
+
+    def test_json_vectors_are_dense(self):
+        method = FakeMethod('v')
+        method.query_params['media'] = 'json'
+        payload = json.dumps({'results': [{'t': '2016-02-15T00:00:00.000Z', 'v': {'v': [1]}},
+                                          {'t': '2016-02-15T00:15:00.000Z', 'v': {}},
+                                          {'t': '2016-02-15T00:30:00.000Z', 'v': {'v': [3, 4]}}]})
+        values = self.parser.parse(method, payload)['v']
+
+        np.testing.assert_array_equal([[1, np.nan], [np.nan, np.nan], [3, 4]], values)
+        self.assertTrue(values.flags['C_CONTIGUOUS'])
+
+    def test_aggregation(self):
+        method = FakeMethod('a')
+        method.query_params['aggperiod'] = '900000'
+        payload = json.dumps({'results': [{'t': '2016-02-15T00:00:00.000Z',
+                                           'v': {'avg': 1.5, 'min': 1, 'max': 2, 'count': 2}}]})
+        arrays = self.parser.parse(method, payload)
+
+        self.assertEqual(['a.avg', 'a.min', 'a.max', 'a.count'], list(arrays))
+        np.testing.assert_array_equal([2], arrays['a.count'])
+
+    def test_does_not_import_pandas(self):
+        code = ('import sys; from senaps_sensor.parsers import NumpyObservationParser; '
+                'NumpyObservationParser().parse(type("M", (), {"query_params": {"media": "csv", "streamid": "a,v"}})(), '
+                '%r); print("pandas" in sys.modules)' % PAYLOAD)
+        self.assertEqual(b'False', subprocess.check_output([sys.executable, '-c', code]).strip())
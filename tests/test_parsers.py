@@ -335,7 +335,7 @@ class ParsersTestCase(SensorApiTestCase):
                          [pd.to_datetime('2016-02-15 01:00:00+00:00'), 6.5, 5.0, 8.0, 4],
                          [pd.to_datetime('2016-02-15 02:00:00+00:00'), 10.0, 9.0, 11.0, 3]]
         expected_columns = ['timestamp',s.id+'.avg', s.id+'.min', s.id+'.max', s.id+'.count']
-        expected_df = pd.DataFrame(expected_data, columns=expected_columns)
+        expected_df = pd.DataFrame(expected_data, columns=expected_columns).set_index('timestamp')
         print('expected dataframe')
         print(expected_df)
 
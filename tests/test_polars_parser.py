@@ -0,0 +1,89 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import json
+
+import polars as pl
+
+from senaps_sensor.parsers import PolarsObservationParser
+from tests.test_csv_parser import FakeMethod, PAYLOAD
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+TIMESTAMP = pl.Datetime('us', 'UTC')
+
+
+class PolarsObservationParserTestCase(unittest.TestCase):
+
+    def test_csv(self):
+        df = PolarsObservationParser().parse(FakeMethod('a,v'), PAYLOAD)
+
+        self.assertEqual(['timestamp', 'a', 'v[0]', 'v[1]'], df.columns)
+        self.assertEqual(TIMESTAMP, df.schema['timestamp'])
+        self.assertEqual(pl.Float64, df.schema['a'])
+        self.assertEqual([None, 1.5], df['a'].to_list())
+        self.assertEqual([1, 3], df['v[0]'].to_list())
+
+    def test_lazy(self):
+        lf = PolarsObservationParser(lazy=True).parse(FakeMethod('v,a'), PAYLOAD)
+
+        self.assertIsInstance(lf, pl.LazyFrame)
+        self.assertEqual(['timestamp', 'v[0]', 'v[1]', 'a'], lf.collect().columns)
+
+    def test_json(self):
+        method = FakeMethod('v,b')
+        method.query_params['media'] = 'json'
+        payload = json.dumps({'results': [
+            {'t': '2016-02-15T00:00:00.000Z', 'v': {'v': {'v': [1, 2]}}},
+            {'t': '2016-02-15T00:15:00.500Z', 'v': {'b': {'v': 3}}}]})
+        df = PolarsObservationParser().parse(method, payload.encode('utf-8'))
+
+        self.assertEqual(['timestamp', 'v[0]', 'v[1]', 'b'], df.columns)
+        self.assertEqual(TIMESTAMP, df.schema['timestamp'])
+        self.assertEqual([2.0, None], df['v[1]'].to_list())
+        self.assertEqual([None, 3.0], df['b'].to_list())
+
+    def test_matches_pandas_parser(self):
+        from pandas.testing import assert_frame_equal
+        from senaps_sensor.parsers import PandasObservationParser
+
+        expected = PandasObservationParser(engine='c').parse(FakeMethod('v,a'), PAYLOAD)
+        actual = PolarsObservationParser().parse(FakeMethod('v,a'), PAYLOAD).to_pandas().set_index('timestamp')
+        assert_frame_equal(expected, actual)
+
+    def test_aggregation(self):
+        method = FakeMethod('a')
+        method.query_params['aggperiod'] = '900000'
+        payload = json.dumps({'results': [{'t': '2016-02-15T00:00:00.000Z',
+                                           'v': {'avg': 1.5, 'min': 1, 'max': 2, 'count': 2}}]})
+        df = PolarsObservationParser().parse(method, payload)
+
+        self.assertEqual(['timestamp', 'a.avg', 'a.min', 'a.max', 'a.count'], df.columns)
+        self.assertEqual(pl.Int64, df.schema['a.count'])
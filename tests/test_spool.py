@@ -0,0 +1,190 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+import os
+import shutil
+import tempfile
+import time
+
+from senaps_sensor.error import SpoolFullError
+from senaps_sensor.spool import Spool
+from senaps_sensor.upload import BulkUploader
+from senaps_sensor.writer import ObservationWriter
+from tests.test_upload import FakeIngestApi
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+def states(count, offset=0):
+    return [{'t': '2016-02-15T00:00:%02d.000000Z' % (offset + i), 'v': {'v': offset + i}} for i in range(count)]
+
+
+class SpoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def segments(self):
+        return sorted(os.listdir(self.directory))
+
+    def test_acknowledged_segments_are_removed(self):
+        spool = Spool(self.directory, segment_size=150)
+        first = spool.append('a', states(2))
+        second = spool.append('a', states(2, 2))
+        self.assertNotEqual(first, second)
+        self.assertEqual(2, len(self.segments()))
+
+        spool.ack(first, 2)
+        self.assertEqual(['%012d.seg' % second], self.segments())
+        spool.ack(second, 2)
+        spool.close()
+        self.assertEqual([], self.segments())
+
+    def test_disk_usage_is_bounded(self):
+        spool = Spool(self.directory, segment_size=150, max_size=200)
+        spool.append('a', states(2))
+        with self.assertRaises(SpoolFullError):
+            spool.append('a', states(2, 2))
+        spool.close()
+
+    def test_unacknowledged_segments_are_recovered(self):
+        spool = Spool(self.directory, segment_size=150, fsync_interval=0)
+        acknowledged = spool.append('a', states(2))
+        spool.append('b', states(2, 2))
+        spool.ack(acknowledged, 2)
+        # no close(), as if the process had crashed
+
+        recovered = Spool(self.directory)
+        self.assertEqual(1, len(recovered.recovered()))
+        segment = recovered.recovered()[0]
+        self.assertEqual([('b', states(2, 2))], recovered.load(segment))
+
+        recovered.ack(segment, 2)
+        recovered.close()
+        self.assertEqual([], self.segments())
+
+    def test_sync_due_fsyncs_after_appends_stop(self):
+        spool = CountingSpool(self.directory, fsync_interval=0.05)
+        spool.append('a', states(1))
+        spool.sync_due()
+        self.assertEqual(0, spool.syncs)
+
+        time.sleep(0.06)
+        spool.sync_due()
+        spool.sync_due()
+        self.assertEqual(1, spool.syncs)
+        spool.close()
+
+    def test_torn_record_ends_segment(self):
+        spool = Spool(self.directory)
+        spool.append('a', states(1))
+        spool.append('a', states(1, 1))
+        spool.close()
+        path = os.path.join(self.directory, self.segments()[0])
+        with open(path, 'rb') as fp:
+            data = fp.read()
+        with open(path, 'wb') as fp:
+            fp.write(data[:-5])
+
+        recovered = Spool(self.directory)
+        self.assertEqual([('a', states(1))], recovered.load(recovered.recovered()[0]))
+        recovered.close()
+
+
+class CountingSpool(Spool):
+
+    syncs = 0
+
+    def _sync(self):
+        self.syncs += 1
+        super(CountingSpool, self)._sync()
+
+
+class SpooledWriterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def append(self, writer, count):
+        for i in range(count):
+            writer.append('a', datetime.datetime(2016, 2, 15, 0, 0, i), {'v': i})
+
+    def test_uploaded_results_are_acknowledged(self):
+        api = FakeIngestApi()
+        with ObservationWriter(api, batch_size=10, max_age=60, spool=Spool(self.directory)) as writer:
+            self.append(writer, 25)
+
+        self.assertEqual(25, len(api.uploaded['a']))
+        self.assertEqual([], os.listdir(self.directory))
+
+    def test_transient_failures_are_requeued(self):
+        api = FakeIngestApi({'2016-02-15T00:00:10.000000Z': [503, 503, 503]})
+        uploader = BulkUploader(api, max_results=10, retries=0)
+        writer = ObservationWriter(api, batch_size=10, max_age=60, uploader=uploader, spool=Spool(self.directory),
+                                   retry_delay=0.01)
+        self.append(writer, 25)
+        self.assertTrue(writer.flush(timeout=5))
+        writer.close()
+
+        self.assertEqual(0, writer.failed)
+        self.assertEqual(6, api.calls)
+        self.assertEqual(list(range(25)), sorted(r['v']['v'] for r in api.uploaded['a']))
+        self.assertEqual([], os.listdir(self.directory))
+
+    def test_writer_fsyncs_idle_spool(self):
+        spool = CountingSpool(self.directory, fsync_interval=0.05)
+        writer = ObservationWriter(FakeIngestApi(), batch_size=10, max_age=0.05, spool=spool)
+        self.append(writer, 1)
+
+        deadline = time.time() + 5
+        while not spool.syncs and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(1, spool.syncs)
+        writer.close()
+
+    def test_failed_results_are_replayed(self):
+        failing = FakeIngestApi({'2016-02-15T00:00:10.000000Z': [400]})
+        with ObservationWriter(failing, batch_size=10, max_age=60, spool=Spool(self.directory)) as writer:
+            self.append(writer, 25)
+        self.assertEqual(15, len(failing.uploaded['a']))
+        self.assertEqual(1, len(os.listdir(self.directory)))
+
+        api = FakeIngestApi()
+        with ObservationWriter(api, batch_size=10, max_age=60, spool=Spool(self.directory)) as writer:
+            writer.flush(timeout=5)
+
+        self.assertEqual(list(range(25)), sorted(r['v']['v'] for r in api.uploaded['a']))
+        self.assertEqual([], os.listdir(self.directory))
@@ -0,0 +1,220 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+import gc
+import io
+import json
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from senaps_sensor.api import API
+from senaps_sensor.auth import HTTPBasicAuth
+from senaps_sensor.error import SenapsError
+from senaps_sensor.parsers import StreamingObservationParser
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+def results_payload(count, value=lambda i: {'v': i}):
+    results = [{'t': '2016-02-15T00:%02d:00.000Z' % (i % 60), 'v': value(i)} for i in range(count)]
+    return json.dumps({'results': results}).encode('utf-8')
+
+
+class FakeMethod(object):
+
+    def __init__(self, streamid, **query_params):
+        self.query_params = dict(query_params, streamid=streamid)
+
+
+class CountingReader(io.BytesIO):
+    """A response body that records how much of it has been read."""
+
+    def __init__(self, data):
+        io.BytesIO.__init__(self, data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = io.BytesIO.read(self, size)
+        self.bytes_read += len(data)
+        return data
+
+
+class StreamingObservationParserTestCase(unittest.TestCase):
+
+    def parse(self, payload, streamid='a', parser=None, **query_params):
+        parser = parser or StreamingObservationParser()
+        return parser.parse(FakeMethod(streamid, **query_params), payload)
+
+    def test_scalar_stream(self):
+        results = list(self.parse(results_payload(2, lambda i: {'v': i + 0.5})))
+
+        self.assertEqual([(datetime.datetime(2016, 2, 15, 0, 0), 0.5),
+                          (datetime.datetime(2016, 2, 15, 0, 1), 1.5)], results)
+        self.assertIsInstance(results[0][1], float)
+
+    def test_vector_stream(self):
+        results = list(self.parse(results_payload(2, lambda i: {'v': [i, None, 2.5]})))
+
+        self.assertEqual([[0, None, 2.5], [1, None, 2.5]], [v for _, v in results])
+
+    def test_several_streams(self):
+        payload = results_payload(2, lambda i: {'a': {'v': i}, 'b': {'v': [i, i]}} if i else {'b': {'v': [0, 0]}})
+        results = list(self.parse(payload, streamid='a,b'))
+
+        self.assertEqual([{'b': [0, 0]}, {'a': 1, 'b': [1, 1]}], [v for _, v in results])
+
+    def test_aggregation(self):
+        payload = results_payload(1, lambda i: {'avg': 1.5, 'min': 1, 'max': 2, 'count': 2})
+        results = list(self.parse(payload, aggperiod=3600000))
+
+        self.assertEqual([{'avg': 1.5, 'min': 1, 'max': 2, 'count': 2}], [v for _, v in results])
+
+    def test_unparsed_timestamps(self):
+        results = self.parse('{"results": [{"t": "2016-02-15T00:00:00.000Z", "v": {"v": 1}}]}',
+                             parser=StreamingObservationParser(parse_timestamps=False))
+
+        self.assertEqual([('2016-02-15T00:00:00.000Z', 1)], list(results))
+
+    def test_empty_response(self):
+        self.assertEqual([], list(self.parse(b'{"results": []}')))
+        self.assertEqual([], list(self.parse(b'{"count": 0}')))
+
+    def test_results_are_read_lazily(self):
+        payload = CountingReader(results_payload(100000))
+        results = self.parse(payload)
+
+        self.assertEqual(0, payload.bytes_read)
+        self.assertEqual(0, next(results)[1])
+        self.assertLess(payload.bytes_read, len(payload.getvalue()) // 10)
+
+        results.close()
+        self.assertTrue(payload.closed)
+
+    def test_unstarted_results_release_payload(self):
+        payload = CountingReader(results_payload(3))
+        results = self.parse(payload)
+        results.close()
+        self.assertTrue(payload.closed)
+
+        payload = CountingReader(results_payload(3))
+        with self.parse(payload):
+            pass
+        self.assertTrue(payload.closed)
+
+        payload = CountingReader(results_payload(3))
+        self.parse(payload)
+        gc.collect()
+        self.assertTrue(payload.closed)
+
+    def test_payload_is_closed_when_exhausted(self):
+        payload = CountingReader(results_payload(3))
+        self.assertEqual(3, len(list(self.parse(payload))))
+        self.assertTrue(payload.closed)
+
+    def test_malformed_payload(self):
+        results = self.parse(b'{"results": [{"t": "2016-02-15T00:00:00.000Z", "v": {"v": 1}}, {"t"')
+
+        self.assertEqual(1, next(results)[1])
+        with self.assertRaises(SenapsError):
+            next(results)
+
+    def test_csv_is_not_supported(self):
+        with self.assertRaises(SenapsError):
+            self.parse(b'timestamp,a\n', media='csv')
+
+
+class StreamedResponseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.first_result_read = threading.Event()
+        test = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                self.write_chunk(b'{"results": [{"t": "2016-02-15T00:00:00.000Z", "v": {"v": 1}}')
+                # the rest of the body is only sent once the client has seen the first result
+                if not test.first_result_read.wait(2):
+                    return
+                self.write_chunk(b', {"t": "2016-02-15T00:15:00.000Z", "v": {"v": 2}}]}')
+                self.write_chunk(b'')
+
+            def write_chunk(self, data):
+                self.wfile.write(('%x\r\n' % len(data)).encode('ascii') + data + b'\r\n')
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tearDown(self):
+        self.first_result_read.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_results_are_yielded_as_they_arrive(self):
+        api = API(HTTPBasicAuth('user', 'password'), host='127.0.0.1:%d' % self.server.server_port,
+                  protocol='http', timeout=5)
+        results = api.get_observations(streamid='a', parser=StreamingObservationParser())
+
+        self.assertEqual(1, next(results)[1])
+        self.first_result_read.set()
+        self.assertEqual([2], [v for _, v in results])
+
+    def test_duck_typed_parser(self):
+        class TextParser(object):
+            def parse(self, method, payload):
+                return payload
+
+            def parse_error(self, payload):
+                return payload, None
+
+        self.first_result_read.set()
+        api = API(HTTPBasicAuth('user', 'password'), host='127.0.0.1:%d' % self.server.server_port,
+                  protocol='http', timeout=5)
+        payload = api.get_observations(streamid='a', parser=TextParser())
+
+        self.assertEqual(2, len(json.loads(payload)['results']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+
+from senaps_sensor.sync import StreamSync
+from senaps_sensor.upload import BulkUploader
+from senaps_sensor.timestamps import format_timestamp
+from tests.test_upload import FakeIngestApi, make_results
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+class FakeSyncApi(FakeIngestApi):
+    """FakeIngestApi that also answers latest-observation queries from what has been uploaded."""
+
+    def __init__(self, stored):
+        super(FakeSyncApi, self).__init__()
+        for streamid, count in stored.items():
+            self.uploaded[streamid] = [{'t': format_timestamp(r.t), 'v': r.v} for r in make_results(count)]
+        self.queries = []
+
+    def get_observations(self, streamid, limit, sort):
+        self.queries.append((streamid, limit, sort))
+        results = sorted(self.uploaded.get(streamid, []), key=lambda r: r['t'], reverse=True)
+        return {'results': results[:limit]}
+
+
+class StreamSyncTestCase(unittest.TestCase):
+
+    def test_uploads_only_newer_results(self):
+        api = FakeSyncApi({'a': 30, 'b': 0})
+        deltas = StreamSync(api, BulkUploader(api, max_results=10)).sync({'a': make_results(50),
+                                                                           'b': make_results(5),
+                                                                           'c': make_results(3)})
+
+        self.assertEqual([(20, 50), (5, 5), (3, 3)], [(deltas[s].new, deltas[s].total) for s in 'abc'])
+        self.assertEqual(datetime.datetime(2016, 2, 15, 0, 0, 29), deltas['a'].latest)
+        self.assertIsNone(deltas['c'].latest)
+        self.assertEqual(20, deltas['a'].summary.accepted)
+        self.assertEqual(50, len(api.uploaded['a']))
+        self.assertEqual(len(set(r['t'] for r in api.uploaded['a'])), 50)
+        self.assertEqual([('a', 1, 'descending')], [q for q in api.queries if q[0] == 'a'])
+
+    def test_dry_run_uploads_nothing(self):
+        api = FakeSyncApi({'a': 30})
+        deltas = StreamSync(api, dry_run=True).sync({'a': make_results(50)})
+
+        self.assertEqual(20, deltas['a'].new)
+        self.assertIsNone(deltas['a'].summary)
+        self.assertEqual(30, len(api.uploaded['a']))
+
+    def test_dataframe_columns(self):
+        import pandas as pd
+        index = pd.date_range('2016-02-15 10:00', periods=50, freq='s', tz='Australia/Brisbane', name='timestamp')
+        df = pd.DataFrame({'a': range(50), 'b': [float('nan')] * 45 + [1.0] * 5}, index=index)
+        api = FakeSyncApi({'a': 30})
+        deltas = StreamSync(api).sync(df)
+
+        self.assertEqual((20, 50), (deltas['a'].new, deltas['a'].total))
+        self.assertEqual((5, 5), (deltas['b'].new, deltas['b'].total))
+        self.assertEqual('2016-02-15T00:00:30.000000Z', sorted(r['t'] for r in api.uploaded['a'])[30])
+        self.assertEqual(50, len(api.uploaded['a']))
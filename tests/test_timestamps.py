@@ -0,0 +1,87 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+
+import numpy as np
+
+from senaps_sensor import timestamps
+from senaps_sensor.timestamps import format_datetime64, format_timestamp, parse_datetime64, parse_timestamp
+
+import six
+
+if six.PY3:
+    import unittest
+    UTC_INFO = datetime.timezone.utc
+else:
+    import unittest2 as unittest
+    import pytz
+    UTC_INFO = pytz.utc
+
+
+class ScalarTimestampTestCase(unittest.TestCase):
+
+    def test_format_matches_strftime(self):
+        for dt in [datetime.datetime(2016, 2, 15), datetime.datetime(2016, 2, 15, 23, 59, 59, 999999),
+                   datetime.datetime(1970, 1, 1, 0, 0, 0, 1)]:
+            self.assertEqual(dt.strftime(timestamps.TIMESTAMP_FORMAT), format_timestamp(dt))
+
+    def test_format_converts_to_utc(self):
+        dt = datetime.datetime(2016, 2, 15, 10, tzinfo=UTC_INFO) + datetime.timedelta(hours=-10)
+        self.assertEqual('2016-02-15T00:00:00.000000Z', format_timestamp(dt))
+
+    def test_parse(self):
+        expected = datetime.datetime(2016, 2, 15, 0, 0, 1, 500000)
+        for string in ['2016-02-15T00:00:01.5Z', '2016-02-15T00:00:01.500Z', '2016-02-15T00:00:01.500000Z',
+                       '2016-02-15T00:00:01.500+00:00', '2016-02-15T00:00:01.500000']:
+            self.assertEqual(expected, parse_timestamp(string))
+        self.assertEqual(datetime.datetime(2016, 2, 15), parse_timestamp('2016-02-15T00:00:00Z'))
+
+    def test_cached_fallback(self):
+        timestamps._parse_cache.clear()
+        self.assertEqual(datetime.datetime(2016, 2, 15, 0, 0, 1, 500000),
+                         timestamps._parse_timestamp('2016-02-15T00:00:01.5Z'))
+        self.assertEqual(datetime.datetime(2016, 2, 15, 0, 0, 1, 250),
+                         timestamps._parse_timestamp('2016-02-15T00:00:01.000250Z'))
+        self.assertEqual(1, len(timestamps._parse_cache))
+        with self.assertRaises(ValueError):
+            timestamps._parse_timestamp('2016-02-15T00:00:01.5+10:00')
+
+
+class VectorisedTimestampTestCase(unittest.TestCase):
+
+    def test_round_trip(self):
+        values = np.datetime64('2016-02-15', 'us') + np.arange(5) * np.timedelta64(1500001, 'us')
+        strings = format_datetime64(values)
+
+        self.assertEqual('2016-02-15T00:00:01.500001Z', strings[1])
+        self.assertEqual([format_timestamp(v) for v in values.tolist()], strings.tolist())
+        np.testing.assert_array_equal(values, parse_datetime64(strings))
+
+    def test_parse_mixed_formats(self):
+        parsed = parse_datetime64(['2016-02-15T00:00:00.5Z', '2016-02-15T00:00:01+00:00', ''])
+
+        self.assertEqual(np.datetime64('2016-02-15T00:00:00.500000'), parsed[0])
+        self.assertEqual(np.datetime64('2016-02-15T00:00:01.000000'), parsed[1])
+        self.assertTrue(np.isnat(parsed[2]))
@@ -0,0 +1,164 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+import json
+import threading
+
+from senaps_sensor.error import SenapsError
+from senaps_sensor.models import Observation, UnivariateResult
+from senaps_sensor.upload import BulkUploader
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+class FakeResponse(object):
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeIngestApi(object):
+    """Records create_observations calls; `failures` maps a batch's first 't' to the status codes to fail with."""
+
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.uploaded = {}
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def create_observations(self, streamid, results=None, post_data=None, use_json=True, headers=None):
+        if post_data is not None:
+            assert not use_json and headers['Content-Type'] == 'application/json'
+            results = json.loads(post_data.decode('utf-8'))['results']
+        with self.lock:
+            self.calls += 1
+            codes = self.failures.get(results[0]['t'])
+            if codes:
+                raise SenapsError('Senaps error response', FakeResponse(codes.pop(0)))
+            json.dumps(results)  # payload must be JSON serialisable
+            self.uploaded.setdefault(streamid, []).extend(results)
+        return {'message': 'Observations uploaded'}
+
+
+def make_results(count):
+    base = datetime.datetime(2016, 2, 15)
+    return [UnivariateResult(t=base + datetime.timedelta(seconds=i), v={'v': float(i)}) for i in range(count)]
+
+
+class BulkUploaderTestCase(unittest.TestCase):
+
+    def test_batches_respect_count_and_size(self):
+        uploader = BulkUploader(None, max_results=100, max_bytes=2000)
+        batches = list(uploader.batches(make_results(1000)))
+
+        self.assertEqual(1000, sum(len(b) for b in batches))
+        for batch in batches:
+            self.assertLessEqual(len(batch), 100)
+            self.assertLessEqual(len(json.dumps(batch)), 2000)
+
+    def test_upload_accepts_results_dicts_and_observations(self):
+        api = FakeIngestApi()
+        uploader = BulkUploader(api, max_results=10, concurrency=3)
+        observation = Observation()
+        observation.results = make_results(25)
+
+        summary = uploader.upload('a', make_results(95))
+        uploader.upload('b', observation)
+        uploader.upload('c', ({'t': '2016-02-15T00:00:00.000Z', 'v': {'v': i}} for i in range(5)))
+
+        self.assertTrue(summary.ok)
+        self.assertEqual(95, summary.accepted)
+        self.assertEqual(10, summary.batches)
+        self.assertEqual(['2016-02-15T00:00:00.000000Z', '2016-02-15T00:00:01.000000Z'],
+                         sorted(r['t'] for r in api.uploaded['a'])[:2])
+        self.assertEqual(25, len(api.uploaded['b']))
+        self.assertEqual(5, len(api.uploaded['c']))
+
+    def test_transient_failures_are_retried(self):
+        api = FakeIngestApi({'2016-02-15T00:00:10.000000Z': [503, 429]})
+        summary = BulkUploader(api, max_results=10, retry_delay=0).upload('a', make_results(30))
+
+        self.assertTrue(summary.ok)
+        self.assertEqual(30, summary.accepted)
+        self.assertEqual(5, api.calls)
+
+    def test_failed_batches_are_reported(self):
+        api = FakeIngestApi({'2016-02-15T00:00:10.000000Z': [400]})
+        summary = BulkUploader(api, max_results=10, retry_delay=0).upload('a', make_results(30))
+
+        self.assertFalse(summary.ok)
+        self.assertEqual(20, summary.accepted)
+        self.assertEqual(1, len(summary.failed_batches))
+        self.assertEqual(1, summary.failed_batches[0].index)
+        self.assertEqual(10, summary.failed)
+
+
+class UploadArraysTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import numpy
+        self.numpy = numpy
+        self.timestamps = numpy.datetime64('2016-02-15T00:00:00', 'ns') + numpy.arange(95) * numpy.timedelta64(1, 's')
+
+    def test_upload_scalar_arrays(self):
+        values = self.numpy.arange(95, dtype=float)
+        values[3] = self.numpy.nan
+        api = FakeIngestApi()
+        summary = BulkUploader(api, max_results=10).upload_arrays('a', self.timestamps, values)
+
+        self.assertTrue(summary.ok)
+        self.assertEqual(94, summary.accepted)
+        self.assertEqual(10, summary.batches)
+        uploaded = sorted(api.uploaded['a'], key=lambda r: r['t'])
+        self.assertEqual({'t': '2016-02-15T00:00:00.000000Z', 'v': {'v': 0.0}}, uploaded[0])
+        self.assertNotIn(3.0, [r['v']['v'] for r in uploaded])
+
+    def test_failed_array_batches_keep_their_rows(self):
+        api = FakeIngestApi({'2016-02-15T00:00:10.000000Z': [400]})
+        summary = BulkUploader(api, max_results=10).upload_arrays('a', self.timestamps, self.numpy.arange(95))
+
+        self.assertEqual(85, summary.accepted)
+        self.assertEqual(10, len(summary.failed_batches[0].results))
+        self.assertEqual(self.timestamps[10], summary.failed_batches[0].results.timestamps[0])
+
+    def test_upload_geolocation(self):
+        lon = self.numpy.linspace(147, 148, 95)
+        lat = self.numpy.full(95, -42.5)
+        alt = self.numpy.full(95, self.numpy.nan)
+        alt[0] = 12.5
+        api = FakeIngestApi()
+        summary = BulkUploader(api, max_results=50).upload_geolocation('g', self.timestamps, lon, lat, alt)
+
+        self.assertEqual(95, summary.accepted)
+        self.assertEqual(2, summary.batches)
+        uploaded = sorted(api.uploaded['g'], key=lambda r: r['t'])
+        self.assertEqual({'t': '2016-02-15T00:00:00.000000Z',
+                          'v': {'p': {'type': 'Point', 'coordinates': [147.0, -42.5, 12.5]}}}, uploaded[0])
+        self.assertEqual([148.0, -42.5], uploaded[-1]['v']['p']['coordinates'])
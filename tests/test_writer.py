@@ -0,0 +1,219 @@
+"""
+MIT License
+Copyright (c) 2026 CSIRO
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+from __future__ import unicode_literals, absolute_import, print_function
+
+import datetime
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from senaps_sensor.error import SenapsError
+from senaps_sensor.writer import ObservationWriter
+from tests.test_upload import FakeIngestApi
+
+import six
+
+if six.PY3:
+    import unittest
+else:
+    import unittest2 as unittest
+
+
+class SlowIngestApi(FakeIngestApi):
+    """Blocks every upload until `release` is set."""
+
+    def __init__(self):
+        super(SlowIngestApi, self).__init__()
+        self.release = threading.Event()
+
+    def create_observations(self, streamid, results):
+        self.release.wait(10)
+        return super(SlowIngestApi, self).create_observations(streamid, results)
+
+
+T = datetime.datetime(2016, 2, 15)
+
+
+class ObservationWriterTestCase(unittest.TestCase):
+
+    def test_close_drains_all_streams(self):
+        api = FakeIngestApi()
+        with ObservationWriter(api, batch_size=50, max_age=60) as writer:
+            for i in range(120):
+                writer.append('stream-%d' % (i % 3), T + datetime.timedelta(seconds=i), {'v': i})
+
+        self.assertEqual(120, writer.uploaded)
+        self.assertEqual([40, 40, 40], [len(api.uploaded['stream-%d' % i]) for i in range(3)])
+
+    def test_flushes_full_batches_in_background(self):
+        api = FakeIngestApi()
+        writer = ObservationWriter(api, batch_size=10, max_age=60)
+        for i in range(25):
+            writer.append('a', T, {'v': i})
+
+        deadline = time.time() + 5
+        while writer.uploaded < 20 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(20, writer.uploaded)
+        self.assertEqual(5, writer.buffered)
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(25, writer.uploaded)
+        writer.close()
+
+    def test_flushes_by_age(self):
+        api = FakeIngestApi()
+        writer = ObservationWriter(api, batch_size=1000, max_age=0.05)
+        writer.append('a', T, {'v': 1})
+
+        deadline = time.time() + 5
+        while writer.uploaded < 1 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(1, writer.uploaded)
+        writer.close()
+
+    def test_drop_oldest_backpressure(self):
+        api = SlowIngestApi()
+        writer = ObservationWriter(api, batch_size=5, max_age=60, max_buffered=5, backpressure='drop_oldest')
+        for i in range(50):
+            writer.append('a', T + datetime.timedelta(seconds=i), {'v': i})
+        self.assertLessEqual(writer.buffered, 5)
+        self.assertGreater(writer.dropped, 0)
+
+        api.release.set()
+        writer.close()
+        self.assertEqual(50, writer.uploaded + writer.dropped)
+
+    def test_block_backpressure_times_out(self):
+        api = SlowIngestApi()
+        writer = ObservationWriter(api, batch_size=5, max_age=60, max_buffered=5, block_timeout=0.1)
+        with self.assertRaises(SenapsError):
+            for i in range(50):
+                writer.append('a', T, {'v': i})
+
+        api.release.set()
+        writer.close()
+
+    def test_spill_backpressure(self):
+        directory = tempfile.mkdtemp()
+        try:
+            api = SlowIngestApi()
+            writer = ObservationWriter(api, batch_size=5, max_age=60, max_buffered=5,
+                                       backpressure='spill', spill_dir=directory)
+            for i in range(50):
+                writer.append('a', T + datetime.timedelta(seconds=i), {'v': i})
+            self.assertEqual(1, len(os.listdir(directory)))
+
+            api.release.set()
+            writer.close()
+            self.assertEqual(50, writer.uploaded)
+            self.assertEqual(list(range(50)), sorted(r['v']['v'] for r in api.uploaded['a']))
+            self.assertEqual([], os.listdir(directory))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_spill_preserves_order(self):
+        directory = tempfile.mkdtemp()
+        try:
+            api = SlowIngestApi()
+            writer = ObservationWriter(api, batch_size=5, max_age=60, max_buffered=10, concurrency=1,
+                                       backpressure='spill', spill_dir=directory)
+            for i in range(30):
+                writer.append('a', T + datetime.timedelta(seconds=i), {'v': i})
+            api.release.set()
+            deadline = time.time() + 5
+            while writer.uploaded < 20 and time.time() < deadline:
+                time.sleep(0.01)
+            # the buffer has room again, but spilled results are still waiting to be reloaded
+            for i in range(30, 60):
+                writer.append('a', T + datetime.timedelta(seconds=i), {'v': i})
+            writer.close()
+
+            self.assertEqual(list(range(60)), [r['v']['v'] for r in api.uploaded['a']])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_failed_batches_are_bounded(self):
+        failures = dict(((T + datetime.timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%S.000000Z'), [400])
+                        for i in range(0, 50, 5))
+        api = FakeIngestApi(failures)
+        with ObservationWriter(api, batch_size=5, max_age=60, max_failed_batches=3) as writer:
+            for i in range(50):
+                writer.append('a', T + datetime.timedelta(seconds=i), {'v': i})
+
+        self.assertEqual(50, writer.failed)
+        self.assertEqual([7, 8, 9], [batch.index for batch in writer.failed_batches])
+
+    def test_flush_does_not_wait_for_later_results(self):
+        class DelayedIngestApi(FakeIngestApi):
+            def create_observations(self, streamid, results):
+                time.sleep(0.05)
+                return super(DelayedIngestApi, self).create_observations(streamid, results)
+
+        api = DelayedIngestApi()
+        writer = ObservationWriter(api, batch_size=100, max_age=60)
+        stopped = threading.Event()
+
+        def produce():
+            i = 0
+            while not stopped.is_set():
+                writer.append('a', T + datetime.timedelta(seconds=i), {'v': i})
+                i += 1
+                time.sleep(0.001)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        try:
+            time.sleep(0.1)
+            self.assertTrue(writer.flush(timeout=5))
+        finally:
+            stopped.set()
+            producer.join()
+        writer.close()
+
+    def test_blocked_append_fails_when_closed(self):
+        api = SlowIngestApi()
+        writer = ObservationWriter(api, batch_size=5, max_age=60, max_buffered=5)
+        for i in range(10):
+            writer.append('a', T, {'v': i})
+        errors = []
+
+        def append():
+            try:
+                writer.append('a', T, {'v': 10})
+            except SenapsError as e:
+                errors.append(e)
+
+        blocked = threading.Thread(target=append)
+        blocked.start()
+        time.sleep(0.1)
+        closing = threading.Thread(target=writer.close)
+        closing.start()
+        blocked.join(5)
+        api.release.set()
+        closing.join(5)
+
+        self.assertEqual(1, len(errors))
+        self.assertEqual(10, writer.uploaded)
+